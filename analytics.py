@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Columnar analytics export for LunarTech AI Interview Agent
+
+Writes interviews, questions_answers and extracted_info as typed columnar
+files for notebooks: Parquet when pyarrow is installed, otherwise CSV with
+a <table>.schema.json of pandas dtypes to load it back with. Tables are
+read in chunks so memory stays bounded, and questions_answers gains
+derived per-answer features (word count, filler count, turn duration,
+speaking rate).
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import pandas as pd
+
+import storage
+from config import FILLER_WORDS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+FILLER_PATTERN = r"\b(?:" + "|".join(re.escape(word) for word in FILLER_WORDS) + r")\b"
+
+TABLES = {
+    "interviews": {
+        "query": "SELECT id, timestamp, interview_date, summary FROM interviews ORDER BY rowid",
+        "dtypes": {"id": "string", "summary": "string"},
+        "dates": ["timestamp", "interview_date"],
+    },
+    "questions_answers": {
+        "query": """SELECT id, interview_id, question_number, question, answer, duration_seconds
+                    FROM questions_answers ORDER BY id""",
+        "dtypes": {
+            "id": "Int64", "interview_id": "string", "question_number": "Int16",
+            "question": "string", "answer": "string", "duration_seconds": "Float32",
+        },
+        "dates": [],
+    },
+    "extracted_info": {
+        "query": """SELECT interview_id, name, interest_level, readiness, background
+                    FROM extracted_info ORDER BY rowid""",
+        "dtypes": {
+            "interview_id": "string", "name": "string", "interest_level": "string",
+            "readiness": "string", "background": "string",
+        },
+        "dates": [],
+    },
+}
+
+
+def add_answer_features(frame: pd.DataFrame) -> pd.DataFrame:
+    """Derive per-answer features from the answer text and turn duration."""
+    answers = frame["answer"].fillna("").str.lower()
+    frame["word_count"] = answers.str.count(r"\S+").astype("Int32")
+    frame["filler_count"] = answers.str.count(FILLER_PATTERN).astype("Int16")
+    minutes = frame["duration_seconds"] / 60
+    frame["words_per_minute"] = (frame["word_count"] / minutes.where(minutes > 0)).astype("Float32")
+    return frame
+
+
+def iter_table_chunks(table: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Yield typed DataFrame chunks of one table."""
+    spec = TABLES[table]
+    with storage.reading() as conn:
+        for chunk in pd.read_sql_query(spec["query"], conn, chunksize=chunk_size):
+            chunk = chunk.astype(spec["dtypes"])
+            for column in spec["dates"]:
+                chunk[column] = pd.to_datetime(chunk[column], errors="coerce", format="ISO8601")
+            if table == "questions_answers":
+                chunk = add_answer_features(chunk)
+            yield chunk
+
+
+def export_table(table: str, output_dir: Path, fmt: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Write one table chunk by chunk. Returns the number of rows written."""
+    rows = 0
+    writer = None
+    path = output_dir / f"{table}.{fmt}"
+    try:
+        for chunk in iter_table_chunks(table, chunk_size):
+            if fmt == "parquet":
+                batch = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, batch.schema, compression="zstd")
+                writer.write_table(batch.cast(writer.schema))
+            else:
+                if writer is None:
+                    _write_csv_schema(output_dir / f"{table}.schema.json", chunk)
+                    writer = open(path, "w", encoding="utf-8", newline="")
+                    chunk.to_csv(writer, index=False)
+                else:
+                    chunk.to_csv(writer, index=False, header=False)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _write_csv_schema(path: Path, chunk: pd.DataFrame) -> None:
+    """Record column dtypes so CSV exports load back with the right types."""
+    schema = {
+        "dtypes": {col: str(dtype) for col, dtype in chunk.dtypes.items() if not str(dtype).startswith("datetime")},
+        "parse_dates": [col for col, dtype in chunk.dtypes.items() if str(dtype).startswith("datetime")],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=2)
+
+
+def export_analytics(output_dir: str = "analytics_export", fmt: Optional[str] = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, int]:
+    """Export all analytics tables; fmt is 'parquet' (needs pyarrow) or 'csv'."""
+    fmt = fmt or ("parquet" if pq is not None else "csv")
+    if fmt == "parquet" and pq is None:
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow); use --format csv instead")
+    if fmt not in ("parquet", "csv"):
+        raise ValueError(f"Unknown analytics format: {fmt}")
+
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    return {table: export_table(table, out, fmt, chunk_size) for table in TABLES}
+
+
+def load_csv_table(output_dir: str, table: str) -> pd.DataFrame:
+    """Load a CSV analytics table with the dtypes recorded at export time."""
+    out = Path(output_dir)
+    with open(out / f"{table}.schema.json", "r", encoding="utf-8") as f:
+        schema = json.load(f)
+    return pd.read_csv(out / f"{table}.csv", dtype=schema["dtypes"], parse_dates=schema["parse_dates"])
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Segment archive for old session files in LunarTech AI Interview Agent
+
+Every interview leaves small files behind (transcript, summary markdown and
+JSON, event journal). Compaction packs the files of sessions older than a
+cutoff into append-only segment files under data/archive and removes the
+originals. Each file becomes one record compressed on its own (lzma or
+gzip), and the archive_index table maps its original path to a segment
+offset, so reading one file back is a single seek and decompress.
+
+Records are self-describing (magic, header length, JSON header, payload),
+so the index can be rebuilt by scanning the segments. New sessions keep
+writing ordinary files; only compaction touches the archive.
+"""
+
+import datetime
+import gzip
+import json
+import logging
+import lzma
+import os
+import re
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import storage
+from config import (
+    DATA_DIR, TRANSCRIPTS_DIR, SUMMARIES_DIR, JOURNAL_DIR,
+    ARCHIVE_DIR, ARCHIVE_AFTER_DAYS, ARCHIVE_CODEC, ARCHIVE_SEGMENT_MAX_BYTES
+)
+from journal import find_incomplete_sessions
+
+logger = logging.getLogger(__name__)
+
+RECORD_MAGIC = b"LTAR"
+_HEADER = struct.Struct(">4sI")
+
+CODECS = {
+    "lzma": (lzma.compress, lzma.decompress),
+    "gzip": (gzip.compress, gzip.decompress),
+}
+
+# Timestamp IDs, with a sequence suffix for sessions started in the same second by the server
+SESSION_ID_PATTERN = re.compile(r"(\d{8}_\d{6}(?:_\d+)?)")
+
+# Directories whose per-session files are compacted
+SESSION_DIRS = [TRANSCRIPTS_DIR, SUMMARIES_DIR, JOURNAL_DIR]
+
+
+def archive_name(path: Path) -> str:
+    """Index key of a data file: its path relative to DATA_DIR, with forward slashes."""
+    return Path(path).resolve().relative_to(Path(DATA_DIR).resolve()).as_posix()
+
+
+def _session_time(path: Path) -> Tuple[Optional[str], float]:
+    """Session ID from the file name (if any) and the session's start time."""
+    match = SESSION_ID_PATTERN.search(path.name)
+    if match:
+        started = datetime.datetime.strptime(match.group(1)[:15], "%Y%m%d_%H%M%S")
+        return match.group(1), started.timestamp()
+    return None, path.stat().st_mtime
+
+
+def find_compactable(older_than_days: float) -> List[Tuple[Path, Optional[str]]]:
+    """Session files older than the cutoff, skipping journals of unfinished sessions."""
+    cutoff = time.time() - older_than_days * 86400
+    unfinished = set(find_incomplete_sessions())
+    candidates = []
+    for directory in SESSION_DIRS:
+        for path in sorted(Path(directory).glob("*")):
+            if not path.is_file() or path.name.startswith(".") or path.name == "README.md":
+                continue
+            session_id, started = _session_time(path)
+            if started >= cutoff or session_id in unfinished:
+                continue
+            candidates.append((path, session_id))
+    return candidates
+
+
+class SegmentWriter:
+    """Appends records to the newest segment, starting a new one when it is full."""
+
+    def __init__(self, archive_dir: str = ARCHIVE_DIR, max_bytes: int = ARCHIVE_SEGMENT_MAX_BYTES):
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        segments = sorted(self.archive_dir.glob("segment_*.seg"))
+        self.path = segments[-1] if segments else self._segment_path(1)
+        self._file = open(self.path, "ab")
+        self._drop_torn_tail()
+
+    def _drop_torn_tail(self) -> None:
+        """Cut off a record left half-written by a crash so appends stay scannable."""
+        end = 0
+        for offset, length, _ in iter_segment_records(self.path):
+            end = offset + length
+        if self._file.tell() > end:
+            logger.warning(f"Truncating incomplete record at the end of {self.path}")
+            self._file.truncate(end)
+            self._file.seek(end)
+
+    def _segment_path(self, number: int) -> Path:
+        return self.archive_dir / f"segment_{number:06d}.seg"
+
+    def append(self, name: str, data: bytes, codec: str, mtime: float) -> Tuple[str, int, int]:
+        """Write one record; returns (segment file name, offset, record length)."""
+        if self._file.tell() >= self.max_bytes:
+            self._rotate()
+        payload = CODECS[codec][0](data)
+        header = json.dumps({
+            "name": name, "codec": codec, "size": len(data), "length": len(payload), "mtime": mtime
+        }).encode("utf-8")
+        record = _HEADER.pack(RECORD_MAGIC, len(header)) + header + payload
+        offset = self._file.tell()
+        self._file.write(record)
+        return self.path.name, offset, len(record)
+
+    def _rotate(self) -> None:
+        self.sync()
+        self._file.close()
+        self.path = self._segment_path(int(self.path.stem.split("_")[1]) + 1)
+        self._file = open(self.path, "ab")
+
+    def sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self.sync()
+        self._file.close()
+
+
+def compact(older_than_days: float = ARCHIVE_AFTER_DAYS, codec: str = ARCHIVE_CODEC, batch_size: int = 200) -> Dict[str, int]:
+    """
+    Move session files older than the cutoff into segments.
+    Each batch is appended and fsynced, then indexed in one transaction,
+    and only then are the original files removed.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown archive codec: {codec}")
+    files = find_compactable(older_than_days)
+    stats = {"files": 0, "bytes_in": 0, "bytes_out": 0}
+    if not files:
+        return stats
+
+    writer = SegmentWriter()
+    try:
+        for start in range(0, len(files), batch_size):
+            rows = []
+            for path, session_id in files[start:start + batch_size]:
+                data = path.read_bytes()
+                name = archive_name(path)
+                segment, offset, length = writer.append(name, data, codec, path.stat().st_mtime)
+                rows.append((name, session_id, segment, offset, length, codec, len(data)))
+                stats["bytes_in"] += len(data)
+                stats["bytes_out"] += length
+            writer.sync()
+            with storage.transaction() as conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO archive_index (name, session_id, segment, offset, length, codec, size)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+            for path, _ in files[start:start + batch_size]:
+                path.unlink()
+            stats["files"] += len(rows)
+    finally:
+        writer.close()
+    logger.info(f"Compacted {stats['files']} session files into {ARCHIVE_DIR}")
+    return stats
+
+
+def read_archived(name: str) -> Optional[bytes]:
+    """Contents of an archived file (by its DATA_DIR-relative name), or None."""
+    with storage.reading() as conn:
+        row = conn.execute(
+            "SELECT segment, offset, length, codec FROM archive_index WHERE name = ?", (name,)
+        ).fetchone()
+    if row is None:
+        return None
+    segment, offset, length, codec = row
+    with open(Path(ARCHIVE_DIR) / segment, "rb") as f:
+        f.seek(offset)
+        record = f.read(length)
+    magic, header_length = _HEADER.unpack_from(record)
+    if magic != RECORD_MAGIC:
+        raise ValueError(f"Corrupt archive index entry for {name}")
+    return CODECS[codec][1](record[_HEADER.size + header_length:])
+
+
+def read_session_file(path: Path) -> Optional[bytes]:
+    """Read a session file from disk, or from the archive once it has been compacted."""
+    path = Path(path)
+    if path.exists():
+        return path.read_bytes()
+    return read_archived(archive_name(path))
+
+
+def iter_segment_records(segment_path: Path) -> Iterator[Tuple[int, int, Dict]]:
+    """Scan a segment, yielding (offset, record length, header) for every record."""
+    size = Path(segment_path).stat().st_size
+    with open(segment_path, "rb") as f:
+        while True:
+            offset = f.tell()
+            prefix = f.read(_HEADER.size)
+            if len(prefix) < _HEADER.size:
+                return
+            magic, header_length = _HEADER.unpack(prefix)
+            header_bytes = f.read(header_length)
+            if magic != RECORD_MAGIC or len(header_bytes) < header_length:
+                logger.warning(f"Stopping at unreadable record in {segment_path} at offset {offset}")
+                return
+            header = json.loads(header_bytes)
+            length = _HEADER.size + header_length + header["length"]
+            if offset + length > size:
+                logger.warning(f"Incomplete record at the end of {segment_path} (offset {offset})")
+                return
+            f.seek(header["length"], os.SEEK_CUR)
+            yield offset, length, header
+
+
+def rebuild_index() -> int:
+    """Recreate archive_index by scanning every segment. Returns the number of records."""
+    rows = []
+    for segment_path in sorted(Path(ARCHIVE_DIR).glob("segment_*.seg")):
+        for offset, length, header in iter_segment_records(segment_path):
+            match = SESSION_ID_PATTERN.search(header["name"])
+            rows.append((header["name"], match.group(1) if match else None, segment_path.name,
+                         offset, length, header["codec"], header["size"]))
+    with storage.transaction() as conn:
+        conn.execute("DELETE FROM archive_index")
+        # Later records win, matching INSERT OR REPLACE during compaction
+        conn.executemany("""
+            INSERT OR REPLACE INTO archive_index (name, session_id, segment, offset, length, codec, size)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+    return len(rows)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Audio input and output backends for LunarTech AI Interview Agent
+
+The agent hears through an AudioSource and speaks through an AudioSink.
+By default these are the microphone (PyAudio) and the speakers (pyttsx3).
+Headless runs swap in a source that plays recorded or synthesized answers
+and a sink that discards prompts, so conduct_interview needs no audio
+hardware.
+
+A source yields 16-bit mono PCM chunks at SAMPLE_RATE for one listen. The
+agent measures silence and timeouts on the audio it has received, so a
+scripted source may deliver audio faster than real time.
+"""
+
+import io
+import logging
+import queue
+import threading
+import time
+import wave
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from config import SAMPLE_RATE, CHUNK_SIZE, SPEECH_RATE, SPEECH_VOLUME
+
+try:
+    import pyaudio
+except ImportError:
+    pyaudio = None
+
+try:
+    import pyttsx3
+except ImportError:
+    pyttsx3 = None
+
+logger = logging.getLogger(__name__)
+
+CHUNK_BYTES = CHUNK_SIZE * 2
+
+
+class AudioSourceClosed(ConnectionError):
+    """The source can deliver no more audio (e.g. the client hung up); the session cannot continue."""
+
+
+class AudioSource:
+    """Supplies the candidate's audio, one listen at a time."""
+
+    def stream(self, timeout: float) -> Iterator[bytes]:
+        """PCM chunks for one answer; the agent stops reading when it has heard enough."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class AudioSink:
+    """Plays the agent's prompts."""
+
+    def say(self, text: str) -> None:
+        raise NotImplementedError
+
+
+class MicrophoneSource(AudioSource):
+    """The default input device, read on a recording thread so recognition never drops frames."""
+
+    def __init__(self, device_index: Optional[int] = None):
+        if pyaudio is None:
+            raise ImportError("Microphone input needs pyaudio (pip install pyaudio)")
+        self.audio = pyaudio.PyAudio()
+        self.device_index = device_index
+
+    def stream(self, timeout: float) -> Iterator[bytes]:
+        audio_queue: "queue.Queue[bytes]" = queue.Queue()
+        listening = threading.Event()
+        listening.set()
+        recording_thread = threading.Thread(target=self._record_audio, args=(audio_queue, listening), daemon=True)
+        recording_thread.start()
+        deadline = time.monotonic() + timeout
+        try:
+            while time.monotonic() < deadline:
+                try:
+                    yield audio_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+        finally:
+            listening.clear()
+            recording_thread.join(timeout=2)
+
+    def _record_audio(self, audio_queue: "queue.Queue[bytes]", listening: threading.Event) -> None:
+        """Record audio in chunks and add them to the queue until listening stops."""
+        stream = None
+        try:
+            stream = self.audio.open(
+                format=pyaudio.paInt16,
+                channels=1,
+                rate=SAMPLE_RATE,
+                input=True,
+                frames_per_buffer=CHUNK_SIZE,
+                input_device_index=self.device_index
+            )
+            while listening.is_set():
+                try:
+                    data = stream.read(CHUNK_SIZE, exception_on_overflow=False)
+                    if data and listening.is_set():
+                        audio_queue.put(data)
+                except Exception as e:
+                    if listening.is_set():  # Only log if we're still supposed to be listening
+                        logger.warning(f"Audio read error: {e}")
+                    break
+        except Exception as e:
+            logger.error(f"Audio recording error: {e}")
+        finally:
+            if stream:
+                try:
+                    stream.stop_stream()
+                    stream.close()
+                except Exception:
+                    pass
+
+    def close(self) -> None:
+        self.audio.terminate()
+
+
+class ScriptedSource(AudioSource):
+    """Plays one prepared answer per listen, then silence; silent once the script runs out."""
+
+    def __init__(self, clips: List[bytes], realtime: bool = False):
+        self.clips = list(clips)
+        self.realtime = realtime
+
+    def stream(self, timeout: float) -> Iterator[bytes]:
+        clip = self.clips.pop(0) if self.clips else b""
+        chunk_seconds = CHUNK_SIZE / SAMPLE_RATE
+        silence_chunk = b"\0" * CHUNK_BYTES
+        sent = 0.0
+        offset = 0
+        while sent < timeout:
+            chunk = clip[offset:offset + CHUNK_BYTES] or silence_chunk
+            offset += CHUNK_BYTES
+            sent += len(chunk) / (2 * SAMPLE_RATE)
+            yield chunk
+            if self.realtime:
+                time.sleep(chunk_seconds)
+
+
+class SpeakerSink(AudioSink):
+    """Speaks prompts aloud with pyttsx3."""
+
+    def __init__(self):
+        if pyttsx3 is None:
+            raise ImportError("Speech output needs pyttsx3 (pip install pyttsx3)")
+        self.engine = pyttsx3.init()
+        # Prefer a female voice if one is available
+        voices = self.engine.getProperty('voices')
+        female_voices = [v for v in voices if 'female' in v.name.lower()]
+        if female_voices:
+            self.engine.setProperty('voice', female_voices[0].id)
+        self.engine.setProperty('rate', SPEECH_RATE)
+        self.engine.setProperty('volume', SPEECH_VOLUME)
+
+    def say(self, text: str) -> None:
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+
+class NullSink(AudioSink):
+    """Discards prompts, for headless runs."""
+
+    def say(self, text: str) -> None:
+        pass
+
+
+def silence(seconds: float) -> bytes:
+    return b"\0\0" * int(seconds * SAMPLE_RATE)
+
+
+def pcm_from_wav(data: bytes) -> bytes:
+    """16-bit mono PCM at SAMPLE_RATE from WAV bytes of any rate or channel count."""
+    with wave.open(io.BytesIO(data), "rb") as f:
+        if f.getsampwidth() != 2:
+            raise ValueError("Only 16-bit WAV audio is supported")
+        channels, rate = f.getnchannels(), f.getframerate()
+        samples = np.frombuffer(f.readframes(f.getnframes()), dtype="<i2")
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if rate != SAMPLE_RATE and len(samples):
+        positions = np.arange(0, len(samples), rate / SAMPLE_RATE)
+        samples = np.interp(positions, np.arange(len(samples)), samples)
+    return samples.astype("<i2").tobytes()
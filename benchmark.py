@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for LunarTech AI Interview Agent's hot functions
+
+Times the agent's per-turn work (confidence scoring, spelled names, name
+confirmation, each EnhancedLLM prompt type, FAQ matching, summaries) and
+the storage paths (saving an interview, dashboard statistics, JSON export,
+dashboard generation) on synthetic databases of 1k, 100k and 1M
+interviews. Synthetic databases are built once and kept in data/bench.
+
+Each benchmark is timed in several rounds, looping fast functions to fill
+a round, and the fastest per-call time is kept, which is the most stable
+figure from run to run. Results can be saved as the checked-in baseline
+(benchmark_baseline.json), and --compare fails when any benchmark is
+slower than its baseline by more than the threshold. Baselines are only
+comparable on the machine that recorded them.
+
+Usage:
+    python benchmark.py [--sizes 1k,100k,1M] [--filter TEXT] [--save | --compare [--threshold 0.25]]
+"""
+
+import argparse
+import contextlib
+import datetime
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import (
+    QUESTIONS, BENCHMARK_DIR, BENCHMARK_BASELINE_FILE, BENCHMARK_SIZES, BENCHMARK_THRESHOLD, BENCHMARK_MIN_TIME
+)
+from audio_io import NullSink
+from llm import create_llm
+import dashboard
+import storage
+import utils
+
+SAMPLE_ANSWERS = [
+    "My name is Sarah Johnson. I studied mathematics and work as a business analyst.",
+    "I want to move into machine learning and LunarTech offers the practical projects I need.",
+    "I have built dashboards and regression models in Python for the last three years.",
+    "In two years I want to lead a small data science team.",
+    "Yes, I am ready to start immediately.",
+]
+
+SAMPLE_EXTRACTED = {
+    "name": "Sarah Johnson",
+    "interest_level": "high",
+    "readiness": "high",
+    "background": "Business analyst with a mathematics degree",
+}
+
+# Queries for check_faq: answered straight from the index, sent to the LLM, and unanswered
+FAQ_QUERIES = {
+    "direct": "How much does the program cost?",
+    "ambiguous": "Is there a schedule or a cost?",
+    "miss": "Can I bring my dog to the office?",
+}
+
+SYNTHETIC_NAMES = ["Sarah Johnson", "David Chen", "Amara Okafor", "Siobhan Kelly", "Luis Garcia", "Mei Tanaka"]
+SYNTHETIC_ANSWERS = [
+    ["{name}. I work as a {job}.", "My name is {name} and I am a {job}."],
+    ["I want to build a career in AI.", "LunarTech has practical projects.", "I enjoy working with data."],
+    ["I have used Python and SQL for {years} years.", "Mostly Excel so far.", "I built models at work."],
+    ["Lead a data team.", "Become a machine learning engineer.", "Work on health technology."],
+    ["Yes, immediately.", "In two weeks.", "Next month."],
+]
+SYNTHETIC_JOBS = ["business analyst", "software tester", "student", "teacher", "accountant"]
+LEVELS = ["high", "medium", "low"]
+
+
+def parse_size(label: str) -> int:
+    """'1k' -> 1000, '100k' -> 100000, '1M' -> 1000000."""
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(label[-1].lower(), 1)
+    return int(float(label.rstrip("kKmM")) * multiplier)
+
+
+def build_synthetic_database(count: int, path: Optional[Path] = None, batch_size: int = 5000) -> Path:
+    """A database of count deterministic interviews spread over two years, built once and reused."""
+    path = Path(path or Path(BENCHMARK_DIR) / f"interviews_{count}.db")
+    if path.exists():
+        return path
+    building = path.with_suffix(".building")
+    for leftover in building.parent.glob(building.name + "*"):
+        leftover.unlink()
+    print(f"🏗️  Building synthetic database with {count:,} interviews...")
+    storage.set_database_path(str(building))
+    rng = random.Random(count)
+    start = datetime.datetime(2024, 1, 1)
+    spacing = 2 * 365 * 86400 / count
+    for batch_start in range(0, count, batch_size):
+        interviews, answers, extracted = [], [], []
+        for n in range(batch_start, min(count, batch_start + batch_size)):
+            interview_id = f"synthetic_{n:07d}"
+            timestamp = (start + datetime.timedelta(seconds=n * spacing)).isoformat()
+            name = rng.choice(SYNTHETIC_NAMES)
+            interviews.append((interview_id, timestamp, f"{name} interviewed for the program.", timestamp[:10]))
+            for number, (question, options) in enumerate(zip(QUESTIONS, SYNTHETIC_ANSWERS), 1):
+                answer = rng.choice(options).format(name=name, job=rng.choice(SYNTHETIC_JOBS), years=rng.randint(1, 9))
+                answers.append((interview_id, number, question, answer, round(rng.uniform(3, 40), 2)))
+            extracted.append((interview_id, name, rng.choice(LEVELS), rng.choice(LEVELS), "Synthetic candidate"))
+        with storage.transaction() as conn:
+            conn.executemany("INSERT INTO interviews (id, timestamp, summary, interview_date) VALUES (?, ?, ?, ?)",
+                             interviews)
+            conn.executemany(
+                "INSERT INTO questions_answers (interview_id, question_number, question, answer, duration_seconds) VALUES (?, ?, ?, ?, ?)",
+                answers
+            )
+            conn.executemany(
+                "INSERT INTO extracted_info (interview_id, name, interest_level, readiness, background) VALUES (?, ?, ?, ?, ?)",
+                extracted
+            )
+    with storage.writing() as conn:
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    storage.close()
+    building.replace(path)
+    return path
+
+
+def bench_agent():
+    """An InterviewAgent with no audio or speech model: prompts are dropped and every listen hears "yes"."""
+    from main import InterviewAgent
+
+    class BenchAgent(InterviewAgent):
+        def load_resources(self):
+            self.persistence = None
+            self.llm = create_llm("enhanced")
+            self.load_faq()
+
+        def listen(self, timeout: int = 20) -> str:
+            return "yes"
+
+    agent = BenchAgent(audio_sink=NullSink())
+    agent.interview_data["answers"] = list(SAMPLE_ANSWERS)
+    agent.interview_data["answer_durations"] = [12.5, 9.0, 15.2, 7.8, 3.1]
+    agent.interview_data["summary"] = "Sarah is a business analyst moving into machine learning."
+    agent.interview_data["extracted_info"] = dict(SAMPLE_EXTRACTED)
+    return agent
+
+
+def captured_prompts(agent) -> Dict[str, str]:
+    """The exact prompt the agent sends for each kind of LLM call."""
+    prompts: Dict[str, str] = {}
+    llm = agent.llm
+    kind = "default"
+
+    class Recorder:
+        def generate(self, prompt, max_tokens=512, grammar=None):
+            prompts.setdefault(kind, prompt)
+            return llm.generate(prompt, max_tokens, grammar)
+
+    agent.llm = Recorder()
+    try:
+        kind = "answer_quality"
+        agent.analyze_answer(QUESTIONS[2], SAMPLE_ANSWERS[2])
+        kind = "faq_match"
+        for query in FAQ_QUERIES.values():
+            agent.check_faq(query)
+        kind = "summary"
+        agent.generate_summary(SAMPLE_EXTRACTED["name"])
+    finally:
+        agent.llm = llm
+    prompts["default"] = "Human: Hello there.\n\nAssistant:"
+    return prompts
+
+
+def agent_benchmarks(agent) -> List[Tuple[str, Callable[[], Any]]]:
+    benchmarks = [
+        ("calculate_confidence", lambda: agent.calculate_confidence("Um, like, I mostly use Python and SQL at work.")),
+        ("process_spelled_name", lambda: agent.process_spelled_name("s i o b h a n")),
+        ("confirm_name_spelling[regex]",
+         lambda: agent.confirm_name_spelling("Hi, my name is Sarah Johnson and I work in finance")),
+    ]
+    for kind, prompt in captured_prompts(agent).items():
+        benchmarks.append((f"EnhancedLLM.generate[{kind}]", lambda prompt=prompt: agent.llm.generate(prompt)))
+    for kind, query in FAQ_QUERIES.items():
+        benchmarks.append((f"check_faq[{kind}]", lambda query=query: agent.check_faq(query)))
+    benchmarks.append(("generate_summary", lambda: agent.generate_summary(SAMPLE_EXTRACTED["name"])))
+    return benchmarks
+
+
+def storage_benchmarks(agent, work_dir: Path) -> List[Tuple[str, Callable[[], Any]]]:
+    ids = itertools.count()
+    run = f"{os.getpid()}_{int(time.time())}"
+    export_file = str(work_dir / "export.json")
+    dashboard_file = str(work_dir / "dashboard.html")
+    return [
+        ("save_to_database", lambda: agent.save_to_database(f"bench_{run}_{next(ids)}")),
+        ("get_interview_statistics", agent.get_interview_statistics),
+        ("export_interviews_to_json", lambda: utils.export_interviews_to_json(export_file)),
+        ("generate_dashboard[rewrite]", lambda: dashboard.write_dashboard(dashboard_file, force=True)),
+        ("generate_dashboard[unchanged]", lambda: dashboard.write_dashboard(dashboard_file)),
+    ]
+
+
+def measure(function: Callable[[], Any], min_time: float = BENCHMARK_MIN_TIME, rounds: int = 5) -> Dict[str, float]:
+    """Fastest and median per-call time in microseconds over several timing rounds."""
+    started = time.perf_counter()
+    function()
+    first = time.perf_counter() - started
+    if first >= 1.0:
+        # Slow enough that one call is a stable measurement on its own
+        return {"min_us": round(first * 1e6, 3), "median_us": round(first * 1e6, 3), "calls": 1}
+    loops = max(1, int(min_time / max(first, 1e-7)))
+    per_call = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for _ in range(loops):
+                function()
+            per_call.append((time.perf_counter() - started) / loops)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        "min_us": round(min(per_call) * 1e6, 3),
+        "median_us": round(statistics.median(per_call) * 1e6, 3),
+        "calls": loops * rounds,
+    }
+
+
+def run_benchmarks(sizes: List[str], name_filter: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """Run every benchmark (whose name contains name_filter) and return results by name."""
+    results = {}
+
+    def run(name: str, function: Callable[[], Any]) -> None:
+        if name_filter and name_filter not in name:
+            return
+        # The functions' own console output is not part of the measurement
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            results[name] = measure(function)
+        print(f"  {name:<48} {_format_us(results[name]['min_us']):>12}")
+
+    original_database = storage.get_database_path()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        agent = bench_agent()
+        benchmarks = agent_benchmarks(agent)
+    print("⏱️  Agent functions")
+    for name, function in benchmarks:
+        run(name, function)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for label in sizes:
+            database = build_synthetic_database(parse_size(label))
+            storage.set_database_path(str(database))
+            print(f"⏱️  Storage functions on {label} interviews")
+            for name, function in storage_benchmarks(agent, Path(work_dir)):
+                run(f"{name}@{label}", function)
+    storage.set_database_path(str(original_database))
+    return results
+
+
+def _format_us(microseconds: float) -> str:
+    if microseconds >= 1e6:
+        return f"{microseconds / 1e6:.2f} s"
+    if microseconds >= 1e3:
+        return f"{microseconds / 1e3:.2f} ms"
+    return f"{microseconds:.2f} µs"
+
+
+def machine_info() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: str = BENCHMARK_BASELINE_FILE) -> None:
+    """Write results as the baseline, keeping entries for benchmarks not run this time."""
+    baseline = {"machine": machine_info(), "results": {}}
+    if Path(path).exists():
+        with open(path, "r") as f:
+            baseline["results"] = json.load(f).get("results", {})
+    baseline["recorded"] = datetime.date.today().isoformat()
+    baseline["results"].update(results)
+    baseline["results"] = dict(sorted(baseline["results"].items()))
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def compare(results: Dict[str, Dict[str, float]], path: str = BENCHMARK_BASELINE_FILE,
+            threshold: float = BENCHMARK_THRESHOLD) -> List[str]:
+    """Print each benchmark against its baseline; returns the names that regressed past threshold."""
+    with open(path, "r") as f:
+        baseline = json.load(f)
+    if baseline.get("machine") != machine_info():
+        print(f"⚠️  Baseline was recorded on a different machine: {baseline.get('machine')}")
+    regressions = []
+    print(f"\n{'Benchmark':<50}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, result in results.items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            print(f"{name:<50}{'—':>12}{_format_us(result['min_us']):>12}{'new':>9}")
+            continue
+        change = result["min_us"] / reference["min_us"] - 1 if reference["min_us"] else 0.0
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<50}{_format_us(reference['min_us']):>12}{_format_us(result['min_us']):>12}"
+              f"{change:>+8.0%}{' ❌' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for LunarTech Interview Agent")
+    parser.add_argument("--sizes", default=",".join(BENCHMARK_SIZES),
+                        help="Synthetic database sizes for storage benchmarks, e.g. 1k,100k,1M")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--save", action="store_true", help=f"Record the results in {BENCHMARK_BASELINE_FILE}")
+    parser.add_argument("--compare", action="store_true", help="Compare with the baseline; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=BENCHMARK_THRESHOLD,
+                        help="Allowed slowdown before --compare fails (0.25 = 25%%)")
+    parser.add_argument("--baseline", default=BENCHMARK_BASELINE_FILE, help="Baseline file")
+    args = parser.parse_args()
+
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    results = run_benchmarks(sizes, args.filter)
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"\n📄 Baseline saved to {args.baseline}")
+    if args.compare:
+        regressions = compare(results, args.baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+        print(f"\n✅ No benchmark regressed by more than {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,68 @@ PATIENCE_MODE = True     # Enable patient, human-like waiting
 SPEECH_RATE = 150        # Words per minute
 SPEECH_VOLUME = 0.9      # Volume level (0.0 to 1.0)
 
+# LLM Settings
+LLM_BACKEND = "enhanced"     # "enhanced" (rule-based stand-in) or "llama" (GGUF via llama-cpp-python)
+LLM_MODEL_PATH = None        # GGUF file; defaults to the first *.gguf in MODELS_DIR
+LLM_CONTEXT_SIZE = 2048
+LLM_THREADS = 4
+
+# Shared LLM worker process (python llm_server.py). When set, agents send
+# their queries to the worker instead of loading their own model copy.
+LLM_SERVER_ADDRESS = None    # e.g. "data/llm_server.sock" (or r"\\.\pipe\lunartech_llm" on Windows)
+LLM_SERVER_AUTHKEY = b"lunartech-llm"
+LLM_MAX_BATCH_SIZE = 8       # Maximum requests collected into one micro-batch
+LLM_BATCH_WINDOW = 0.02      # Seconds to wait for more requests after the first one
+LLM_REQUEST_TIMEOUT = 30.0   # Per-request deadline in seconds
+
+# FAQ Retrieval Settings (normalized BM25 scores, 0..1)
+FAQ_TOP_K = 3                # Candidates considered per question
+FAQ_MIN_SCORE = 0.1          # Below this, the question is treated as unanswered
+FAQ_CONFIDENT_SCORE = 0.3    # At or above this (with a clear margin), answer without the LLM
+FAQ_MARGIN_RATIO = 1.5       # Best score must beat the runner-up by this factor
+
+# Semantic FAQ matching (cosine similarity of cached FAQ embeddings)
+FAQ_EMBEDDING_MODEL = "models/all-MiniLM-L6-v2"  # Local sentence-transformers model; semantic matching is off without it
+FAQ_SEMANTIC_MIN_SCORE = 0.35        # Semantic matches below this are not offered to the LLM
+FAQ_SEMANTIC_CONFIDENT_SCORE = 0.6   # At or above this (with a clear margin), answer without the LLM
+
+# Background persistence of finished interviews
+PERSIST_QUEUE_SIZE = 16      # Finished interviews waiting to be written before submit() blocks
+PERSIST_MAX_RETRIES = 3      # Retries per write step before the record goes to data/failed_saves
+PERSIST_RETRY_DELAY = 0.5    # Seconds before the first retry; doubles on each attempt
+
+# Application log (JSON lines, written off the calling thread)
+LOG_FILE = "session_logs.jsonl"
+LOG_LEVEL = "INFO"
+LOG_CONSOLE_LEVEL = "INFO"    # Human-readable copy on stderr; None to turn it off
+LOG_MAX_BYTES = 10 * 1024 * 1024  # Rotate the log file at this size
+LOG_BACKUP_COUNT = 5          # Rotated files kept (session_logs.jsonl.1 ... .5)
+LOG_MODULE_LEVELS = {         # Per-module minimum levels, e.g. to quiet chatty dependencies
+    "comtypes": "WARNING",
+    "urllib3": "WARNING",
+}
+
+# Session event journal (JOURNAL_DIR/session_<id>.jsonl)
+JOURNAL_FSYNC = "turn"         # "always" (every batch), "turn" (end of each turn) or "never"
+JOURNAL_FLUSH_INTERVAL = 1.0   # Seconds between batched writes
+JOURNAL_BUFFER_EVENTS = 32     # Events buffered before a write
+
+# Compaction of old session files into archive segments (python utils.py compact)
+ARCHIVE_AFTER_DAYS = 30                  # Sessions older than this are compacted
+ARCHIVE_CODEC = "lzma"                   # Per-record compression: "lzma" or "gzip"
+ARCHIVE_SEGMENT_MAX_BYTES = 64 * 1024 * 1024  # Start a new segment file after this size
+
+# Database retention and maintenance (python utils.py maintain)
+RETENTION_DAYS = 365                     # Interviews older than this move to the archive database
+RETENTION_BATCH_SIZE = 100               # Interviews moved per write transaction
+RETENTION_BATCH_PAUSE = 0.05             # Seconds between batches, so live writers get the lock
+VACUUM_PAGES_PER_STEP = 256              # Pages released per incremental vacuum step
+
+# Microbenchmarks (python benchmark.py)
+BENCHMARK_SIZES = ["1k", "100k", "1M"]   # Synthetic database sizes for the storage benchmarks
+BENCHMARK_THRESHOLD = 0.25               # --compare fails when a benchmark is this much slower than baseline
+BENCHMARK_MIN_TIME = 0.2                 # Seconds per timing round; fast functions are looped to fill it
+
 # Interview Settings
 QUESTIONS = [
     "Please tell me your full name and a bit about your background.",
@@ -33,12 +95,38 @@ QUESTIONS = [
 # File Paths
 DATA_DIR = "data"
 TRANSCRIPTS_DIR = f"{DATA_DIR}/transcripts"
+JOURNAL_DIR = f"{DATA_DIR}/journals"
+ARCHIVE_DIR = f"{DATA_DIR}/archive"
 SUMMARIES_DIR = f"{DATA_DIR}/summaries"
 MODELS_DIR = "models"
 FAQ_FILE = f"{DATA_DIR}/faq.json"
 DATABASE_FILE = f"{DATA_DIR}/interviews.db"
+ARCHIVE_DATABASE_FILE = f"{DATA_DIR}/interviews_archive.db"
+BENCHMARK_DIR = f"{DATA_DIR}/bench"
+BENCHMARK_BASELINE_FILE = "benchmark_baseline.json"
 DASHBOARD_FILE = "dashboard.html"
 
+# Live dashboard server (python dashboard.py --serve)
+DASHBOARD_HOST = "127.0.0.1"
+DASHBOARD_PORT = 8765
+DASHBOARD_POLL_INTERVAL = 2.0  # Seconds between data version checks for live updates
+DASHBOARD_TREND_DAYS = 30      # Days shown in the daily volume panel
+DASHBOARD_TREND_WEEKS = 12     # Weeks shown in the weekly volume and readiness panels
+
+# Multi-session interview server (python interview_server.py)
+INTERVIEW_SERVER_HOST = "127.0.0.1"
+INTERVIEW_SERVER_PORT = 8766
+INTERVIEW_SERVER_MAX_SESSIONS = 48    # Concurrent interviews (one worker thread each)
+INTERVIEW_SERVER_TTS_AUDIO = True     # Send synthesized WAV audio with each prompt (text only when False)
+INTERVIEW_SERVER_TTS_CACHE = 256      # Synthesized prompts kept in memory; questions repeat across sessions
+INTERVIEW_SERVER_LISTEN_GRACE = 5.0   # Wall-clock seconds beyond a listen timeout before giving up on a stalled client
+
+# Per-stage latency metrics
+METRICS_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]  # Histogram upper bounds, seconds
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = None           # e.g. 9108 to serve /metrics in Prometheus text format (or pass --metrics-port)
+METRICS_REPORT_DAYS = 7       # Window for `python utils.py latency`
+
 # Confidence Scoring Weights
 CONFIDENCE_WEIGHTS = {
     'base_confidence': 0.5,
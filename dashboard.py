@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Interview dashboard for LunarTech AI Interview Agent
+
+The page template is compiled once at import and only re-rendered when the
+database's data version changes, so writing dashboard.html before and after
+every interview costs a couple of indexed reads when nothing is new.
+
+`python dashboard.py --serve` serves the same page over HTTP with ETags
+(unchanged pages answer 304 Not Modified) and pushes a Server-Sent Event
+whenever an interview is saved, so an open browser tab refreshes itself.
+"""
+
+import argparse
+import datetime
+import html
+import logging
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from string import Template
+from typing import Any, Dict, Optional, Tuple
+
+import storage
+from config import (
+    DASHBOARD_FILE, DASHBOARD_HOST, DASHBOARD_PORT, DASHBOARD_POLL_INTERVAL,
+    DASHBOARD_TREND_DAYS, DASHBOARD_TREND_WEEKS
+)
+
+logger = logging.getLogger(__name__)
+
+PAGE_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <meta name="data-version" content="$data_version">
+    <title>LunarTech Interview Dashboard</title>
+    <style>
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            margin: 0;
+            padding: 20px;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+        }
+        .header {
+            text-align: center;
+            margin-bottom: 40px;
+        }
+        .stats-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 20px;
+            margin-bottom: 40px;
+        }
+        .stat-card {
+            background: rgba(255, 255, 255, 0.1);
+            padding: 30px;
+            border-radius: 15px;
+            text-align: center;
+            backdrop-filter: blur(10px);
+            border: 1px solid rgba(255, 255, 255, 0.2);
+        }
+        .stat-number {
+            font-size: 3em;
+            font-weight: bold;
+            margin-bottom: 10px;
+        }
+        .stat-label {
+            font-size: 1.2em;
+            opacity: 0.9;
+        }
+        .interest-chart, .panel {
+            background: rgba(255, 255, 255, 0.1);
+            padding: 30px;
+            border-radius: 15px;
+            backdrop-filter: blur(10px);
+            border: 1px solid rgba(255, 255, 255, 0.2);
+        }
+        .panel {
+            margin-top: 20px;
+        }
+        .columns {
+            display: flex;
+            align-items: flex-end;
+            gap: 4px;
+            height: 150px;
+        }
+        .column {
+            flex: 1;
+            min-height: 2px;
+            background: rgba(255, 255, 255, 0.6);
+            border-radius: 4px 4px 0 0;
+        }
+        .axis {
+            display: flex;
+            justify-content: space-between;
+            opacity: 0.7;
+            font-size: 0.9em;
+            margin-top: 8px;
+        }
+        .stacked {
+            display: flex;
+            overflow: hidden;
+        }
+        .bar {
+            display: flex;
+            align-items: center;
+            margin: 15px 0;
+        }
+        .bar-label {
+            width: 110px;
+            text-transform: capitalize;
+        }
+        .bar-fill {
+            height: 25px;
+            background: rgba(255, 255, 255, 0.3);
+            border-radius: 12px;
+            margin: 0 15px;
+            flex: 1;
+            position: relative;
+        }
+        .bar-progress {
+            height: 100%;
+            border-radius: 12px;
+            transition: width 0.5s ease;
+        }
+        .high { background: #4CAF50; }
+        .medium { background: #FF9800; }
+        .low { background: #F44336; }
+        .volume { background: rgba(255, 255, 255, 0.7); }
+        .timestamp {
+            text-align: center;
+            margin-top: 40px;
+            opacity: 0.7;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🚀 LunarTech Interview Dashboard</h1>
+            <p>Real-time interview analytics and candidate insights</p>
+        </div>
+
+        <div class="stats-grid">
+            <div class="stat-card">
+                <div class="stat-number">$total_interviews</div>
+                <div class="stat-label">Total Interviews</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-number">$today_interviews</div>
+                <div class="stat-label">Today's Interviews</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-number">$avg_interest</div>
+                <div class="stat-label">Average Interest</div>
+            </div>
+        </div>
+
+        <div class="interest-chart">
+            <h2>Interest Level Distribution</h2>
+            $interest_bars
+        </div>
+$trend_panels
+
+        <div class="timestamp">
+            Last updated: $updated_at
+        </div>
+    </div>
+    <script>
+        // Live updates when served by `python dashboard.py --serve`
+        if (window.EventSource && location.protocol.startsWith("http")) {
+            new EventSource("/events").addEventListener("update", () => location.reload());
+        }
+    </script>
+</body>
+</html>
+""")
+
+BAR_TEMPLATE = Template("""
+            <div class="bar">
+                <div class="bar-label">$label</div>
+                <div class="bar-fill">
+                    <div class="bar-progress $level" style="width: $percentage%"></div>
+                </div>
+                <div>$count ($percentage_text%)</div>
+            </div>""")
+
+VALUE_BAR_TEMPLATE = Template("""
+            <div class="bar">
+                <div class="bar-label">$label</div>
+                <div class="bar-fill">
+                    <div class="bar-progress volume" style="width: $percentage%"></div>
+                </div>
+                <div>$value</div>
+            </div>""")
+
+PANEL_TEMPLATE = Template("""
+        <div class="panel">
+            <h2>$title</h2>
+            $body
+        </div>""")
+
+COLUMN_TEMPLATE = Template("""<div class="column" style="height: $percentage%" title="$label: $count"></div>""")
+
+STACKED_BAR_TEMPLATE = Template("""
+            <div class="bar">
+                <div class="bar-label">$label</div>
+                <div class="bar-fill stacked">$segments</div>
+                <div>$count</div>
+            </div>""")
+
+_VERSION_PATTERN = re.compile(r'<meta name="data-version" content="([^"]*)">')
+
+
+def get_statistics() -> Dict[str, Any]:
+    """Dashboard statistics from the storage rollup table."""
+    try:
+        today = datetime.datetime.now().strftime('%Y-%m-%d')
+        stats = storage.get_statistics(today)
+        levels = stats["interest"]
+        high_count = levels.get('high', 0)
+        medium_count = levels.get('medium', 0)
+        low_count = levels.get('low', 0)
+
+        total = high_count + medium_count + low_count
+        if total:
+            avg_score = (high_count * 3 + medium_count * 2 + low_count * 1) / total
+
+            if avg_score >= 2.5:
+                avg_interest = "High"
+            elif avg_score >= 1.5:
+                avg_interest = "Medium"
+            else:
+                avg_interest = "Low"
+        else:
+            avg_interest = "N/A"
+
+        return {
+            "total_interviews": stats["total"],
+            "today_interviews": stats["day"],
+            "avg_interest": avg_interest,
+            "interest_distribution": {
+                "high": high_count,
+                "medium": medium_count,
+                "low": low_count
+            }
+        }
+
+    except Exception as e:
+        logger.error(f"Error getting statistics: {e}")
+        return {"total_interviews": 0, "today_interviews": 0, "avg_interest": "N/A"}
+
+
+def get_trends() -> Dict[str, Any]:
+    """Daily and weekly volume, weekly readiness and median answer length per question."""
+    today = datetime.date.today()
+    first_week = today - datetime.timedelta(days=today.weekday(), weeks=DASHBOARD_TREND_WEEKS - 1)
+    first_day = today - datetime.timedelta(days=DASHBOARD_TREND_DAYS - 1)
+    try:
+        raw = storage.get_trends(min(first_week, first_day).isoformat())
+    except Exception as e:
+        logger.error(f"Error getting trends: {e}")
+        return {"daily": [], "weekly": [], "median_answer_words": {}}
+
+    daily = []
+    for offset in range(DASHBOARD_TREND_DAYS):
+        day = (first_day + datetime.timedelta(days=offset)).isoformat()
+        daily.append((day, raw["daily"].get(day, 0)))
+
+    weekly = []
+    for week in range(DASHBOARD_TREND_WEEKS):
+        start = first_week + datetime.timedelta(weeks=week)
+        days = [(start + datetime.timedelta(days=offset)).isoformat() for offset in range(7)]
+        readiness: Dict[str, int] = {}
+        for day in days:
+            for level, count in raw["readiness"].get(day, {}).items():
+                readiness[level] = readiness.get(level, 0) + count
+        weekly.append((f"Week of {start.strftime('%b %d')}", sum(raw["daily"].get(day, 0) for day in days), readiness))
+
+    return {
+        "daily": daily,
+        "weekly": weekly,
+        "median_answer_words": {
+            question: storage.histogram_median(buckets) for question, buckets in raw["answer_lengths"].items()
+        },
+    }
+
+
+def current_version() -> str:
+    """Data version of the dashboard: the database version plus today's date."""
+    return f"{storage.data_version()}@{datetime.date.today().isoformat()}"
+
+
+def render_trends(trends: Dict[str, Any]) -> str:
+    """HTML for the trend panels."""
+    panels = []
+
+    daily = trends.get("daily") or []
+    if daily:
+        peak = max(count for _, count in daily) or 1
+        columns = "".join(
+            COLUMN_TEMPLATE.substitute(label=day, count=count, percentage=f"{count / peak * 100:g}")
+            for day, count in daily
+        )
+        body = (f'<div class="columns">{columns}</div>'
+                f'<div class="axis"><span>{daily[0][0]}</span><span>peak {peak}/day</span><span>{daily[-1][0]}</span></div>')
+        panels.append(PANEL_TEMPLATE.substitute(title=f"Interviews per Day (last {len(daily)} days)", body=body))
+
+    weekly = trends.get("weekly") or []
+    if weekly:
+        peak = max(count for _, count, _ in weekly) or 1
+        volume = "".join(
+            VALUE_BAR_TEMPLATE.substitute(label=label, value=count, percentage=f"{count / peak * 100:g}")
+            for label, count, _ in weekly
+        )
+        panels.append(PANEL_TEMPLATE.substitute(title="Interviews per Week", body=volume))
+
+        rows = []
+        for label, _, readiness in weekly:
+            known = {level: readiness.get(level, 0) for level in ("high", "medium", "low")}
+            total = sum(known.values())
+            segments = "".join(
+                f'<div class="bar-progress {level}" style="width: {count / total * 100:g}%" title="{level}: {count}"></div>'
+                for level, count in known.items() if count
+            ) if total else ""
+            summary = " / ".join(str(known[level]) for level in known) if total else "–"
+            rows.append(STACKED_BAR_TEMPLATE.substitute(label=label, segments=segments, count=summary))
+        panels.append(PANEL_TEMPLATE.substitute(title="Readiness by Week (high / medium / low)", body="".join(rows)))
+
+    medians = {q: m for q, m in (trends.get("median_answer_words") or {}).items() if m is not None}
+    if medians:
+        longest = max(medians.values()) or 1
+        bars = "".join(
+            VALUE_BAR_TEMPLATE.substitute(label=f"Question {question}", value=f"{median:g} words",
+                                          percentage=f"{median / longest * 100:g}")
+            for question, median in sorted(medians.items())
+        )
+        panels.append(PANEL_TEMPLATE.substitute(title="Median Answer Length", body=bars))
+
+    return "".join(panels)
+
+
+def render(stats: Dict[str, Any], version: str, trends: Optional[Dict[str, Any]] = None) -> str:
+    """Fill the compiled page template with statistics and trend panels."""
+    distribution = stats.get('interest_distribution') or {}
+    total = sum(distribution.values())
+    if total > 0:
+        bars = "".join(
+            BAR_TEMPLATE.substitute(
+                label=level.title(), level=level, count=count,
+                percentage=f"{count / total * 100:g}", percentage_text=f"{count / total * 100:.1f}"
+            )
+            for level, count in distribution.items()
+        )
+    else:
+        bars = "<p>No interview data available yet.</p>"
+
+    return PAGE_TEMPLATE.substitute(
+        data_version=html.escape(version),
+        total_interviews=stats['total_interviews'],
+        today_interviews=stats['today_interviews'],
+        avg_interest=html.escape(str(stats['avg_interest'])),
+        interest_bars=bars,
+        trend_panels=render_trends(trends or {}),
+        updated_at=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    )
+
+
+def _file_version(path: Path) -> Optional[str]:
+    """Data version recorded in an existing dashboard file, if any."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            match = _VERSION_PATTERN.search(f.read(1024))
+        return match.group(1) if match else None
+    except OSError:
+        return None
+
+
+def write_dashboard(path: str = DASHBOARD_FILE, force: bool = False) -> Tuple[Path, bool]:
+    """
+    Write the dashboard file unless it already shows the current data.
+    Returns the path and whether it was rewritten.
+    """
+    dashboard_file = Path(path)
+    version = current_version()
+    if not force and _file_version(dashboard_file) == html.escape(version):
+        return dashboard_file, False
+
+    tmp_file = dashboard_file.with_suffix(".tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(render(get_statistics(), version, get_trends()))
+    tmp_file.replace(dashboard_file)
+    return dashboard_file, True
+
+
+def on_interview_committed(interview_id: str) -> None:
+    """Persistence callback: refresh the dashboard file once an interview is in the database."""
+    write_dashboard(DASHBOARD_FILE)
+
+
+class DashboardServer:
+    """Serves the dashboard over HTTP with ETags and Server-Sent Event updates."""
+
+    def __init__(self, host: str = DASHBOARD_HOST, port: int = DASHBOARD_PORT,
+                 poll_interval: float = DASHBOARD_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self._page: Tuple[str, bytes] = ("", b"")
+        self._page_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def page(self) -> Tuple[str, bytes]:
+        """(version, body) of the current page, rendered only when the data changed."""
+        version = current_version()
+        with self._page_lock:
+            if self._page[0] != version:
+                self._page = (version, render(get_statistics(), version, get_trends()).encode("utf-8"))
+            return self._page
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path in ("/", "/index.html"):
+                    self._send_page()
+                elif self.path == "/events":
+                    self._stream_events()
+                else:
+                    self.send_error(404)
+
+            def _send_page(self):
+                version, body = server.page()
+                etag = f'"{version}"'
+                if etag in self.headers.get("If-None-Match", ""):
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream_events(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                version = current_version()
+                try:
+                    while not server._stopped.wait(server.poll_interval):
+                        latest = current_version()
+                        if latest != version:
+                            version = latest
+                            self.wfile.write(f"event: update\ndata: {version}\n\n".encode("utf-8"))
+                        else:
+                            # Comment line keeps proxies from closing an idle stream
+                            self.wfile.write(b": keep-alive\n\n")
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                logger.debug(f"Dashboard {self.address_string()} {format % args}")
+
+        return Handler
+
+    def serve_forever(self) -> None:
+        logger.info(f"Dashboard server listening on {self.url}")
+        self.httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LunarTech interview dashboard")
+    parser.add_argument("--serve", action="store_true", help="Serve the dashboard with live updates")
+    parser.add_argument("--host", default=DASHBOARD_HOST, help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=DASHBOARD_PORT, help="Port to listen on")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if not args.serve:
+        dashboard_file, written = write_dashboard(force=True)
+        print(f"📊 Dashboard generated: {dashboard_file.absolute()}")
+        return
+
+    server = DashboardServer(args.host, args.port)
+    print(f"📊 Dashboard live at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Dashboard server stopped")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Schema-constrained extraction of candidate information for LunarTech AI Interview Agent
+
+The summary prompt asks the LLM for free-text summary followed by a
+"JSON_DATA:" object. Backends that support grammar-constrained decoding
+(llama.cpp) receive SUMMARY_GBNF so the object can only be emitted in the
+expected shape. Every response, constrained or not, then goes through
+parse_summary_response(), which repairs truncated or malformed JSON in a
+single pass instead of falling back to "Unknown" and losing the record.
+"""
+
+import ast
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+JSON_MARKER = "JSON_DATA:"
+
+# Allowed values for the enumerated fields
+LEVELS = ("high", "medium", "low")
+UNKNOWN_LEVEL = "unknown"
+
+EXTRACTION_SCHEMA = {
+    "name": str,
+    "interest_level": LEVELS,
+    "readiness": LEVELS,
+    "background": str,
+}
+
+# Synonyms the LLM tends to produce for the enumerated fields
+LEVEL_SYNONYMS = {
+    "very high": "high", "strong": "high", "excellent": "high", "immediate": "high",
+    "moderate": "medium", "average": "medium", "mid": "medium", "fair": "medium",
+    "weak": "low", "poor": "low", "minimal": "low", "none": "low",
+}
+
+# GBNF grammar for llama.cpp: free-text summary, the marker, then exactly the
+# four schema fields in order with enumerated levels.
+SUMMARY_GBNF = r'''
+root        ::= summary "JSON_DATA:" ws object ws
+summary     ::= [^{}]+
+object      ::= "{" ws name-kv "," ws interest-kv "," ws readiness-kv "," ws background-kv ws "}"
+name-kv     ::= "\"name\"" ws ":" ws string
+interest-kv ::= "\"interest_level\"" ws ":" ws level
+readiness-kv ::= "\"readiness\"" ws ":" ws level
+background-kv ::= "\"background\"" ws ":" ws string
+level       ::= "\"high\"" | "\"medium\"" | "\"low\""
+string      ::= "\"" ( [^"\\\x00-\x1f] | "\\" ["\\/bfnrt] )* "\""
+ws          ::= [ \t\n]*
+'''
+
+
+def default_extracted_info(candidate_name: str) -> Dict[str, str]:
+    """Schema-conforming record used when nothing could be salvaged."""
+    return {
+        "name": candidate_name or "Unknown",
+        "interest_level": UNKNOWN_LEVEL,
+        "readiness": UNKNOWN_LEVEL,
+        "background": "",
+    }
+
+
+def parse_summary_response(response: str, candidate_name: str) -> Tuple[str, Dict[str, str], bool]:
+    """
+    Split an LLM summary response into (summary, extracted_info, repaired).
+    extracted_info always conforms to EXTRACTION_SCHEMA; repaired is True
+    when the JSON part needed fixing or field salvage.
+    """
+    response = response or ""
+    if JSON_MARKER in response:
+        summary, json_text = response.rsplit(JSON_MARKER, 1)
+    else:
+        brace = response.find("{")
+        if brace == -1:
+            summary, json_text = response, ""
+        else:
+            summary, json_text = response[:brace], response[brace:]
+
+    json_text = re.sub(r'```json|```', '', json_text).strip()
+    data, repaired = _load_json_object(json_text)
+    if data is None:
+        data = _salvage_fields(json_text)
+        repaired = True
+
+    info, coerced = coerce_to_schema(data, candidate_name)
+    return summary.strip(), info, repaired or coerced
+
+
+def coerce_to_schema(data: Dict[str, Any], candidate_name: str) -> Tuple[Dict[str, str], bool]:
+    """Normalize a decoded object to the schema, returning (info, changed)."""
+    info = default_extracted_info(candidate_name)
+    changed = set(data) != set(EXTRACTION_SCHEMA)
+
+    name = str(data.get("name") or "").strip()
+    if name and name not in ("Candidate", "Unknown"):
+        info["name"] = name
+    elif "name" in data:
+        changed = True
+
+    for field in ("interest_level", "readiness"):
+        level = normalize_level(data.get(field))
+        if level != str(data.get(field, "")).strip().lower():
+            changed = True
+        info[field] = level
+
+    background = data.get("background")
+    if isinstance(background, (list, tuple)):
+        background = ", ".join(str(item) for item in background)
+        changed = True
+    info["background"] = str(background or "").strip()
+
+    return info, changed
+
+
+def normalize_level(value: Any) -> str:
+    """Map an LLM level value onto high/medium/low, or 'unknown'."""
+    text = str(value or "").strip().lower()
+    if text in LEVELS:
+        return text
+    if text in LEVEL_SYNONYMS:
+        return LEVEL_SYNONYMS[text]
+    for level in LEVELS:
+        if re.search(rf"\b{level}\b", text):
+            return level
+    return UNKNOWN_LEVEL
+
+
+def _load_json_object(text: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """Decode the first JSON object in text, repairing it if needed."""
+    start = text.find("{")
+    if start == -1:
+        return None, False
+    text = text[start:]
+
+    try:
+        data, _ = json.JSONDecoder().raw_decode(text)
+        if isinstance(data, dict):
+            return data, False
+    except ValueError:
+        pass
+
+    repaired_text = _close_truncated_json(text)
+    for loader in (json.loads, ast.literal_eval):
+        try:
+            data = loader(repaired_text)
+        except (ValueError, SyntaxError):
+            continue
+        if isinstance(data, dict):
+            return data, True
+    return None, True
+
+
+_DANGLING_KEY = re.compile(r'([{,])\s*("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')\s*:?\s*$')
+
+
+def _close_truncated_json(text: str) -> str:
+    """
+    Repair JSON in one left-to-right pass: stop at the end of the first
+    top-level object, drop trailing commas, terminate an open string and
+    close any brackets still open when the text runs out.
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    quote = '"'
+
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                in_string = False
+            elif char == "\n":
+                char = "\\n"
+            out.append(char)
+            continue
+
+        if char in "\"'":
+            in_string, quote = True, char
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            _strip_trailing_comma(out)
+            if stack:
+                stack.pop()
+            out.append(char)
+            if not stack:
+                break
+            continue
+        out.append(char)
+
+    if in_string:
+        if escaped:
+            out.pop()
+        out.append(quote)
+    repaired = "".join(out).rstrip()
+    if stack and stack[-1] == "}":
+        # A key with no value cannot be completed meaningfully; drop it
+        repaired = _DANGLING_KEY.sub(r"\1", repaired)
+    if repaired.endswith(","):
+        repaired = repaired[:-1]
+    return repaired + "".join(reversed(stack))
+
+
+def _strip_trailing_comma(out: List[str]) -> None:
+    """Remove a trailing comma (and whitespace) from the output buffer.
+
+    Works back from the end only, so each character is popped at most once.
+    """
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+def _salvage_fields(text: str) -> Dict[str, Any]:
+    """Last resort: pull individual key/value pairs out of unparseable text."""
+    data: Dict[str, Any] = {}
+    for field in EXTRACTION_SCHEMA:
+        match = re.search(rf'["\']?{field}["\']?\s*[:=]\s*["\']?([^"\'\n,}}]+)', text, re.IGNORECASE)
+        if match:
+            data[field] = match.group(1).strip()
+    return data
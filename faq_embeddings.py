@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Precomputed FAQ embedding matrix for semantic matching in LunarTech AI Interview Agent
+
+Every FAQ entry is embedded once and the float32 matrix is cached next to
+the FAQ file (faq.embeddings.npy) with a small manifest recording the FAQ
+file hash, the encoder and one hash per entry. Loading memory-maps the
+cached matrix; when the FAQ changes, only entries whose text changed are
+re-embedded. Matching a question is a single matrix-vector product.
+
+The encoder is a local sentence-transformers model (FAQ_EMBEDDING_MODEL).
+Paraphrase matching needs a real sentence model, so without the library
+or the model files semantic matching is switched off, with a warning at
+startup, and questions are matched by the BM25 index alone.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import FAQ_EMBEDDING_MODEL
+
+logger = logging.getLogger(__name__)
+
+
+class SentenceTransformerEncoder:
+    """Local sentence-transformers model run on CPU."""
+
+    def __init__(self, model_path: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_path, device="cpu")
+        self.name = f"st-{Path(model_path).name}"
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self.model.encode(list(texts), convert_to_numpy=True, show_progress_bar=False)
+        return _normalize(vectors.astype(np.float32))
+
+
+def create_encoder():
+    """The local sentence-transformers model; raises if it cannot be loaded."""
+    if not FAQ_EMBEDDING_MODEL or not Path(FAQ_EMBEDDING_MODEL).exists():
+        raise FileNotFoundError(
+            f"no sentence embedding model at {FAQ_EMBEDDING_MODEL} "
+            "(pip install sentence-transformers and place e.g. all-MiniLM-L6-v2 there)"
+        )
+    return SentenceTransformerEncoder(FAQ_EMBEDDING_MODEL)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def _entry_text(faq: Dict[str, str]) -> str:
+    return f"{faq.get('question', '')}\n{faq.get('answer', '')}"
+
+
+def _entry_hash(faq: Dict[str, str]) -> str:
+    return hashlib.sha1(_entry_text(faq).encode("utf-8")).hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 of a file's contents."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class FAQEmbeddings:
+    """Cached, incrementally updated embedding matrix for FAQ entries."""
+
+    def __init__(self, faq_path: Path, encoder=None):
+        self.faq_path = Path(faq_path)
+        self.matrix_path = self.faq_path.with_suffix(".embeddings.npy")
+        self.manifest_path = self.faq_path.with_suffix(".embeddings.json")
+        self.encoder = encoder or create_encoder()
+        self.matrix: Optional[np.ndarray] = None
+
+    def load(self, faqs: Sequence[Dict[str, str]]) -> None:
+        """Memory-map the cached matrix, re-embedding only changed entries."""
+        faqs = list(faqs)
+        current_hash = file_hash(self.faq_path) if self.faq_path.exists() else ""
+        manifest = self._read_manifest()
+
+        if (manifest.get("file_hash") == current_hash and manifest.get("encoder") == self.encoder.name
+                and len(manifest.get("entries", [])) == len(faqs) and self.matrix_path.exists()):
+            self.matrix = np.load(self.matrix_path, mmap_mode="r")
+            return
+
+        entry_hashes = [_entry_hash(faq) for faq in faqs]
+        matrix = self._rebuild(faqs, entry_hashes, manifest)
+
+        # Release any previous map before replacing the file (required on Windows)
+        self.matrix = None
+        tmp_path = self.matrix_path.with_suffix(".tmp.npy")
+        np.save(tmp_path, matrix)
+        os.replace(tmp_path, self.matrix_path)
+        self._write_manifest({
+            "file_hash": current_hash,
+            "encoder": self.encoder.name,
+            "dim": int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+            "entries": entry_hashes,
+        })
+        self.matrix = np.load(self.matrix_path, mmap_mode="r")
+
+    def _rebuild(self, faqs: List[Dict[str, str]], entry_hashes: List[str], manifest: Dict) -> np.ndarray:
+        """Reuse cached rows for unchanged entries and embed the rest."""
+        cached_rows: Dict[str, np.ndarray] = {}
+        if manifest.get("encoder") == self.encoder.name and self.matrix_path.exists():
+            try:
+                old_matrix = np.load(self.matrix_path, mmap_mode="r")
+                old_rows = {entry: row for row, entry in enumerate(manifest.get("entries", []))}
+                for entry in set(entry_hashes):
+                    row = old_rows.get(entry)
+                    if row is not None and row < len(old_matrix):
+                        cached_rows[entry] = np.array(old_matrix[row])
+                del old_matrix
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable FAQ embedding cache: {e}")
+
+        missing = [i for i, entry in enumerate(entry_hashes) if entry not in cached_rows]
+        new_rows = self.encoder.encode([_entry_text(faqs[i]) for i in missing]) if missing else None
+        if missing:
+            logger.info(f"Embedded {len(missing)} of {len(faqs)} FAQ entries")
+
+        if not faqs:
+            return np.zeros((0, 0), dtype=np.float32)
+        dim = new_rows.shape[1] if new_rows is not None else len(next(iter(cached_rows.values())))
+        matrix = np.empty((len(faqs), dim), dtype=np.float32)
+        new_by_index = dict(zip(missing, new_rows)) if missing else {}
+        for i, entry in enumerate(entry_hashes):
+            matrix[i] = new_by_index[i] if i in new_by_index else cached_rows[entry]
+        return matrix
+
+    def _read_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest: Dict) -> None:
+        tmp_path = self.manifest_path.with_suffix(".tmp.json")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[int, float]]:
+        """Return up to k (faq_index, cosine similarity) pairs, best first."""
+        if self.matrix is None or not len(self.matrix) or not query.strip():
+            return []
+        scores = self.matrix @ self.encoder.encode([query])[0]
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top]
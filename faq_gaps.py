@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Unanswered-question log for LunarTech AI Interview Agent
+
+Questions that check_faq could not answer are stored in the interview
+database and clustered incrementally with MinHash LSH: each question's
+band keys are looked up in an indexed bucket table, so a new question
+joins an existing cluster (or starts one) in O(1) regardless of how many
+questions have been logged. The largest clusters are the FAQ entries
+worth adding next (see `python utils.py gaps`).
+"""
+
+import datetime
+import logging
+import zlib
+from typing import Any, Dict, List, Optional
+
+import storage
+from faq_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+# 10 bands of 3 rows: questions with word-shingle Jaccard similarity
+# above roughly 0.46 are likely to share a bucket
+MINHASH_BANDS = 10
+MINHASH_ROWS = 3
+_PRIME = (1 << 61) - 1
+_SEEDS = [(zlib.crc32(f"a{i}".encode()) | 1, zlib.crc32(f"b{i}".encode())) for i in range(MINHASH_BANDS * MINHASH_ROWS)]
+
+# Questions with no words left after tokenizing ("um, so?") all share this bucket
+NO_SHINGLES_KEY = "empty"
+
+
+def _shingles(question: str) -> List[int]:
+    """Hashed word unigrams and bigrams of the normalized question."""
+    words = tokenize(question)
+    shingles = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    return [zlib.crc32(s.encode("utf-8")) for s in set(shingles)]
+
+
+def minhash_band_keys(question: str) -> List[str]:
+    """MinHash signature of the question, grouped into LSH band keys."""
+    shingles = _shingles(question)
+    if not shingles:
+        return [NO_SHINGLES_KEY]
+    signature = [min((a * h + b) % _PRIME for h in shingles) for a, b in _SEEDS]
+    keys = []
+    for band in range(MINHASH_BANDS):
+        rows = signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]
+        keys.append(f"{band}:{zlib.crc32(repr(rows).encode()):08x}")
+    return keys
+
+
+def log_unanswered_question(question: str, interview_id: str) -> Optional[int]:
+    """Store an unanswered question and assign it to a cluster. Returns the cluster ID."""
+    try:
+        now = datetime.datetime.now().isoformat()
+        band_keys = minhash_band_keys(question)
+        with storage.transaction() as conn:
+            cursor = conn.cursor()
+            cluster_id = None
+            for key in band_keys:
+                cursor.execute("SELECT cluster_id FROM cluster_lsh_buckets WHERE band_key = ?", (key,))
+                row = cursor.fetchone()
+                if row:
+                    cluster_id = row[0]
+                    break
+
+            if cluster_id is None:
+                cursor.execute(
+                    "INSERT INTO question_clusters (representative, question_count, first_seen, last_seen) VALUES (?, 0, ?, ?)",
+                    (question, now, now)
+                )
+                cluster_id = cursor.lastrowid
+
+            cursor.executemany(
+                "INSERT OR IGNORE INTO cluster_lsh_buckets (band_key, cluster_id) VALUES (?, ?)",
+                [(key, cluster_id) for key in band_keys]
+            )
+            cursor.execute(
+                "UPDATE question_clusters SET question_count = question_count + 1, last_seen = ? WHERE id = ?",
+                (now, cluster_id)
+            )
+            cursor.execute(
+                "INSERT INTO unanswered_questions (interview_id, question, cluster_id, asked_at) VALUES (?, ?, ?, ?)",
+                (interview_id, question, cluster_id, now)
+            )
+        return cluster_id
+    except Exception as e:
+        logger.error(f"Error logging unanswered question: {e}")
+        return None
+
+
+def top_unanswered_clusters(limit: int = 10, examples: int = 3) -> List[Dict[str, Any]]:
+    """Return the most frequent unanswered-question clusters with example questions."""
+    if not storage.database_exists():
+        return []
+    with storage.reading() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, representative, question_count, last_seen
+            FROM question_clusters
+            ORDER BY question_count DESC
+            LIMIT ?
+        """, (limit,))
+        clusters = []
+        for cluster_id, representative, count, last_seen in cursor.fetchall():
+            cursor.execute("""
+                SELECT question FROM unanswered_questions
+                WHERE cluster_id = ?
+                ORDER BY id DESC
+                LIMIT ?
+            """, (cluster_id, examples))
+            clusters.append({
+                "cluster_id": cluster_id,
+                "representative": representative,
+                "count": count,
+                "last_seen": last_seen,
+                "examples": [row[0] for row in cursor.fetchall()],
+            })
+    return clusters
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+BM25 retrieval index over FAQ entries for LunarTech AI Interview Agent
+
+The index is built once when the FAQ is loaded. Each entry's question and
+answer are tokenized into an inverted index and a dense NumPy matrix of
+precomputed BM25 term weights. A query is scored only against the entries
+its terms' postings name: a row and column gather and a row sum over a few
+terms rather than an LLM call over the whole FAQ.
+"""
+
+import re
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does', 'for',
+    'from', 'have', 'how', 'i', 'if', 'in', 'is', 'it', 'me', 'my', 'of', 'on',
+    'or', 'so', 'that', 'the', 'there', 'this', 'to', 'was', 'we', 'what', 'when',
+    'where', 'which', 'who', 'will', 'with', 'you', 'your', 'our', 'any', 'about',
+    'much', 'many', 'would', 'could', 'should', 'am', 'anything', 'get',
+    'um', 'uh', 'er', 'like', 'well',
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _stem(token: str) -> str:
+    """Very light suffix stripping so plurals and -ing forms match."""
+    if len(token) > 5 and token.endswith("ing"):
+        return token[:-3]
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split into words, drop stopwords and stem."""
+    return [_stem(token) for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class FAQIndex:
+    """Inverted BM25 index over FAQ questions and answers."""
+
+    def __init__(self, faqs: Sequence[Dict[str, str]], k1: float = 1.5, b: float = 0.75,
+                 question_weight: int = 2):
+        self.faqs = list(faqs)
+        self.k1 = k1
+        self.b = b
+
+        # Questions are repeated so that matches on them outweigh answer text
+        documents = [
+            tokenize(" ".join([faq.get("question", "")] * question_weight + [faq.get("answer", "")]))
+            for faq in self.faqs
+        ]
+
+        self.vocabulary: Dict[str, int] = {}
+        self.postings: Dict[str, List[int]] = {}
+        for doc_id, tokens in enumerate(documents):
+            for token in set(tokens):
+                self.vocabulary.setdefault(token, len(self.vocabulary))
+                self.postings.setdefault(token, []).append(doc_id)
+
+        n_docs, n_terms = len(documents), len(self.vocabulary)
+        term_freq = np.zeros((n_docs, n_terms), dtype=np.float32)
+        for doc_id, tokens in enumerate(documents):
+            for token in tokens:
+                term_freq[doc_id, self.vocabulary[token]] += 1
+
+        doc_freq = (term_freq > 0).sum(axis=0)
+        self.idf = np.log(1 + (n_docs - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+        doc_len = term_freq.sum(axis=1, keepdims=True)
+        avg_len = float(doc_len.mean()) if n_docs else 1.0
+        norm = self.k1 * (1 - self.b + self.b * doc_len / max(avg_len, 1e-9))
+        self.weights = (self.idf * term_freq * (self.k1 + 1) / (term_freq + norm)).astype(np.float32)
+        self._postings = {token: np.array(doc_ids, dtype=np.int64) for token, doc_ids in self.postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.faqs)
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[int, float]]:
+        """
+        Return up to k (faq_index, score) pairs with positive scores, best
+        first. Scores are normalized to 0..1 by the query's best possible
+        score so thresholds do not depend on query length.
+        """
+        tokens = set(tokenize(query))
+        matched = [token for token in tokens if token in self.vocabulary]
+        if not matched or not self.faqs:
+            return []
+
+        # Only entries containing at least one query term can score above zero
+        candidates = np.unique(np.concatenate([self._postings[token] for token in matched]))
+        columns = [self.vocabulary[token] for token in matched]
+        scores = self.weights[np.ix_(candidates, columns)].sum(axis=1)
+        # Query words the FAQ never mentions count as the rarest possible term
+        unmatched = len(tokens) - len(columns)
+        max_score = float((self.idf[columns].sum() + unmatched * self.idf.max()) * (self.k1 + 1))
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(candidates[i]), float(scores[i]) / max_score) for i in top if scores[i] > 0]
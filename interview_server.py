@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Multi-session interview server for LunarTech AI Interview Agent
+
+Runs many interviews at once from one process. Clients connect over a
+local TCP socket and exchange length-prefixed frames: the server sends
+each prompt as text (plus synthesized WAV audio) and asks the client to
+stream 16 kHz mono PCM while it listens. End-pointing, recognition and
+the rest of the interview happen on the server.
+
+All sessions share one loaded Vosk Model, the LLM, the FAQ index and the
+persistence worker. Each session has its own KaldiRecognizer and runs the
+ordinary conduct_interview flow on a worker thread, awaited as a
+coroutine by its asyncio connection handler. Silence and timeouts are
+measured on the audio clock, so clients may stream faster than real time.
+Text-to-speech runs on one dedicated thread with a cache, since most
+prompts repeat from candidate to candidate.
+
+Usage:
+    python interview_server.py [--host HOST] [--port PORT] [--max-sessions N] [--no-tts-audio] [--metrics-port N]
+    python interview_server.py --fake-clients N [--audio answer1.wav answer2.wav ...] [--realtime]
+"""
+
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import logging
+import os
+import queue
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from vosk import Model
+import pyttsx3
+
+from config import (
+    SAMPLE_RATE, CHUNK_SIZE, SPEECH_RATE, SPEECH_VOLUME,
+    INTERVIEW_SERVER_HOST, INTERVIEW_SERVER_PORT, INTERVIEW_SERVER_MAX_SESSIONS,
+    INTERVIEW_SERVER_TTS_AUDIO, INTERVIEW_SERVER_TTS_CACHE, INTERVIEW_SERVER_LISTEN_GRACE, METRICS_PORT
+)
+from audio_io import AudioSink, AudioSource, AudioSourceClosed, ScriptedSource, pcm_from_wav
+import dashboard
+import metrics
+import persistence
+from journal import find_incomplete_sessions
+from main import InterviewAgent, faq_file_mtime, find_vosk_model, load_faq_resources, load_llm
+
+logger = logging.getLogger(__name__)
+
+FRAME_HEADER = struct.Struct(">cI")
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+# Client -> server
+HELLO = b"H"         # JSON {"resume": session_id or null}; first frame of a connection
+STREAM_START = b"B"  # JSON {"listen": n}; the audio that follows answers listen n
+AUDIO = b"A"         # 16-bit mono PCM at SAMPLE_RATE
+# Server -> client
+SPEAK = b"S"         # JSON {"text": ...}
+TTS_AUDIO = b"W"     # WAV bytes of the preceding prompt
+LISTEN = b"L"        # JSON {"listen": n, "timeout": seconds}; start streaming
+LISTEN_END = b"E"    # JSON {"listen": n, "text": ...}; stop streaming
+DONE = b"D"          # JSON {"session_id": ..., "candidate_name": ...}
+ERROR = b"X"         # JSON {"error": ...}
+
+
+def encode_frame(kind: bytes, payload: Any = b"") -> bytes:
+    """One frame: type byte, payload length, payload (JSON unless already bytes)."""
+    if not isinstance(payload, bytes):
+        payload = json.dumps(payload).encode("utf-8")
+    return FRAME_HEADER.pack(kind, len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[bytes, bytes]:
+    kind, length = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    if length > MAX_FRAME_BYTES:
+        raise ConnectionError(f"Frame of {length} bytes exceeds the {MAX_FRAME_BYTES} byte limit")
+    return kind, await reader.readexactly(length)
+
+
+class ClientDisconnected(AudioSourceClosed):
+    """The client went away in the middle of an interview."""
+
+
+class SharedResources:
+    """Per-process resources shared by every session: speech model, LLM, FAQ, TTS and persistence."""
+
+    def __init__(self, tts_audio: bool = INTERVIEW_SERVER_TTS_AUDIO, tts_cache: int = INTERVIEW_SERVER_TTS_CACHE,
+                 worker: Optional[persistence.PersistenceWorker] = None):
+        """worker replaces the process's persistence worker, which also refreshes the dashboard."""
+        self.model = Model(str(find_vosk_model()))
+        self.llm = load_llm()
+        self.faq_embeddings = None
+        self._load_faq()
+        self._faq_lock = threading.Lock()
+        if worker is None:
+            worker = persistence.get_worker()
+            worker.on_committed(dashboard.on_interview_committed)
+        self.persistence = worker
+        self.tts_audio = tts_audio
+        self._tts = ThreadPoolExecutor(1, thread_name_prefix="tts")
+        self._tts_engine = None
+        self._tts_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._tts_cache_size = tts_cache
+        self._tts_lock = threading.Lock()
+        self._session_numbers = itertools.count(1)
+
+    def next_session_id(self) -> str:
+        """Timestamp ID with a sequence suffix, unique even for sessions started in the same second."""
+        return f"{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}_{next(self._session_numbers):03d}"
+
+    def _load_faq(self) -> None:
+        faq = load_faq_resources(self.faq_embeddings)
+        self.faq_mtime, self.faq_data, self.faq_index, self.faq_embeddings = faq.mtime, faq.data, faq.index, faq.embeddings
+
+    def refresh_faq_if_changed(self) -> None:
+        """Reload the FAQ for every session when the file's mtime changes."""
+        with self._faq_lock:
+            try:
+                mtime = faq_file_mtime()
+            except OSError:
+                return
+            if mtime != self.faq_mtime:
+                logger.info("FAQ file changed on disk, reloading.")
+                self._load_faq()
+
+    def synthesize(self, text: str, session_metrics: Optional[metrics.SessionMetrics] = None) -> Optional[bytes]:
+        """WAV audio for a prompt, from the cache when it has been spoken before.
+
+        Cache misses are timed as tts_synth in session_metrics (or just the process registry).
+        """
+        if not self.tts_audio:
+            return None
+        with self._tts_lock:
+            if text in self._tts_cache:
+                self._tts_cache.move_to_end(text)
+                return self._tts_cache[text]
+        started = time.perf_counter()
+        audio = self._tts.submit(self._synthesize, text).result()
+        (session_metrics or metrics.registry).observe("tts_synth", time.perf_counter() - started)
+        if audio:
+            with self._tts_lock:
+                self._tts_cache[text] = audio
+                while len(self._tts_cache) > self._tts_cache_size:
+                    self._tts_cache.popitem(last=False)
+        return audio
+
+    def _synthesize(self, text: str) -> Optional[bytes]:
+        """Render text to WAV on the TTS thread, which owns the engine."""
+        try:
+            if self._tts_engine is None:
+                self._tts_engine = pyttsx3.init()
+                self._tts_engine.setProperty('rate', SPEECH_RATE)
+                self._tts_engine.setProperty('volume', SPEECH_VOLUME)
+            fd, path = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+            try:
+                self._tts_engine.save_to_file(text, path)
+                self._tts_engine.runAndWait()
+                return Path(path).read_bytes()
+            finally:
+                os.unlink(path)
+        except Exception as e:
+            logger.error(f"Text-to-speech error: {e}")
+            return None
+
+
+class SharedSession(InterviewAgent):
+    """An interview that borrows the process's loaded resources instead of loading its own."""
+
+    model = property(lambda self: self.resources.model)
+    llm = property(lambda self: self.resources.llm)
+    faq_data = property(lambda self: self.resources.faq_data)
+    faq_index = property(lambda self: self.resources.faq_index)
+    faq_embeddings = property(lambda self: self.resources.faq_embeddings)
+    persistence = property(lambda self: self.resources.persistence)
+
+    def __init__(self, resources: SharedResources, audio_source: AudioSource, audio_sink: AudioSink):
+        self.resources = resources
+        self.session_id: Optional[str] = None
+        super().__init__(audio_source, audio_sink)
+
+    def load_resources(self):
+        # Nothing is loaded per session; the properties above read the shared resources
+        pass
+
+    def next_session_id(self) -> str:
+        self.session_id = self.resources.next_session_id()
+        return self.session_id
+
+    def refresh_faq_if_changed(self):
+        self.resources.refresh_faq_if_changed()
+
+
+class FrameSource(AudioSource):
+    """Audio frames streamed by the session's client for the current listen."""
+
+    def __init__(self, session: "RemoteSession"):
+        self.session = session
+        self.frames: "queue.Queue[Optional[Tuple[bytes, bytes]]]" = queue.Queue()
+
+    def stream(self, timeout: float) -> Iterator[bytes]:
+        listen_id = self.session.listen_count
+        deadline = time.monotonic() + timeout + INTERVIEW_SERVER_LISTEN_GRACE
+        streaming = False
+        while time.monotonic() < deadline:
+            try:
+                frame = self.frames.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if frame is None:
+                raise ClientDisconnected(f"Client disconnected during session {self.session.session_id}")
+            kind, payload = frame
+            if kind == STREAM_START:
+                streaming = json.loads(payload).get("listen") == listen_id
+            elif kind == AUDIO and streaming:
+                yield payload
+            # Anything else is audio still in flight from an earlier turn
+
+    def close(self) -> None:
+        self.frames.put(None)
+
+
+class FrameSink(AudioSink):
+    """Sends each prompt to the client as text, then as synthesized audio."""
+
+    def __init__(self, session: "RemoteSession"):
+        self.session = session
+
+    def say(self, text: str) -> None:
+        self.session.send(SPEAK, {"text": text})
+        audio = self.session.resources.synthesize(text, self.session.metrics)
+        if audio:
+            self.session.send(TTS_AUDIO, audio)
+
+
+class RemoteSession(SharedSession):
+    """One interview driven by a network client instead of the microphone and speaker."""
+
+    def __init__(self, resources: SharedResources, loop: asyncio.AbstractEventLoop, outgoing: asyncio.Queue):
+        self.loop = loop
+        self.outgoing = outgoing
+        self.listen_count = 0
+        super().__init__(resources, FrameSource(self), FrameSink(self))
+
+    def send(self, kind: bytes, payload: Any = b"") -> None:
+        """Queue a frame for the client; safe to call from the session thread."""
+        self.loop.call_soon_threadsafe(self.outgoing.put_nowait, encode_frame(kind, payload))
+
+    def listen(self, timeout: int = 20) -> str:
+        """Ask the client to stream its answer and recognize it with this session's own recognizer."""
+        self.listen_count += 1
+        self.send(LISTEN, {"listen": self.listen_count, "timeout": timeout})
+        transcription = self._listen_vosk_original(timeout)
+        self.send(LISTEN_END, {"listen": self.listen_count, "text": transcription})
+        return transcription
+
+    async def run(self, executor: ThreadPoolExecutor, resume_session: Optional[str] = None) -> None:
+        """The conduct_interview flow as a coroutine: it runs on a worker thread and is awaited here."""
+        self.session_id = resume_session
+        await self.loop.run_in_executor(executor, self.conduct_interview, resume_session)
+
+
+class InterviewServer:
+    """Asyncio front end: one connection per interview, sessions on a shared thread pool."""
+
+    def __init__(self, resources: SharedResources, host: str = INTERVIEW_SERVER_HOST,
+                 port: int = INTERVIEW_SERVER_PORT, max_sessions: int = INTERVIEW_SERVER_MAX_SESSIONS):
+        self.resources = resources
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.executor = ThreadPoolExecutor(max_sessions, thread_name_prefix="session")
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self._sessions: set = set()
+
+    def status(self) -> Dict[str, int]:
+        return {"active": self.active, "completed": self.completed, "failed": self.failed}
+
+    async def serve_forever(self) -> None:
+        server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        print(f"🎙️  Interview server listening on {self.host}:{self.port} (up to {self.max_sessions} sessions)")
+        async with server:
+            await server.serve_forever()
+
+    async def _resume_error(self, resume: Any) -> Optional[str]:
+        """Why a HELLO's resume ID cannot be accepted, or None if it can.
+
+        Only interrupted sessions from the journal directory may be resumed,
+        and never one another connection is already running.
+        """
+        if resume is None:
+            return None
+        incomplete = await asyncio.get_running_loop().run_in_executor(None, find_incomplete_sessions)
+        if not isinstance(resume, str) or resume not in incomplete:
+            return "No interrupted session with that ID"
+        if any(session.session_id == resume for session in self._sessions):
+            return "That session is already in progress"
+        return None
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self.active >= self.max_sessions:
+            writer.write(encode_frame(ERROR, {"error": "Server is at its session limit"}))
+            await writer.drain()
+            writer.close()
+            return
+        self.active += 1
+        outgoing: asyncio.Queue = asyncio.Queue()
+        session = RemoteSession(self.resources, asyncio.get_running_loop(), outgoing)
+        sender = asyncio.create_task(self._send_frames(writer, outgoing))
+        receiver = None
+        try:
+            kind, payload = await read_frame(reader)
+            hello = json.loads(payload) if kind == HELLO else {}
+            resume = hello.get("resume") if isinstance(hello, dict) else None
+            error = await self._resume_error(resume)
+            if error:
+                logger.warning(f"Rejected resume of {resume!r}: {error}")
+                outgoing.put_nowait(encode_frame(ERROR, {"error": error}))
+                return
+            # Claimed before any await, so a second connection for the same ID is turned away
+            session.session_id = resume
+            self._sessions.add(session)
+            receiver = asyncio.create_task(self._receive_frames(reader, session))
+            await session.run(self.executor, resume)
+            outgoing.put_nowait(encode_frame(DONE, {
+                "session_id": session.session_id, "candidate_name": session.candidate_name
+            }))
+            self.completed += 1
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.failed += 1
+            logger.warning(f"Client left session {session.session_id}; its journal can be resumed")
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Error in session {session.session_id}: {e}")
+            outgoing.put_nowait(encode_frame(ERROR, {"error": str(e)}))
+        finally:
+            self.active -= 1
+            self._sessions.discard(session)
+            if receiver is not None:
+                receiver.cancel()
+            session.audio_source.close()
+            outgoing.put_nowait(None)
+            await sender
+            writer.close()
+
+    async def _receive_frames(self, reader: asyncio.StreamReader, session: RemoteSession) -> None:
+        try:
+            while True:
+                session.audio_source.frames.put(await read_frame(reader))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            session.audio_source.frames.put(None)
+
+    async def _send_frames(self, writer: asyncio.StreamWriter, outgoing: asyncio.Queue) -> None:
+        while True:
+            frame = await outgoing.get()
+            if frame is None:
+                return
+            try:
+                writer.write(frame)
+                await writer.drain()
+            except ConnectionError:
+                return
+
+
+async def _stream_answer(writer: asyncio.StreamWriter, listen_id: int, answer_pcm: bytes,
+                         timeout: float, realtime: bool) -> None:
+    """Stream the answer, then silence, until the server ends the listen."""
+    writer.write(encode_frame(STREAM_START, {"listen": listen_id}))
+    chunk_seconds = CHUNK_SIZE / SAMPLE_RATE
+    for chunk in ScriptedSource([answer_pcm]).stream(timeout):
+        writer.write(encode_frame(AUDIO, chunk))
+        await writer.drain()
+        await asyncio.sleep(chunk_seconds if realtime else 0)
+
+
+async def fake_client(host: str, port: int, answers: Optional[List[bytes]] = None, realtime: bool = False) -> Dict[str, Any]:
+    """Play one candidate: answer each listen with the next recording, then stay silent.
+
+    Silence ends the question round at the close of the interview. The prompts' audio is ignored.
+    """
+    answers = list(answers or [])
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode_frame(HELLO, {"resume": None}))
+    started = time.monotonic()
+    prompts = 0
+    latencies: List[float] = []
+    listen_ended: Optional[float] = None
+    streamer: Optional[asyncio.Task] = None
+    try:
+        while True:
+            kind, payload = await read_frame(reader)
+            if kind == SPEAK:
+                prompts += 1
+                if listen_ended is not None:
+                    latencies.append(time.monotonic() - listen_ended)
+                    listen_ended = None
+            elif kind == LISTEN:
+                message = json.loads(payload)
+                answer_pcm = answers.pop(0) if answers else b""
+                streamer = asyncio.create_task(
+                    _stream_answer(writer, message["listen"], answer_pcm, message["timeout"], realtime)
+                )
+            elif kind == LISTEN_END:
+                if streamer is not None:
+                    streamer.cancel()
+                    streamer = None
+                listen_ended = time.monotonic()
+            elif kind == DONE:
+                result = json.loads(payload)
+                break
+            elif kind == ERROR:
+                raise RuntimeError(json.loads(payload)["error"])
+    finally:
+        if streamer is not None:
+            streamer.cancel()
+        writer.close()
+    result.update(duration=time.monotonic() - started, prompts=prompts, latencies=latencies)
+    return result
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+async def run_fake_clients(count: int, host: str, port: int, answers: Optional[List[bytes]] = None,
+                           realtime: bool = False) -> None:
+    """Run count fake candidates at once against a running server and print a summary."""
+    started = time.monotonic()
+    results = await asyncio.gather(*(fake_client(host, port, answers, realtime) for _ in range(count)),
+                                   return_exceptions=True)
+    elapsed = time.monotonic() - started
+    finished = [r for r in results if isinstance(r, dict)]
+    for error in (r for r in results if isinstance(r, BaseException)):
+        logger.error(f"Fake client failed: {error}")
+    latencies = [latency for r in finished for latency in r["latencies"]]
+    print(f"✅ {len(finished)}/{count} sessions completed in {elapsed:.1f}s "
+          f"({len(finished) / elapsed:.2f} sessions/s)")
+    if finished:
+        print(f"⏱️  Session duration p50 {_percentile([r['duration'] for r in finished], 0.5):.2f}s")
+    if latencies:
+        print(f"⏱️  Response latency p50 {_percentile(latencies, 0.5) * 1000:.0f} ms, "
+              f"p95 {_percentile(latencies, 0.95) * 1000:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-session interview server for LunarTech Interview Agent")
+    parser.add_argument("--host", default=INTERVIEW_SERVER_HOST, help="Address to listen on (or connect to)")
+    parser.add_argument("--port", type=int, default=INTERVIEW_SERVER_PORT, help="TCP port")
+    parser.add_argument("--max-sessions", type=int, default=INTERVIEW_SERVER_MAX_SESSIONS,
+                        help="Concurrent interviews")
+    parser.add_argument("--no-tts-audio", action="store_true", help="Send prompts as text only")
+    parser.add_argument("--metrics-port", type=int, default=METRICS_PORT,
+                        help="Serve per-stage latency histograms at /metrics on this port")
+    parser.add_argument("--fake-clients", type=int, metavar="N",
+                        help="Instead of serving, run N fake candidates against a running server")
+    parser.add_argument("--audio", nargs="+", default=[],
+                        help="WAV answers the fake candidates give in turn (silence after the last)")
+    parser.add_argument("--realtime", action="store_true", help="Fake candidates stream audio at real-time speed")
+    args = parser.parse_args()
+
+    if args.fake_clients:
+        answers = [pcm_from_wav(Path(path).read_bytes()) for path in args.audio]
+        asyncio.run(run_fake_clients(args.fake_clients, args.host, args.port, answers, args.realtime))
+        return
+
+    print("🚀 Loading shared models...")
+    load_started = time.perf_counter()
+    resources = SharedResources(tts_audio=not args.no_tts_audio)
+    print(f"⏱️  Shared resources loaded in {time.perf_counter() - load_started:.2f}s")
+    server = InterviewServer(resources, args.host, args.port, args.max_sessions)
+    if args.metrics_port:
+        metrics_server = metrics.start_server(args.metrics_port)
+        if metrics_server:
+            print(f"📈 Latency metrics at {metrics_server.url}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print(f"\n🛑 Interview server stopped ({server.status()})")
+    finally:
+        persistence.shutdown()
+
+
+if __name__ == "__main__":
+    main()
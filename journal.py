@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Append-only session event journal for LunarTech AI Interview Agent
+
+Each interview appends JSON lines to data/journals/session_<id>.jsonl:
+what the agent said, when listening started and ended, partial and final
+recognizer hypotheses, confidence scores, clarifications, candidate
+questions and FAQ hits. Every event carries a sequence number and an
+epoch timestamp, so turn timing can be analysed after the fact.
+
+Events are buffered and written in batches. JOURNAL_FSYNC decides when
+they are forced to disk: "always" on every batch, "turn" when a turn or
+the session ends, "never" to leave it to the OS. The human-readable
+transcript is rendered from the journal on demand, and an interview that
+crashed can resume after its last completed turn.
+"""
+
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from config import JOURNAL_DIR, JOURNAL_FSYNC, JOURNAL_FLUSH_INTERVAL, JOURNAL_BUFFER_EVENTS
+
+logger = logging.getLogger(__name__)
+
+# Events that close a unit of work; always flushed, and fsynced under the "turn" policy
+DURABLE_EVENTS = {"turn_end", "session_end"}
+
+_journal_dir = JOURNAL_DIR
+
+
+def set_journal_dir(path: str) -> None:
+    """Keep journals in another directory from now on (e.g. a simulation's scratch directory)."""
+    global _journal_dir
+    _journal_dir = str(path)
+
+
+def get_journal_dir() -> Path:
+    return Path(_journal_dir)
+
+
+def journal_path(session_id: str, journal_dir: Optional[str] = None) -> Path:
+    return Path(journal_dir or _journal_dir) / f"session_{session_id}.jsonl"
+
+
+class SessionJournal:
+    """Buffered, append-only JSONL event writer for one interview session."""
+
+    def __init__(self, session_id: str, journal_dir: Optional[str] = None, fsync: str = JOURNAL_FSYNC,
+                 flush_interval: float = JOURNAL_FLUSH_INTERVAL, buffer_events: int = JOURNAL_BUFFER_EVENTS):
+        if fsync not in ("always", "turn", "never"):
+            raise ValueError(f"Unknown journal fsync policy: {fsync}")
+        self.session_id = session_id
+        self.path = journal_path(session_id, journal_dir)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+        self.flush_interval = flush_interval
+        self.buffer_events = buffer_events
+        self._lock = threading.Lock()
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        # Continue the sequence when appending to an existing journal (resume)
+        existing = list(read_events(self.path)) if self.path.exists() else []
+        self._seq = existing[-1]["seq"] if existing else 0
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self._file.tell() and not _ends_with_newline(self.path):
+            # Terminate a line torn by a crash so new events start on their own line
+            self._file.write("\n")
+
+    def record(self, event: str, **fields: Any) -> Dict[str, Any]:
+        """Append one event; written out in batches according to the flush policy."""
+        with self._lock:
+            self._seq += 1
+            entry = {"seq": self._seq, "t": round(time.time(), 3), "event": event, **fields}
+            self._buffer.append(json.dumps(entry, ensure_ascii=False))
+            durable = event in DURABLE_EVENTS
+            if (durable or len(self._buffer) >= self.buffer_events
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_locked(sync=self.fsync == "always" or (durable and self.fsync == "turn"))
+            return entry
+
+    def flush(self, sync: bool = False) -> None:
+        with self._lock:
+            self._flush_locked(sync)
+
+    def _flush_locked(self, sync: bool) -> None:
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+            self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush_locked(sync=self.fsync != "never")
+            self._file.close()
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def parse_events(lines: Iterable[str], source: Any = "journal") -> Iterator[Dict[str, Any]]:
+    """Parse journal lines, skipping a torn final line left by a crash."""
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            logger.warning(f"Skipping unreadable journal line {line_number} in {source}")
+
+
+def read_events(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the events of a journal file."""
+    with open(path, "r", encoding="utf-8") as f:
+        yield from parse_events(f, path)
+
+
+def _clock(event: Dict[str, Any]) -> str:
+    return datetime.datetime.fromtimestamp(event["t"]).strftime('%H:%M:%S')
+
+
+def render_transcript(events: List[Dict[str, Any]]) -> str:
+    """Human-readable transcript of a session's events."""
+    lines = []
+    for event in events:
+        kind = event["event"]
+        if kind == "session_start":
+            started = datetime.datetime.fromtimestamp(event["t"]).strftime('%Y-%m-%d %H:%M:%S')
+            lines.append(f"LunarTech Interview - {started}\n")
+        elif kind == "session_resumed":
+            lines.append(f"[Resumed {datetime.datetime.fromtimestamp(event['t']).strftime('%Y-%m-%d %H:%M:%S')}]\n")
+        elif kind == "speak":
+            if event.get("question_number"):
+                lines.append(f"Q{event['question_number']}: {event['text']}")
+            elif event.get("kind") == "clarification":
+                lines.append(f"Clarification: {event['text']}")
+            else:
+                lines.append(f"Agent: {event['text']}")
+        elif kind == "response":
+            label = "Clarified A" if event.get("clarified") else "A"
+            lines.append(f"{label}{event['question_number']} [{_clock(event)}]: {event['text']}\n")
+        elif kind == "candidate_question":
+            lines.append(f"Candidate [{_clock(event)}]: {event['text']}")
+    return "\n".join(lines) + "\n"
+
+
+def render_transcript_file(session_id: str, output_file: Path, journal_dir: Optional[str] = None) -> None:
+    """Write the transcript of a journaled session to a text file."""
+    text = render_transcript(list(read_events(journal_path(session_id, journal_dir))))
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def resume_state(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Interview state at the last completed turn of a journal."""
+    state = {
+        "started": None,
+        "answers": [],
+        "answer_durations": [],
+        "candidate_name": "Candidate",
+        "finished": False,
+    }
+    for event in events:
+        kind = event["event"]
+        if kind == "session_start" and state["started"] is None:
+            state["started"] = datetime.datetime.fromtimestamp(event["t"]).isoformat()
+        elif kind == "name_confirmed":
+            state["candidate_name"] = event["name"]
+        elif kind == "turn_end":
+            # Only whole turns count; a turn interrupted mid-way is asked again
+            if event["question_number"] == len(state["answers"]) + 1:
+                state["answers"].append(event["answer"])
+                state["answer_durations"].append(event.get("duration"))
+        elif kind == "session_end":
+            state["finished"] = True
+    return state
+
+
+def _last_event(path: Path, tail_bytes: int = 4096) -> Optional[Dict[str, Any]]:
+    """Last readable event of a journal, read from the end of the file."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - tail_bytes))
+        lines = f.read().decode("utf-8", errors="replace").splitlines()
+    for line in reversed(lines):
+        try:
+            return json.loads(line)
+        except ValueError:
+            continue
+    return None
+
+
+def mark_session_end(session_id: str, journal_dir: Optional[str] = None) -> None:
+    """Append session_end to a journal once its interview is saved, so it is no longer offered for resume."""
+    journal = SessionJournal(session_id, journal_dir)
+    try:
+        journal.record("session_end")
+    finally:
+        journal.close()
+
+
+def find_incomplete_sessions(journal_dir: Optional[str] = None) -> List[str]:
+    """Session IDs whose journal does not end with session_end, oldest first.
+
+    session_end is written after the interview's database commit, so an
+    interview lost between finishing and saving is still listed.
+    """
+    incomplete = []
+    for path in sorted(Path(journal_dir or _journal_dir).glob("session_*.jsonl")):
+        last = _last_event(path)
+        if last is not None and last["event"] != "session_end":
+            incomplete.append(path.stem[len("session_"):])
+    return incomplete
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+LLM backends for LunarTech AI Interview Agent
+
+EnhancedLLM is the rule-based stand-in used by default and for testing
+without model weights; LlamaCppLLM wraps a local GGUF model through
+llama-cpp-python. Both expose generate(prompt, max_tokens, grammar).
+"""
+
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import LLM_CONTEXT_SIZE, LLM_THREADS, MODELS_DIR
+from faq_index import tokenize
+
+# For now, I'll use an enhanced mock LLM that provides better responses
+# In production, you would integrate with a working LLM library
+
+class EnhancedLLM:
+    """Enhanced LLM with better logic for interview responses."""
+    
+    def __init__(self):
+        print("✅ Initialized Enhanced LLM for interview processing")
+    
+    def generate(self, prompt, max_tokens=512, grammar=None):
+        """Generate intelligent responses based on the prompt.
+
+        The grammar argument is accepted for interface compatibility with
+        grammar-constrained backends; this model's output already conforms.
+        """
+        print(f"🧠 [Enhanced LLM] Processing: {prompt[:50]}...")
+        
+        # Analyze answer quality
+        if "clear and relevant" in prompt.lower():
+            # Extract the actual answer from the prompt
+            lines = prompt.split('\n')
+            answer_line = ""
+            for line in lines:
+                if 'answer:' in line.lower():
+                    answer_line = line.split(':')[-1].strip().strip('"')
+                    break
+            
+            if not answer_line:
+                return "NO"
+            
+            # Check answer quality
+            words = answer_line.split()
+            if len(words) < 3:
+                return "NO"
+            
+            # Look for meaningful content
+            meaningful_words = ['experience', 'work', 'study', 'learn', 'develop', 'skills', 
+                              'project', 'interested', 'passionate', 'goal', 'ready', 'prepared']
+            
+            if any(word in answer_line.lower() for word in meaningful_words) and len(words) >= 5:
+                return "YES"
+            else:
+                return "NO"
+        
+        # Handle FAQ matching: pick the listed candidate sharing most words with the query
+        if "which faq" in prompt.lower():
+            query_match = re.search(r'Query: "(.*)"', prompt)
+            query_terms = set(tokenize(query_match.group(1))) if query_match else set()
+            best_number, best_overlap = "NONE", 0
+            for number, candidate in re.findall(r'^\s*(\d+)\.\s+(.+)$', prompt, re.MULTILINE):
+                overlap = len(query_terms & set(tokenize(candidate)))
+                if overlap > best_overlap:
+                    best_number, best_overlap = number, overlap
+            return best_number
+        
+        # Handle interview summary generation
+        if "Below is an interview" in prompt and "JSON_DATA:" in prompt:
+            # Extract candidate name from prompt
+            candidate_name = "Candidate"
+            name_match = re.search(r"a candidate named '([^']*)'", prompt)
+            if name_match:
+                candidate_name = name_match.group(1)
+
+            # Extract interview content
+            lines = prompt.split('\n')
+            questions = []
+            answers = []
+            
+            current_question = ""
+            current_answer = ""
+            
+            for line in lines:
+                line = line.strip()
+                if line.startswith('Question'):
+                    if current_question and current_answer:
+                        questions.append(current_question)
+                        answers.append(current_answer)
+                    current_question = line
+                    current_answer = ""
+                elif line.startswith('Answer'):
+                    current_answer = line
+            
+            # Add the last Q&A pair
+            if current_question and current_answer:
+                questions.append(current_question)
+                answers.append(current_answer)
+            
+            # Generate summary
+            summary = self._generate_interview_summary(questions, answers)
+            json_data = self._extract_candidate_info(answers, candidate_name=candidate_name)
+            
+            return f"{summary}\n\nJSON_DATA:\n{json_data}"
+        
+        # Default response
+        return "I understand and will provide appropriate assistance based on the context."
+    
+    def _generate_interview_summary(self, questions, answers):
+        """Generate a summary of the interview."""
+        summary = "Interview Summary:\n\n"
+        summary += "The candidate participated in a comprehensive interview covering their background, "
+        summary += "motivations, experience, and readiness for the LunarTech program. "
+        
+        # Analyze answers for key themes
+        all_text = " ".join(answers).lower()
+        
+        if any(word in all_text for word in ['experience', 'work', 'job', 'project']):
+            summary += "They demonstrated relevant professional experience. "
+        
+        if any(word in all_text for word in ['interested', 'passionate', 'excited', 'want']):
+            summary += "The candidate expressed strong interest in the program. "
+        
+        if any(word in all_text for word in ['ready', 'prepared', 'committed', 'dedicated']):
+            summary += "They appear ready and committed to undertaking the intensive program."
+        
+        return summary
+    
+    def _extract_candidate_info(self, answers, candidate_name="Candidate"):
+        """Extract structured information from answers."""
+        import json
+        
+        all_text = " ".join(answers).lower()
+        
+        # Use the provided candidate name
+        name = candidate_name
+        
+        # Determine interest level
+        interest_level = "medium"
+        if any(word in all_text for word in ['very interested', 'excited', 'passionate', 'love', 'really want']):
+            interest_level = "high"
+        elif any(word in all_text for word in ['not sure', 'maybe', 'considering']):
+            interest_level = "low"
+        
+        # Determine readiness
+        readiness = "medium"
+        if any(word in all_text for word in ['ready', 'prepared', 'committed', 'dedicated', 'definitely']):
+            readiness = "high"
+        elif any(word in all_text for word in ['not ready', 'need time', 'maybe later']):
+            readiness = "low"
+        
+        # Extract background info
+        background = "Entry-level candidate"
+        if any(word in all_text for word in ['experience', 'years', 'work', 'job', 'project']):
+            if any(word in all_text for word in ['senior', 'lead', 'manager', '5 years', 'experienced']):
+                background = "Experienced professional with significant background"
+            else:
+                background = "Professional with some relevant experience"
+        
+        if any(word in all_text for word in ['student', 'graduate', 'university', 'college', 'degree']):
+            background = "Recent graduate or current student"
+        
+        info = {
+            "name": name,
+            "interest_level": interest_level,
+            "readiness": readiness,
+            "background": background
+        }
+        
+        return json.dumps(info, indent=2)
+
+
+class LlamaCppLLM:
+    """Local GGUF model served through llama-cpp-python.
+
+    A llama.cpp context cannot run two generations at once, so calls from
+    concurrent sessions are serialized.
+    """
+    
+    def __init__(self, model_path: str, n_ctx: int = LLM_CONTEXT_SIZE, n_threads: int = LLM_THREADS):
+        from llama_cpp import Llama
+        
+        self.model = Llama(model_path=model_path, n_ctx=n_ctx, n_threads=n_threads, verbose=False)
+        self._grammars: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        print(f"✅ Loaded local LLM from {model_path}")
+    
+    def _compile_grammar(self, grammar: str):
+        """Compile a GBNF grammar once and reuse it for later requests."""
+        if grammar not in self._grammars:
+            from llama_cpp import LlamaGrammar
+            self._grammars[grammar] = LlamaGrammar.from_string(grammar, verbose=False)
+        return self._grammars[grammar]
+    
+    def generate(self, prompt, max_tokens=512, grammar=None):
+        """Generate a completion, constrained by grammar when given."""
+        kwargs = {}
+        with self._lock:
+            if grammar:
+                kwargs["grammar"] = self._compile_grammar(grammar)
+            output = self.model(prompt, max_tokens=max_tokens, **kwargs)
+        return output["choices"][0]["text"]
+
+
+def find_gguf_model() -> Optional[str]:
+    """Return the first GGUF model found in the models directory."""
+    models = sorted(Path(MODELS_DIR).glob("*.gguf"))
+    return str(models[0]) if models else None
+
+
+def create_llm(backend: str = "enhanced", model_path: Optional[str] = None):
+    """Create an LLM backend by name ("enhanced" or "llama")."""
+    if backend == "llama":
+        model_path = model_path or find_gguf_model()
+        if not model_path:
+            raise FileNotFoundError(f"No GGUF model found in {MODELS_DIR}/")
+        return LlamaCppLLM(model_path)
+    if backend == "enhanced":
+        return EnhancedLLM()
+    raise ValueError(f"Unknown LLM backend: {backend}")
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Shared LLM worker process for LunarTech AI Interview Agent
+
+Loads one model per host and serves every agent over a local socket
+(a Unix socket, or a named pipe on Windows). Concurrent requests are
+collected into micro-batches: the first request opens a short batching
+window, requests are ordered by deadline, and any request whose deadline
+has already passed is answered with an error instead of being computed.
+
+Usage:
+    python llm_server.py [--backend enhanced|llama] [--model PATH] [--address ADDR]
+"""
+
+import argparse
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import (
+    LLM_BACKEND, LLM_BATCH_WINDOW, LLM_MAX_BATCH_SIZE, LLM_MODEL_PATH,
+    LLM_REQUEST_TIMEOUT, LLM_SERVER_ADDRESS, LLM_SERVER_AUTHKEY,
+)
+from llm import create_llm
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ADDRESS = r"\\.\pipe\lunartech_llm" if sys.platform == "win32" else "data/llm_server.sock"
+
+
+@dataclass(order=True)
+class _Request:
+    """A queued generation request, ordered by deadline."""
+    deadline: float
+    seq: int
+    message: Dict[str, Any] = field(compare=False)
+    conn: Any = field(compare=False)
+    send_lock: threading.Lock = field(compare=False)
+
+
+def _validate(message: Any) -> Optional[str]:
+    """Why a generation request is malformed, or None if it can be queued."""
+    if not isinstance(message, dict):
+        return "request must be a dict"
+    if not isinstance(message.get("prompt"), str):
+        return "prompt must be a string"
+    if not isinstance(message.get("max_tokens", 512), int) or isinstance(message.get("max_tokens"), bool):
+        return "max_tokens must be an integer"
+    if not isinstance(message.get("grammar"), (str, type(None))):
+        return "grammar must be a string"
+    timeout = message.get("timeout")
+    if timeout is not None and (not isinstance(timeout, (int, float)) or timeout <= 0):
+        return "timeout must be a positive number"
+    return None
+
+
+class LLMServer:
+    """Serve one loaded LLM to many agents with deadline-aware micro-batching."""
+
+    def __init__(self, llm, address: str = DEFAULT_ADDRESS, authkey: bytes = LLM_SERVER_AUTHKEY,
+                 max_batch_size: int = LLM_MAX_BATCH_SIZE, batch_window: float = LLM_BATCH_WINDOW):
+        self.llm = llm
+        self.address = address
+        self.authkey = authkey
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.requests: "queue.Queue[_Request]" = queue.Queue()
+        self._seq = 0
+        self._seq_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._listener: Optional[Listener] = None
+        self._batch_thread: Optional[threading.Thread] = None
+        self.metrics = {
+            "requests": 0,
+            "completed": 0,
+            "expired": 0,
+            "errors": 0,
+            "batches": 0,
+            "batched_requests": 0,
+            "last_batch_size": 0,
+            "max_batch_size_seen": 0,
+            "batch_size_histogram": {},
+            "busy_seconds": 0.0,
+        }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Snapshot of server metrics including the current queue depth."""
+        with self._metrics_lock:
+            snapshot = dict(self.metrics)
+            snapshot["batch_size_histogram"] = dict(self.metrics["batch_size_histogram"])
+        snapshot["queue_depth"] = self.requests.qsize()
+        batches = snapshot["batches"]
+        snapshot["avg_batch_size"] = snapshot["batched_requests"] / batches if batches else 0.0
+        return snapshot
+
+    def serve_forever(self):
+        """Accept agent connections until stop() is called."""
+        if not self.address.startswith("\\\\") and os.path.exists(self.address):
+            os.unlink(self.address)  # Stale socket from a previous run
+        self._listener = Listener(self.address, authkey=self.authkey)
+        self._batch_thread = threading.Thread(target=self._batch_loop, name="llm-batches", daemon=True)
+        self._batch_thread.start()
+        logger.info(f"LLM server listening on {self.address}")
+        print(f"🧠 LLM server listening on {self.address}")
+
+        while not self._stopped.is_set():
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                break  # Listener closed by stop()
+            except Exception as e:
+                logger.warning(f"Rejected LLM client connection: {e}")
+                continue
+            threading.Thread(target=self._handle_connection, args=(conn,), daemon=True).start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop accepting connections and wait for the batching loop to finish its current batch."""
+        self._stopped.set()
+        if self._listener is not None:
+            self._listener.close()
+        if self._batch_thread is not None:
+            self._batch_thread.join(timeout)
+        # Requests still queued will never run; tell their agents instead of leaving them waiting
+        while True:
+            try:
+                request = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            self._reply(request, {"id": request.message.get("id"), "error": "server stopped"}, "errors")
+
+    def _handle_connection(self, conn):
+        """Read requests from one agent and queue them for batching."""
+        send_lock = threading.Lock()
+        try:
+            while not self._stopped.is_set():
+                message = conn.recv()
+                if isinstance(message, dict) and message.get("op") == "metrics":
+                    with send_lock:
+                        conn.send({"id": message.get("id"), "metrics": self.get_metrics()})
+                    continue
+                error = _validate(message)
+                if error:
+                    with self._metrics_lock:
+                        self.metrics["requests"] += 1
+                        self.metrics["errors"] += 1
+                    with send_lock:
+                        conn.send({"id": message.get("id") if isinstance(message, dict) else None, "error": error})
+                    continue
+
+                timeout = message.get("timeout") or LLM_REQUEST_TIMEOUT
+                with self._seq_lock:
+                    self._seq += 1
+                    seq = self._seq
+                with self._metrics_lock:
+                    self.metrics["requests"] += 1
+                self.requests.put(_Request(time.monotonic() + timeout, seq, message, conn, send_lock))
+        except (EOFError, OSError):
+            pass  # Agent disconnected
+        finally:
+            conn.close()
+
+    def _collect_batch(self, poll_interval: float = 0.5) -> List[_Request]:
+        """Wait for one request, then gather more until the window closes.
+
+        Returns an empty batch after poll_interval without requests, so the loop can notice stop().
+        """
+        try:
+            batch = [self.requests.get(timeout=poll_interval)]
+        except queue.Empty:
+            return []
+        window_end = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            remaining = window_end - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return sorted(batch)
+
+    def _batch_loop(self):
+        """Run micro-batches until the server is stopped."""
+        while not self._stopped.is_set():
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            started = time.monotonic()
+            self._run_batch(batch)
+            with self._metrics_lock:
+                self.metrics["batches"] += 1
+                self.metrics["batched_requests"] += len(batch)
+                self.metrics["last_batch_size"] = len(batch)
+                self.metrics["max_batch_size_seen"] = max(self.metrics["max_batch_size_seen"], len(batch))
+                histogram = self.metrics["batch_size_histogram"]
+                histogram[len(batch)] = histogram.get(len(batch), 0) + 1
+                self.metrics["busy_seconds"] += time.monotonic() - started
+
+    def _run_batch(self, batch: List[_Request]):
+        """Generate responses for a batch, earliest deadline first."""
+        # Identical prompts in the same batch are generated once
+        results: Dict[tuple, Dict[str, Any]] = {}
+        for request in batch:
+            message = request.message
+            if time.monotonic() > request.deadline:
+                self._reply(request, {"id": message.get("id"), "error": "deadline exceeded"}, "expired")
+                continue
+
+            try:
+                key = (message["prompt"], message.get("max_tokens", 512), message.get("grammar"))
+                if key not in results:
+                    results[key] = self._generate(*key)
+            except (KeyError, TypeError) as e:
+                # A malformed request fails alone instead of taking down the batch thread
+                self._reply(request, {"id": message.get("id"), "error": f"malformed request: {e}"}, "errors")
+                continue
+
+            response = dict(results[key], id=message.get("id"))
+            self._reply(request, response, "errors" if "error" in response else "completed")
+
+    def _generate(self, prompt: str, max_tokens: int, grammar: Optional[str]) -> Dict[str, Any]:
+        try:
+            return {"text": self.llm.generate(prompt, max_tokens=max_tokens, grammar=grammar)}
+        except Exception as e:
+            logger.error(f"LLM server generation error: {e}")
+            return {"error": str(e)}
+
+    def _reply(self, request: _Request, response: Dict[str, Any], outcome: str):
+        """Send a response back to the requesting agent."""
+        with self._metrics_lock:
+            self.metrics[outcome] += 1
+        try:
+            with request.send_lock:
+                request.conn.send(response)
+        except (EOFError, OSError):
+            pass  # Agent went away before the answer was ready
+
+
+class LLMClient:
+    """Agent-side proxy with the same generate() interface as local backends.
+
+    Safe to share between sessions: one connection carries every thread's
+    requests and replies are matched to them by id, so concurrent requests
+    reach the server together and can share a micro-batch.
+    """
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, authkey: bytes = LLM_SERVER_AUTHKEY,
+                 timeout: float = LLM_REQUEST_TIMEOUT):
+        self.address = address
+        self.authkey = authkey
+        self.timeout = timeout
+        self._conn = None
+        self._lock = threading.Lock()  # Guards the connection, sends and _pending; never held while waiting
+        self._next_id = 0
+        self._pending: Dict[int, Tuple[Any, "queue.Queue"]] = {}  # id -> (connection, reply slot)
+
+    def connect(self, timeout: float = 5.0) -> None:
+        """Connect now and check that the server answers, raising if it is unreachable."""
+        self._request({"op": "metrics"}, timeout)
+
+    def _connection(self):
+        """The open connection, connecting and starting its reply reader if needed (call with _lock held)."""
+        if self._conn is None:
+            self._conn = Client(self.address, authkey=self.authkey)
+            threading.Thread(target=self._read_replies, args=(self._conn,), name="llm-client", daemon=True).start()
+        return self._conn
+
+    def _discard(self, conn) -> None:
+        """Close conn if it is still the current connection (call with _lock held)."""
+        if self._conn is conn and conn is not None:
+            self._conn = None
+            conn.close()
+
+    def _read_replies(self, conn, poll_interval: float = 0.5):
+        """Hand each response on conn to the request waiting for its id, until conn closes."""
+        try:
+            while self._conn is conn:
+                if not conn.poll(poll_interval):
+                    continue
+                response = conn.recv()
+                with self._lock:
+                    # Replies to requests that already timed out have no waiter and are dropped
+                    entry = self._pending.pop(response.get("id"), None)
+                if entry is not None:
+                    entry[1].put(response)
+        except (EOFError, OSError) as e:
+            error = e
+        else:
+            error = EOFError("LLM server connection closed")
+        with self._lock:
+            if self._conn is conn:
+                self._conn = None
+            waiting = [request_id for request_id, (owner, _) in self._pending.items() if owner is conn]
+            for request_id in waiting:
+                self._pending.pop(request_id)[1].put(error)
+
+    def _request(self, message: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send one message and wait for its response, reconnecting once.
+
+        Raises TimeoutError if no response arrives in time (the request's own
+        deadline plus a grace second by default), so a stuck server cannot hang the agent.
+        """
+        timeout = self.timeout + 1.0 if timeout is None else timeout
+        for attempt in range(2):
+            replies: "queue.Queue" = queue.Queue(1)
+            with self._lock:
+                self._next_id += 1
+                message["id"] = self._next_id
+                conn = None
+                try:
+                    conn = self._connection()
+                    self._pending[message["id"]] = (conn, replies)
+                    conn.send(message)
+                except (EOFError, OSError):
+                    self._pending.pop(message["id"], None)
+                    self._discard(conn)
+                    if attempt:
+                        raise
+                    continue
+            try:
+                response = replies.get(timeout=timeout)
+            except queue.Empty:
+                with self._lock:
+                    self._pending.pop(message["id"], None)
+                raise TimeoutError(f"LLM server did not answer within {timeout:.1f}s")
+            if isinstance(response, Exception):
+                if attempt:
+                    raise response
+                continue
+            return response
+
+    def generate(self, prompt, max_tokens=512, grammar=None):
+        """Generate a completion on the shared LLM server."""
+        response = self._request({
+            "prompt": prompt,
+            "max_tokens": max_tokens,
+            "grammar": grammar,
+            "timeout": self.timeout,
+        })
+        if "error" in response:
+            raise RuntimeError(f"LLM server error: {response['error']}")
+        return response["text"]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Fetch queue depth and batching metrics from the server."""
+        return self._request({"op": "metrics"})["metrics"]
+
+    def close(self):
+        """Close the connection to the server."""
+        with self._lock:
+            self._discard(self._conn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared LLM worker for LunarTech Interview Agent")
+    parser.add_argument("--backend", choices=["enhanced", "llama"], default=LLM_BACKEND,
+                        help="'enhanced' (rule-based stand-in, no weights) or 'llama' (GGUF model)")
+    parser.add_argument("--model", default=LLM_MODEL_PATH, help="Path to a GGUF model for the llama backend")
+    parser.add_argument("--address", default=LLM_SERVER_ADDRESS or DEFAULT_ADDRESS,
+                        help="Unix socket path or Windows named pipe to listen on")
+    parser.add_argument("--max-batch", type=int, default=LLM_MAX_BATCH_SIZE, help="Maximum micro-batch size")
+    parser.add_argument("--window", type=float, default=LLM_BATCH_WINDOW, help="Batching window in seconds")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    server = LLMServer(create_llm(args.backend, args.model), args.address,
+                       max_batch_size=args.max_batch, batch_window=args.window)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 LLM server stopped")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Asynchronous structured logging for LunarTech AI Interview Agent
+
+Log calls on the interview and audio threads only render the message and
+put the record on a queue. A listener thread owns every handler. It
+writes the records as JSON lines to a size-rotated file, plus an optional
+human-readable copy on stderr, so file and console I/O never happen on
+the calling thread. Each record carries the session ID and stage that
+were current where it was logged (see log_context). Per-module levels
+quiet noisy dependencies such as comtypes before their records are even
+queued.
+
+    {"time": "2025-08-17T13:28:05.011", "level": "INFO", "logger": "persistence",
+     "message": "Interview 20250817_132805 persisted", "session_id": "20250817_132805",
+     "stage": null, "thread": "persistence"}
+"""
+
+import atexit
+import contextvars
+import copy
+import datetime
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from config import (
+    LOG_FILE, LOG_LEVEL, LOG_CONSOLE_LEVEL, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_MODULE_LEVELS
+)
+
+CONSOLE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_context: contextvars.ContextVar = contextvars.ContextVar("log_context", default={})
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+_lock = threading.Lock()
+
+
+def set_context(**fields) -> contextvars.Token:
+    """Add fields (e.g. session_id, stage) to every record logged from this thread until reset_context."""
+    return _context.set({**_context.get(), **fields})
+
+
+def reset_context(token: contextvars.Token) -> None:
+    _context.reset(token)
+
+
+@contextmanager
+def log_context(**fields) -> Iterator[None]:
+    """Tag records logged inside the block with fields."""
+    token = set_context(**fields)
+    try:
+        yield
+    finally:
+        reset_context(token)
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """Queues records with their message rendered and the caller's context attached; no I/O."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            # Tracebacks hold frames, so render them before the record changes threads
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        context = _context.get()
+        record.session_id = context.get("session_id")
+        record.stage = context.get("stage")
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "session_id": getattr(record, "session_id", None),
+            "stage": getattr(record, "stage", None),
+            "thread": record.threadName,
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _level(value) -> int:
+    return value if isinstance(value, int) else logging.getLevelName(str(value).upper())
+
+
+def configure_logging(log_file: Optional[str] = LOG_FILE, level=LOG_LEVEL, console_level=LOG_CONSOLE_LEVEL,
+                      module_levels: Optional[Dict[str, Any]] = None) -> None:
+    """Route all logging through a queue to the JSON log file and console.
+
+    Safe to call again; the previous listener is drained and replaced.
+    """
+    global _listener, _queue_handler
+    with _lock:
+        _stop_listener()
+        handlers = []
+        if log_file:
+            Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+            )
+            file_handler.setFormatter(JsonFormatter())
+            handlers.append(file_handler)
+        if console_level:
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(_level(console_level))
+            console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+            handlers.append(console_handler)
+
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _queue_handler = ContextQueueHandler(log_queue)
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            handler.close()
+        root.addHandler(_queue_handler)
+        root.setLevel(_level(level))
+        for name, module_level in {**LOG_MODULE_LEVELS, **(module_levels or {})}.items():
+            logging.getLogger(name).setLevel(_level(module_level))
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+
+def _stop_listener() -> None:
+    """Drain the queue, then attach the handlers to the root logger directly."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    _listener.stop()
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    # Anything logged later during shutdown (e.g. by other atexit hooks) is written synchronously
+    for handler in _listener.handlers:
+        root.addHandler(handler)
+    _listener, _queue_handler = None, None
+
+
+def shutdown() -> None:
+    """Write everything queued; registered to run at exit."""
+    with _lock:
+        _stop_listener()
+
+
+atexit.register(shutdown)
@@ -9,198 +9,38 @@ import json
 import time
 import datetime
 import logging
-import threading
-import queue
 import re
 import csv
-import sqlite3
 from pathlib import Path
+from dataclasses import dataclass
 from typing import Dict, List, Any, Optional, Tuple, Union
 
 # Speech-to-text
 from vosk import Model, KaldiRecognizer
-import pyaudio
 
-# Text-to-speech
-import pyttsx3
+# Audio in/out: microphone and speakers, or scripted/headless backends
+from audio_io import AudioSink, AudioSource, AudioSourceClosed, MicrophoneSource, SpeakerSink
 
 # Import configuration
 from config import *
 
-# Local LLM for dialogue and summarization
-# For now, I'll use an enhanced mock LLM that provides better responses
-# In production, you would integrate with a working LLM library
+from extraction import SUMMARY_GBNF, parse_summary_response
+from faq_embeddings import FAQEmbeddings
+from faq_gaps import log_unanswered_question
+import dashboard
+import log_setup
+import metrics
+import persistence
+import storage
+from journal import SessionJournal, find_incomplete_sessions, journal_path, read_events, resume_state
+from faq_index import FAQIndex
 
-class EnhancedLLM:
-    """Enhanced LLM with better logic for interview responses."""
-    
-    def __init__(self):
-        print("✅ Initialized Enhanced LLM for interview processing")
-    
-    def generate(self, prompt, max_tokens=512):
-        """Generate intelligent responses based on the prompt."""
-        print(f"🧠 [Enhanced LLM] Processing: {prompt[:50]}...")
-        
-        # Analyze answer quality
-        if "clear and relevant" in prompt.lower():
-            # Extract the actual answer from the prompt
-            lines = prompt.split('\n')
-            answer_line = ""
-            for line in lines:
-                if 'answer:' in line.lower():
-                    answer_line = line.split(':')[-1].strip().strip('"')
-                    break
-            
-            if not answer_line:
-                return "NO"
-            
-            # Check answer quality
-            words = answer_line.split()
-            if len(words) < 3:
-                return "NO"
-            
-            # Look for meaningful content
-            meaningful_words = ['experience', 'work', 'study', 'learn', 'develop', 'skills', 
-                              'project', 'interested', 'passionate', 'goal', 'ready', 'prepared']
-            
-            if any(word in answer_line.lower() for word in meaningful_words) and len(words) >= 5:
-                return "YES"
-            else:
-                return "NO"
-        
-        # Handle FAQ matching
-        if "which FAQ" in prompt.lower():
-            query_text = prompt.lower()
-            if any(word in query_text for word in ['cost', 'price', 'money', 'fee', 'pay']):
-                return "1"
-            elif any(word in query_text for word in ['requirement', 'apply', 'need', 'prerequisite']):
-                return "2"
-            elif any(word in query_text for word in ['schedule', 'time', 'duration', 'when', 'hours']):
-                return "3"
-            elif any(word in query_text for word in ['computer', 'laptop', 'equipment', 'device']):
-                return "4"
-            elif any(word in query_text for word in ['certificate', 'certification', 'diploma']):
-                return "5"
-            elif any(word in query_text for word in ['online', 'person', 'remote', 'location']):
-                return "6"
-            elif any(word in query_text for word in ['job', 'placement', 'career', 'employment']):
-                return "7"
-            else:
-                return "NONE"
-        
-        # Handle interview summary generation
-        if "Below is an interview" in prompt and "JSON_DATA:" in prompt:
-            # Extract candidate name from prompt
-            candidate_name = "Candidate"
-            name_match = re.search(r"a candidate named '([^']*)'", prompt)
-            if name_match:
-                candidate_name = name_match.group(1)
-
-            # Extract interview content
-            lines = prompt.split('\n')
-            questions = []
-            answers = []
-            
-            current_question = ""
-            current_answer = ""
-            
-            for line in lines:
-                line = line.strip()
-                if line.startswith('Question'):
-                    if current_question and current_answer:
-                        questions.append(current_question)
-                        answers.append(current_answer)
-                    current_question = line
-                    current_answer = ""
-                elif line.startswith('Answer'):
-                    current_answer = line
-            
-            # Add the last Q&A pair
-            if current_question and current_answer:
-                questions.append(current_question)
-                answers.append(current_answer)
-            
-            # Generate summary
-            summary = self._generate_interview_summary(questions, answers)
-            json_data = self._extract_candidate_info(answers, candidate_name=candidate_name)
-            
-            return f"{summary}\n\nJSON_DATA:\n{json_data}"
-        
-        # Default response
-        return "I understand and will provide appropriate assistance based on the context."
-    
-    def _generate_interview_summary(self, questions, answers):
-        """Generate a summary of the interview."""
-        summary = "Interview Summary:\n\n"
-        summary += "The candidate participated in a comprehensive interview covering their background, "
-        summary += "motivations, experience, and readiness for the LunarTech program. "
-        
-        # Analyze answers for key themes
-        all_text = " ".join(answers).lower()
-        
-        if any(word in all_text for word in ['experience', 'work', 'job', 'project']):
-            summary += "They demonstrated relevant professional experience. "
-        
-        if any(word in all_text for word in ['interested', 'passionate', 'excited', 'want']):
-            summary += "The candidate expressed strong interest in the program. "
-        
-        if any(word in all_text for word in ['ready', 'prepared', 'committed', 'dedicated']):
-            summary += "They appear ready and committed to undertaking the intensive program."
-        
-        return summary
-    
-    def _extract_candidate_info(self, answers, candidate_name="Candidate"):
-        """Extract structured information from answers."""
-        import json
-        
-        all_text = " ".join(answers).lower()
-        
-        # Use the provided candidate name
-        name = candidate_name
-        
-        # Determine interest level
-        interest_level = "medium"
-        if any(word in all_text for word in ['very interested', 'excited', 'passionate', 'love', 'really want']):
-            interest_level = "high"
-        elif any(word in all_text for word in ['not sure', 'maybe', 'considering']):
-            interest_level = "low"
-        
-        # Determine readiness
-        readiness = "medium"
-        if any(word in all_text for word in ['ready', 'prepared', 'committed', 'dedicated', 'definitely']):
-            readiness = "high"
-        elif any(word in all_text for word in ['not ready', 'need time', 'maybe later']):
-            readiness = "low"
-        
-        # Extract background info
-        background = "Entry-level candidate"
-        if any(word in all_text for word in ['experience', 'years', 'work', 'job', 'project']):
-            if any(word in all_text for word in ['senior', 'lead', 'manager', '5 years', 'experienced']):
-                background = "Experienced professional with significant background"
-            else:
-                background = "Professional with some relevant experience"
-        
-        if any(word in all_text for word in ['student', 'graduate', 'university', 'college', 'degree']):
-            background = "Recent graduate or current student"
-        
-        info = {
-            "name": name,
-            "interest_level": interest_level,
-            "readiness": readiness,
-            "background": background
-        }
-        
-        return json.dumps(info, indent=2)
+# Local LLM for dialogue and summarization
+from llm import create_llm
+from llm_server import LLMClient
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("session_logs.csv", mode="a"),
-        logging.StreamHandler()
-    ]
-)
+# Set up logging: JSON lines to LOG_FILE, written on a background thread
+log_setup.configure_logging()
 logger = logging.getLogger(__name__)
 
 # Setup directories from config
@@ -215,29 +55,140 @@ TRANSCRIPTS_DIR_PATH.mkdir(parents=True, exist_ok=True)
 SUMMARIES_DIR_PATH.mkdir(parents=True, exist_ok=True)
 MODELS_DIR_PATH.mkdir(exist_ok=True)
 
+def find_vosk_model() -> Path:
+    """The first Vosk model in the models directory."""
+    vosk_models = list(MODELS_DIR_PATH.glob("vosk*")) + list(MODELS_DIR_PATH.glob("*vosk*"))
+    if not vosk_models:
+        raise FileNotFoundError("No Vosk model found in the models directory")
+    return vosk_models[0]
+
+
+def load_llm():
+    """The LLM for dialogue and summaries: the shared LLM server when configured and reachable, else a local model."""
+    try:
+        if LLM_SERVER_ADDRESS:
+            # Share one loaded model across agents through the LLM worker
+            print(f"🚀 Connecting to shared LLM server at {LLM_SERVER_ADDRESS}...")
+            try:
+                client = LLMClient(LLM_SERVER_ADDRESS)
+                client.connect()
+                logger.info(f"Using shared LLM server at {LLM_SERVER_ADDRESS}")
+                return client
+            except Exception as e:
+                logger.warning(f"LLM server at {LLM_SERVER_ADDRESS} unreachable ({e}); loading the model locally")
+                print("⚠️  LLM server unreachable, loading the model locally")
+        print("🚀 Initializing Enhanced LLM for interview processing...")
+        llm = create_llm(LLM_BACKEND, LLM_MODEL_PATH)
+        logger.info(f"LLM backend '{LLM_BACKEND}' initialized successfully")
+        return llm
+        
+    except Exception as e:
+        logger.error(f"Failed to initialize LLM backend '{LLM_BACKEND}': {e}")
+        print(f"❌ Failed to initialize LLM backend: {e}")
+        # Create a simple fallback
+        llm = create_llm("enhanced")  # This should still work as it's very basic
+        logger.info("Enhanced LLM initialized with fallback")
+        return llm
+
+
+@dataclass
+class FAQResources:
+    """The FAQ file's contents and the indexes built from them."""
+    mtime: Optional[float]
+    data: Dict[str, Any]
+    index: FAQIndex
+    embeddings: Optional[FAQEmbeddings]
+
+
+def faq_file_mtime() -> Optional[float]:
+    """Modification time of the FAQ file, or None if there is none."""
+    try:
+        return FAQ_FILE_PATH.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def load_faq_resources(embeddings: Optional[FAQEmbeddings] = None) -> FAQResources:
+    """Load the FAQ file and build its retrieval indexes.
+
+    Passing the previous embeddings lets only changed entries be re-embedded.
+    """
+    mtime = None
+    try:
+        mtime = faq_file_mtime()
+        if mtime is not None:
+            with open(FAQ_FILE_PATH, 'r') as f:
+                data = json.load(f)
+            logger.info("FAQ data loaded successfully.")
+        else:
+            data = {"faqs": []}
+            logger.warning(f"FAQ file not found at {FAQ_FILE_PATH}. Empty FAQ created.")
+    except Exception as e:
+        logger.error(f"Failed to load FAQ: {e}")
+        data = {"faqs": []}
+    
+    # Build the retrieval index once so lookups never scan the whole FAQ
+    index = FAQIndex(data.get("faqs", []))
+    
+    # Memory-map the cached embedding matrix; only changed entries are re-embedded
+    try:
+        if embeddings is None:
+            embeddings = FAQEmbeddings(FAQ_FILE_PATH)
+        embeddings.load(data.get("faqs", []))
+    except Exception as e:
+        logger.warning(f"Semantic FAQ matching disabled, paraphrases will not match: {e}")
+        embeddings = None
+    return FAQResources(mtime, data, index, embeddings)
+
+
 class InterviewAgent:
     """
     LunarTech AI Interview Agent that conducts voice interviews,
     processes responses, and generates summaries.
     """
     
-    def __init__(self):
+    def __init__(self, audio_source: Optional[AudioSource] = None, audio_sink: Optional[AudioSink] = None):
+        """audio_source and audio_sink default to the microphone and speakers."""
+        self.audio_source = audio_source
+        self.audio_sink = audio_sink
+        self.session_id: Optional[str] = None
+        self.load_resources()
+        self.journal: Optional[SessionJournal] = None
+        self.new_session()
+    
+    def load_resources(self):
+        """Load the per-process resources (speech model, TTS, LLM, FAQ, persistence), shared by every session."""
         self.initialize_speech_recognition()
         self.initialize_text_to_speech()
         self.initialize_llm()
         self.load_faq()
+        self.persistence = persistence.get_worker()
+        self.persistence.on_committed(dashboard.on_interview_committed)
+    
+    def new_session(self) -> float:
+        """Reset per-session state for the next candidate. Returns the setup time in seconds."""
+        started = time.perf_counter()
         self.interview_data = {
             "timestamp": datetime.datetime.now().isoformat(),
             "questions": QUESTIONS,
             "answers": [],
+            "answer_durations": [],
             "summary": "",
             "extracted_info": {}
         }
-        self.audio_queue = queue.Queue()
-        self.is_listening = False
         self.transcription = ""
         self.candidate_name = "Candidate"
-        
+        self.session_used = False
+        self.metrics = metrics.SessionMetrics()
+        self._answered_at: Optional[float] = None
+        # Pick up FAQ edits made between candidates
+        self.refresh_faq_if_changed()
+        return time.perf_counter() - started
+        
+    def next_session_id(self) -> str:
+        """ID of a new interview; also names its journal and output files."""
+        return datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    
     def initialize_speech_recognition(self):
         """Initialize speech recognition with Vosk."""
         try:
@@ -254,37 +205,29 @@ class InterviewAgent:
     def _initialize_vosk_only(self):
         """Initialize Vosk-only speech recognition (fallback)."""
         # Find available Vosk model in models directory
-        vosk_models = list(MODELS_DIR_PATH.glob("vosk*")) + list(MODELS_DIR_PATH.glob("*vosk*"))
-        if not vosk_models:
+        try:
+            model_path = str(find_vosk_model())
+        except FileNotFoundError:
             print("Error: No Vosk model found in the models directory.")
             print("Please download a model from https://alphacephei.com/vosk/models")
             print("and place it in the models/ directory.")
             sys.exit(1)
             
-        model_path = str(vosk_models[0])
         self.model = Model(model_path)
         self.recognizer = KaldiRecognizer(self.model, SAMPLE_RATE)
         
-        # Initialize PyAudio
-        self.audio = pyaudio.PyAudio()
+        # Initialize the microphone unless another audio source was given
+        if self.audio_source is None:
+            self.audio_source = MicrophoneSource()
         self.use_hybrid_engine = False
         logger.info("Vosk-only speech recognition initialized successfully.")
     
     def initialize_text_to_speech(self):
-        """Initialize the pyttsx3 text-to-speech engine."""
+        """Initialize the pyttsx3 text-to-speech engine, unless another audio sink was given."""
+        if self.audio_sink is not None:
+            return
         try:
-            self.tts_engine = pyttsx3.init()
-            
-            # Get available voices and set a female voice if available
-            voices = self.tts_engine.getProperty('voices')
-            female_voices = [v for v in voices if 'female' in v.name.lower()]
-            if female_voices:
-                self.tts_engine.setProperty('voice', female_voices[0].id)
-            
-            # Set speech rate and volume from config
-            self.tts_engine.setProperty('rate', SPEECH_RATE)
-            self.tts_engine.setProperty('volume', SPEECH_VOLUME)
-            
+            self.audio_sink = SpeakerSink()
             logger.info("Text-to-speech initialized successfully.")
         except Exception as e:
             logger.error(f"Failed to initialize text-to-speech: {e}")
@@ -292,38 +235,42 @@ class InterviewAgent:
     
     def initialize_llm(self):
         """Initialize the local large language model."""
-        try:
-            print("🚀 Initializing Enhanced LLM for interview processing...")
-            self.llm = EnhancedLLM()
-            logger.info("Enhanced LLM initialized successfully")
-            
-        except Exception as e:
-            logger.error(f"Failed to initialize Enhanced LLM: {e}")
-            print(f"❌ Failed to initialize Enhanced LLM: {e}")
-            # Create a simple fallback
-            self.llm = EnhancedLLM()  # This should still work as it's very basic
-            logger.info("Enhanced LLM initialized with fallback")
+        self.llm = load_llm()
     
     def load_faq(self):
         """Load FAQ data from JSON file."""
+        faq = load_faq_resources(getattr(self, 'faq_embeddings', None))
+        self.faq_mtime, self.faq_data, self.faq_index, self.faq_embeddings = faq.mtime, faq.data, faq.index, faq.embeddings
+    
+    def refresh_faq_if_changed(self):
+        """Reload the FAQ (and embed changed entries) when the file's mtime changes."""
         try:
-            if FAQ_FILE_PATH.exists():
-                with open(FAQ_FILE_PATH, 'r') as f:
-                    self.faq_data = json.load(f)
-                logger.info("FAQ data loaded successfully.")
-            else:
-                self.faq_data = {"faqs": []}
-                logger.warning(f"FAQ file not found at {FAQ_FILE_PATH}. Empty FAQ created.")
-        except Exception as e:
-            logger.error(f"Failed to load FAQ: {e}")
-            self.faq_data = {"faqs": []}
+            mtime = faq_file_mtime()
+        except OSError:
+            return
+        if mtime != self.faq_mtime:
+            logger.info("FAQ file changed on disk, reloading.")
+            self.load_faq()
     
-    def speak(self, text: str):
-        """Convert text to speech and play it."""
+    def record_event(self, event: str, **fields):
+        """Append an event to the current session journal, if a session is running."""
+        if self.journal is not None:
+            self.journal.record(event, **fields)
+    
+    def speak(self, text: str, **event_fields):
+        """Convert text to speech and play it.
+
+        event_fields are added to the journaled speak event (e.g. question_number).
+        """
+        self.record_event("speak", text=text, **event_fields)
+        # Turn latency: from the end of the candidate's answer to the agent's reply
+        if self._answered_at is not None:
+            self.metrics.observe("turn", time.perf_counter() - self._answered_at)
+            self._answered_at = None
         try:
             print(f"Agent: {text}")
-            self.tts_engine.say(text)
-            self.tts_engine.runAndWait()
+            with self.metrics.span("tts"):
+                self.audio_sink.say(text)
         except Exception as e:
             logger.error(f"Text-to-speech error: {e}")
             print(f"Agent: {text} (TTS failed, displaying text only)")
@@ -352,138 +299,131 @@ class InterviewAgent:
             else:
                 return self._listen_vosk_original(timeout)
                 
+        except AudioSourceClosed:
+            raise
         except Exception as e:
             logger.error(f"Speech recognition error: {e}")
             # Ultimate fallback to Vosk
             return self._listen_vosk_original(timeout)
     
     def _listen_vosk_original(self, timeout: int = 30) -> str:
-        """Original Vosk listening implementation with natural conversation timing."""
+        """Vosk listening over the audio source with natural conversation timing.
+
+        Silence and the timeout are counted in seconds of audio received,
+        which for the microphone is the same as wall-clock time.
+        """
         # Clear any previous transcription
         self.transcription = ""
-        self.is_listening = True
-        
-        # Clear the audio queue to avoid interference from previous audio
-        while not self.audio_queue.empty():
-            try:
-                self.audio_queue.get_nowait()
-            except queue.Empty:
-                break
         
         # Reset the recognizer to clear any previous state
         self.recognizer = KaldiRecognizer(self.model, SAMPLE_RATE)
         
-        # Start recording in a separate thread
-        recording_thread = threading.Thread(target=self._record_audio)
-        recording_thread.daemon = True
-        recording_thread.start()
-        
         print("🎤 Listening... (take your time)")
         start_time = time.time()
-        last_speech_time = time.time()
+        audio_seconds = 0.0
+        last_speech = 0.0
+        next_reminder = 10.0
         has_speech = False
+        last_partial = ""
+        first_heard = None
+        last_heard = 0.0
+        self.record_event("listen_start", timeout=timeout)
         
         # Use natural conversation timing
         silence_threshold = SILENCE_THRESHOLD_NATURAL if hasattr(sys.modules[__name__], 'SILENCE_THRESHOLD_NATURAL') else 4.0
         
+        stream_requested = time.perf_counter()
+        stream_opened = False
+        stream = self.audio_source.stream(timeout)
         try:
-            while time.time() - start_time < timeout:
-                if not self.audio_queue.empty():
-                    data = self.audio_queue.get()
-                    
-                    # Process partial results for real-time feedback
-                    if self.recognizer.AcceptWaveform(data):
-                        result = json.loads(self.recognizer.Result())
-                        if result.get("text", "").strip():
-                            new_text = result["text"].strip()
-                            if new_text:
-                                self.transcription = new_text  # Replace, don't append
-                                print(f"✓ Heard: {self.transcription}")
-                                last_speech_time = time.time()
-                                has_speech = True
-                    else:
-                        # Show partial results for immediate feedback (less aggressive)
-                        partial = json.loads(self.recognizer.PartialResult())
-                        if partial.get("partial", "").strip():
-                            partial_text = partial["partial"].strip()
-                            if partial_text and len(partial_text) > 3:  # Longer threshold
-                                print(f"... {partial_text}", end="\r")
+            for data in stream:
+                if not stream_opened:
+                    self.metrics.observe("stream_open", time.perf_counter() - stream_requested)
+                    stream_opened = True
+                audio_seconds += len(data) / (2 * SAMPLE_RATE)
+                
+                # Process partial results for real-time feedback
+                if self.recognizer.AcceptWaveform(data):
+                    result = json.loads(self.recognizer.Result())
+                    new_text = result.get("text", "").strip()
+                    if new_text:
+                        self.transcription = new_text  # Replace, don't append
+                        self.record_event("final", text=new_text)
+                        print(f"✓ Heard: {self.transcription}")
+                        last_speech = last_heard = audio_seconds
+                        has_speech = True
+                else:
+                    # Show partial results for immediate feedback (less aggressive)
+                    partial = json.loads(self.recognizer.PartialResult())
+                    partial_text = partial.get("partial", "").strip()
+                    if partial_text and len(partial_text) > 3:  # Longer threshold
+                        print(f"... {partial_text}", end="\r")
+                    if partial_text and partial_text != last_partial:
+                        self.record_event("partial", text=partial_text)
+                        last_partial = partial_text
+                        last_heard = audio_seconds
+                
+                if first_heard is None and (has_speech or last_partial):
+                    first_heard = audio_seconds
+                    self.metrics.observe("first_partial", first_heard)
                 
                 # More patient - wait longer before assuming they're done
-                if has_speech and time.time() - last_speech_time > silence_threshold:
+                if has_speech and audio_seconds - last_speech > silence_threshold:
                     print("\n✅ Got your response, processing...")
                     break
                 
                 # Show patience indicators
-                elapsed = time.time() - start_time
-                if not has_speech and elapsed > 10 and elapsed % 10 < 0.1:
+                if not has_speech and audio_seconds >= next_reminder:
                     print("💭 I'm listening... take your time")
+                    next_reminder += 10
                 
-                time.sleep(0.1)  # Slightly longer sleep for more natural feel
+                if audio_seconds >= timeout:
+                    break
             
             # Stop recording
-            self.is_listening = False
-            recording_thread.join(timeout=2)  # More time for cleanup
+            stream.close()
+            if first_heard is not None:
+                self.metrics.observe("endpoint_delay", audio_seconds - last_heard)
             
             # Get final result
-            final_result = json.loads(self.recognizer.FinalResult())
+            with self.metrics.span("recognizer_final"):
+                final_result = json.loads(self.recognizer.FinalResult())
             if final_result.get("text", "").strip():
                 final_text = final_result["text"].strip()
                 if final_text:
                     self.transcription = final_text
+                    self.record_event("final", text=final_text)
             
             # Clean up the transcription
             self.transcription = self.transcription.strip()
+            self.record_event("listen_end", text=self.transcription, has_speech=has_speech,
+                              duration=round(time.time() - start_time, 3))
             
             if self.transcription:
                 print(f"📝 Perfect! I heard: {self.transcription}")
             else:
                 print("🤔 I didn't catch that - no worries, let's try again")
             
+            self._answered_at = time.perf_counter()
             return self.transcription
             
+        except AudioSourceClosed:
+            raise
         except Exception as e:
             logger.error(f"Speech recognition error: {e}")
-            self.is_listening = False
+            self.record_event("listen_end", text="", error=str(e), duration=round(time.time() - start_time, 3))
             return ""
-    
-    def _record_audio(self):
-        """Record audio in chunks and add to the queue for processing."""
-        stream = None
-        try:
-            stream = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=SAMPLE_RATE,
-                input=True,
-                frames_per_buffer=CHUNK_SIZE,
-                input_device_index=None  # Use default microphone
-            )
-            
-            while self.is_listening:
-                try:
-                    data = stream.read(CHUNK_SIZE, exception_on_overflow=False)
-                    if data and self.is_listening:
-                        self.audio_queue.put(data)
-                except Exception as e:
-                    if self.is_listening:  # Only log if we're still supposed to be listening
-                        logger.warning(f"Audio read error: {e}")
-                    break
-                    
-        except Exception as e:
-            logger.error(f"Audio recording error: {e}")
         finally:
-            if stream:
-                try:
-                    stream.stop_stream()
-                    stream.close()
-                except:
-                    pass
+            stream.close()
     
-    def llm_query(self, prompt: str) -> str:
-        """Query the local LLM with a prompt and return the response."""
+    def llm_query(self, prompt: str, grammar: Optional[str] = None) -> str:
+        """Query the local LLM with a prompt and return the response.
+
+        grammar is an optional GBNF grammar for constrained decoding.
+        """
         try:
-            response = self.llm.generate(prompt, max_tokens=512)
+            with self.metrics.span("llm"):
+                response = self.llm.generate(prompt, max_tokens=512, grammar=grammar)
             return response.strip()
         except Exception as e:
             logger.error(f"LLM query error: {e}")
@@ -730,6 +670,7 @@ class InterviewAgent:
         while attempts < max_attempts:
             transcription = self.listen(timeout)
             confidence = self.calculate_confidence(transcription)
+            self.record_event("confidence", text=transcription, score=round(confidence, 3))
             
             print(f"🎯 Confidence: {confidence:.2f}")
             
@@ -766,17 +707,51 @@ class InterviewAgent:
         """
         Check if the query matches any FAQ and return the answer.
         Returns None if no match is found.
+        
+        Clear matches are answered straight from the retrieval index; only
+        ambiguous ones go to the LLM, with just the top candidates. FAQ
+        edits are picked up between sessions (see new_session).
         """
         if not self.faq_data.get("faqs"):
             return None
         
+        faqs = self.faq_data["faqs"]
+        matches = [(index, score) for index, score in self.faq_index.search(query, k=FAQ_TOP_K)
+                   if score >= FAQ_MIN_SCORE]
+        if matches:
+            best_index, best_score = matches[0]
+            runner_up = matches[1][1] if len(matches) > 1 else 0.0
+            if best_score >= FAQ_CONFIDENT_SCORE and best_score >= runner_up * FAQ_MARGIN_RATIO:
+                return faqs[best_index]["answer"]
+        
+        # Semantic matching catches paraphrases that share no keywords with the FAQ
+        semantic = []
+        if self.faq_embeddings is not None:
+            semantic = [(index, score) for index, score in self.faq_embeddings.search(query, k=FAQ_TOP_K)
+                        if score >= FAQ_SEMANTIC_MIN_SCORE]
+        if semantic and not matches:
+            best_index, best_score = semantic[0]
+            runner_up = semantic[1][1] if len(semantic) > 1 else 0.0
+            if best_score >= FAQ_SEMANTIC_CONFIDENT_SCORE and best_score - runner_up >= 0.1:
+                return faqs[best_index]["answer"]
+        
+        # Offer keyword candidates first, then semantic ones, to the LLM
+        seen = {index for index, _ in matches}
+        matches += [(index, score) for index, score in semantic if index not in seen]
+        matches = matches[:FAQ_TOP_K]
+        if not matches:
+            return None
+        
+        candidates = "\n".join(
+            f"        {number}. {faqs[index]['question']}" for number, (index, _) in enumerate(matches, 1)
+        )
         prompt = f"""
         Human: I need to check if this query matches any of the following FAQs. If it does, return the number of the matching FAQ. If not, return "NONE".
 
         Query: "{query}"
         
         FAQs:
-        {json.dumps(self.faq_data["faqs"], indent=2)}
+{candidates}
         
         Which FAQ number (1, 2, 3, etc.) matches this query? Answer with just the number or "NONE".
         
@@ -788,28 +763,50 @@ class InterviewAgent:
         # Extract a number from the response if present
         match = re.search(r'\b(\d+)\b', response)
         if match and not "NONE" in response.upper():
-            faq_index = int(match.group(1)) - 1
-            if 0 <= faq_index < len(self.faq_data["faqs"]):
-                return self.faq_data["faqs"][faq_index]["answer"]
+            candidate_number = int(match.group(1)) - 1
+            if 0 <= candidate_number < len(matches):
+                return faqs[matches[candidate_number][0]]["answer"]
         
         return None
     
-    def conduct_interview(self):
-        """Conduct the full interview with all questions."""
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        transcript_file = TRANSCRIPTS_DIR_PATH / f"transcript_{timestamp}.txt"
-        
-        # Introduction
-        self.speak("Hello, I'm the LunarTech Interview Agent. I'll be conducting a short interview with you today. Let's get started.")
+    def conduct_interview(self, resume_session: Optional[str] = None):
+        """Conduct the full interview with all questions.
+
+        Every turn is journaled; with resume_session, an interrupted session
+        continues from its journal after the last completed turn.
+        """
+        if self.session_used:
+            self.new_session()
+        self.session_used = True
+        if resume_session:
+            timestamp = resume_session
+            state = resume_state(list(read_events(journal_path(timestamp))))
+            self.interview_data["timestamp"] = state["started"] or self.interview_data["timestamp"]
+            self.interview_data["answers"] = state["answers"]
+            self.interview_data["answer_durations"] = state["answer_durations"]
+            self.candidate_name = state["candidate_name"]
+        else:
+            timestamp = self.next_session_id()
+        self.session_id = timestamp
+        completed_turns = len(self.interview_data["answers"])
         
-        # Open transcript file
-        with open(transcript_file, 'w') as transcript:
-            transcript.write(f"LunarTech Interview - {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        self.journal = SessionJournal(timestamp)
+        log_token = log_setup.set_context(session_id=timestamp)
+        try:
+            if resume_session:
+                self.record_event("session_resumed", next_question=completed_turns + 1)
+                self.speak("Welcome back. Let's continue where we left off.")
+            else:
+                self.record_event("session_start", session_id=timestamp, questions=QUESTIONS)
+                # Introduction
+                self.speak("Hello, I'm the LunarTech Interview Agent. I'll be conducting a short interview with you today. Let's get started.")
             
-            # Ask each question
+            # Ask each question not yet answered
             for i, question in enumerate(QUESTIONS):
-                self.speak(question)
-                transcript.write(f"Q{i+1}: {question}\n")
+                if i < completed_turns:
+                    continue
+                self.speak(question, question_number=i + 1)
+                answer_started = time.time()
                 
                 # Listen for answer with enhanced processing for first question (name)
                 if i == 0:  # First question is about name
@@ -817,66 +814,71 @@ class InterviewAgent:
                     if answer:
                         # Confirm name spelling for first question
                         self.candidate_name = self.confirm_name_spelling(answer)
+                        self.record_event("name_confirmed", name=self.candidate_name)
                         # Update answer with confirmed name if different
                         if self.candidate_name != "Unknown" and self.candidate_name.lower() not in answer.lower():
                             answer = f"{self.candidate_name}. {answer}"
                 else:
                     answer = self.listen_with_confidence()
                 
-                current_time = datetime.datetime.now().strftime('%H:%M:%S')
-                transcript.write(f"A{i+1} [{current_time}]: {answer}\n\n")
+                self.record_event("response", question_number=i + 1, text=answer)
                 
                 # If answer is unclear, ask for clarification (more naturally)
                 if not self.analyze_answer(question, answer) and len(answer.split()) < 3:
                     # More natural, encouraging clarification request
                     clarification = f"I want to make sure I capture your response accurately. Could you tell me a bit more about that?"
-                    self.speak(clarification)
-                    transcript.write(f"Clarification: {clarification}\n")
+                    self.speak(clarification, kind="clarification")
                     
                     # Listen for clarified answer with more patience
                     clarified_answer = self.listen_with_confidence(timeout=35)  # Extra time for clarification
-                    current_time = datetime.datetime.now().strftime('%H:%M:%S')
-                    transcript.write(f"Clarified A{i+1} [{current_time}]: {clarified_answer}\n\n")
+                    self.record_event("response", question_number=i + 1, text=clarified_answer, clarified=True)
                     
                     # Use the clarified answer if it's better, otherwise keep original
                     if len(clarified_answer.split()) >= 3:  # More lenient check
                         answer = clarified_answer
                 
-                # Store the answer
+                # Store the answer and how long the turn took (including clarification)
+                duration = round(time.time() - answer_started, 2)
                 self.interview_data["answers"].append(answer)
+                self.interview_data["answer_durations"].append(duration)
+                self.record_event("turn_end", question_number=i + 1, answer=answer, duration=duration)
             
             # Check if candidate has questions
             self.speak("Thank you for your responses. Do you have any questions for me about LunarTech or the program?")
-            transcript.write("Agent: Thank you for your responses. Do you have any questions for me about LunarTech or the program?\n")
             
             # Handle FAQ questions
             while True:
                 question = self.listen(timeout=TIMEOUT_FAQ)
                 if not question or "no" in question.lower() or "thank you" in question.lower():
                     self.speak("Great! That concludes our interview. Thank you for your time.")
-                    transcript.write("Agent: Great! That concludes our interview. Thank you for your time.\n")
                     break
                 
-                current_time = datetime.datetime.now().strftime('%H:%M:%S')
-                transcript.write(f"Candidate [{current_time}]: {question}\n")
+                self.record_event("candidate_question", text=question)
                 
                 # Check against FAQ
-                faq_answer = self.check_faq(question)
+                with self.metrics.span("faq"):
+                    faq_answer = self.check_faq(question)
                 if faq_answer:
+                    self.record_event("faq_hit", question=question, answer=faq_answer)
                     self.speak(faq_answer)
-                    transcript.write(f"Agent: {faq_answer}\n\n")
                 else:
+                    self.record_event("faq_miss", question=question)
+                    log_unanswered_question(question, timestamp)
                     self.speak("I've made a note of your question for the team because I don't have any specific information on that.")
-                    transcript.write("Agent: I don't have specific information on that, but I'll make note of your question for the team.\n\n")
                 
                 self.speak("Do you have any other questions?")
-                transcript.write("Agent: Do you have any other questions?\n")
-        
-        # Create summary and extracted info
-        self.generate_summary(self.candidate_name)
-        self.save_outputs(timestamp)
-        
-        logger.info(f"Interview completed and saved with timestamp {timestamp}")
+            
+            # Create summary and extracted info
+            self.generate_summary(self.candidate_name)
+            # The transcript is rendered from the journal by the persistence worker
+            self.journal.flush(sync=True)
+            # session_end is journaled by the persistence worker once the database commit succeeds
+            self.save_outputs(timestamp)
+            logger.info(f"Interview completed and queued for saving with timestamp {timestamp}")
+        finally:
+            self.journal.close()
+            self.journal = None
+            log_setup.reset_context(log_token)
     
     def generate_summary(self, candidate_name: str):
         """Generate a summary of the interview and extract structured information."""
@@ -903,356 +905,133 @@ class InterviewAgent:
         Assistant:
         """
         
-        llm_response = self.llm_query(summary_prompt)
+        # Constrain decoding to the summary + JSON_DATA schema where supported
+        llm_response = self.llm_query(summary_prompt, grammar=SUMMARY_GBNF)
         
-        # Split the response to get summary and JSON separately
-        parts = llm_response.split("JSON_DATA:")
-        if len(parts) >= 2:
-            self.interview_data["summary"] = parts[0].strip()
-            
-            # Extract and parse JSON data
-            try:
-                json_text = parts[1].strip()
-                # Clean up any markdown formatting
-                json_text = re.sub(r'```json|```', '', json_text).strip()
-                extracted_info = json.loads(json_text)
-                # Ensure the correct name is set
-                if 'name' not in extracted_info or extracted_info['name'] in ["Candidate", "Unknown"]:
-                    extracted_info['name'] = candidate_name
-                self.interview_data["extracted_info"] = extracted_info
-            except Exception as e:
-                logger.error(f"Error parsing JSON from LLM response: {e}")
-                self.interview_data["extracted_info"] = {
-                    "name": "Unknown",
-                    "interest_level": "unknown",
-                    "readiness": "unknown",
-                    "background": "Could not extract information"
-                }
-        else:
-            self.interview_data["summary"] = llm_response
-            self.interview_data["extracted_info"] = {
-                "name": "Unknown",
-                "interest_level": "unknown",
-                "readiness": "unknown",
-                "background": "Could not extract information"
-            }
+        # Parsing never fails: malformed or truncated JSON is repaired and
+        # coerced to the schema, keeping whatever fields could be recovered
+        summary, extracted_info, repaired = parse_summary_response(llm_response, candidate_name)
+        if repaired:
+            logger.warning("LLM extraction output did not match the schema; repaired in place")
+        
+        self.interview_data["summary"] = summary
+        self.interview_data["extracted_info"] = extracted_info
     
     def save_outputs(self, timestamp: str):
-        """Save the interview outputs to files."""
-        # Save summary as markdown
-        summary_md_file = SUMMARIES_DIR_PATH / f"summary_{timestamp}.md"
-        with open(summary_md_file, 'w') as f:
-            f.write(f"# Interview Summary - {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write(self.interview_data["summary"])
-            f.write("\n\n## Extracted Information\n\n")
-            for key, value in self.interview_data["extracted_info"].items():
-                f.write(f"- **{key.replace('_', ' ').title()}**: {value}\n")
-        
-        # Save structured data as JSON
-        summary_json_file = SUMMARIES_DIR_PATH / f"summary_{timestamp}.json"
-        with open(summary_json_file, 'w') as f:
-            json.dump(self.interview_data, f, indent=2)
-        
-        # Optionally save to SQLite database
-        self.save_to_database(timestamp)
+        """
+        Queue the summary files and database rows for the background
+        persistence worker; the next candidate does not wait for the writes.
+        """
+        self.persistence.submit(timestamp, self.interview_data, QUESTIONS, journal_session=timestamp,
+                                metrics=self.metrics)
     
     def save_to_database(self, timestamp: str):
         """Save interview data to SQLite database."""
         try:
-            db_path = Path(DATABASE_FILE)
-            conn = sqlite3.connect(str(db_path))
-            cursor = conn.cursor()
-            
-            # Create tables if they don't exist
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS interviews (
-                id TEXT PRIMARY KEY,
-                timestamp TEXT,
-                summary TEXT
-            )
-            ''')
-            
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS questions_answers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                interview_id TEXT,
-                question_number INTEGER,
-                question TEXT,
-                answer TEXT,
-                FOREIGN KEY (interview_id) REFERENCES interviews (id)
-            )
-            ''')
-            
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS extracted_info (
-                interview_id TEXT PRIMARY KEY,
-                name TEXT,
-                interest_level TEXT,
-                readiness TEXT,
-                background TEXT,
-                FOREIGN KEY (interview_id) REFERENCES interviews (id)
-            )
-            ''')
-            
-            # Insert interview data
-            cursor.execute(
-                "INSERT INTO interviews (id, timestamp, summary) VALUES (?, ?, ?)",
-                (timestamp, self.interview_data["timestamp"], self.interview_data["summary"])
-            )
-            
-            # Insert questions and answers
-            for i, (question, answer) in enumerate(zip(QUESTIONS, self.interview_data["answers"])):
-                cursor.execute(
-                    "INSERT INTO questions_answers (interview_id, question_number, question, answer) VALUES (?, ?, ?, ?)",
-                    (timestamp, i+1, question, answer)
-                )
-            
-            # Insert extracted info
-            extracted = self.interview_data["extracted_info"]
-            cursor.execute(
-                "INSERT INTO extracted_info (interview_id, name, interest_level, readiness, background) VALUES (?, ?, ?, ?, ?)",
-                (
-                    timestamp,
-                    extracted.get("name", "Unknown"),
-                    extracted.get("interest_level", "unknown"),
-                    extracted.get("readiness", "unknown"),
-                    extracted.get("background", "")
-                )
-            )
-            
-            conn.commit()
-            conn.close()
-            
+            storage.save_interview(timestamp, self.interview_data, QUESTIONS)
             logger.info(f"Interview data saved to database with ID: {timestamp}")
         except Exception as e:
             logger.error(f"Error saving to database: {e}")
     
     def get_interview_statistics(self) -> Dict[str, Any]:
         """Get interview statistics from the database."""
-        try:
-            db_path = Path(DATABASE_FILE)
-            if not db_path.exists():
-                return {"total_interviews": 0, "today_interviews": 0, "avg_interest": "N/A"}
-            
-            conn = sqlite3.connect(str(db_path))
-            cursor = conn.cursor()
-            
-            # Total interviews
-            cursor.execute("SELECT COUNT(*) FROM interviews")
-            total_interviews = cursor.fetchone()[0]
-            
-            # Today's interviews
-            today = datetime.datetime.now().strftime('%Y-%m-%d')
-            cursor.execute("SELECT COUNT(*) FROM interviews WHERE DATE(timestamp) = ?", (today,))
-            today_interviews = cursor.fetchone()[0]
-            
-            # Average interest level
-            cursor.execute("SELECT interest_level FROM extracted_info WHERE interest_level != 'unknown'")
-            interest_levels = cursor.fetchall()
-            
-            if interest_levels:
-                high_count = sum(1 for level in interest_levels if level[0] == 'high')
-                medium_count = sum(1 for level in interest_levels if level[0] == 'medium')
-                low_count = sum(1 for level in interest_levels if level[0] == 'low')
-                
-                total = len(interest_levels)
-                avg_score = (high_count * 3 + medium_count * 2 + low_count * 1) / total
-                
-                if avg_score >= 2.5:
-                    avg_interest = "High"
-                elif avg_score >= 1.5:
-                    avg_interest = "Medium"
-                else:
-                    avg_interest = "Low"
-            else:
-                avg_interest = "N/A"
-            
-            conn.close()
-            
-            return {
-                "total_interviews": total_interviews,
-                "today_interviews": today_interviews,
-                "avg_interest": avg_interest,
-                "interest_distribution": {
-                    "high": high_count if interest_levels else 0,
-                    "medium": medium_count if interest_levels else 0,
-                    "low": low_count if interest_levels else 0
-                }
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting statistics: {e}")
-            return {"total_interviews": 0, "today_interviews": 0, "avg_interest": "N/A"}
+        return dashboard.get_statistics()
     
     def generate_dashboard(self):
-        """Generate HTML dashboard with interview statistics."""
-        stats = self.get_interview_statistics()
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>LunarTech Interview Dashboard</title>
-            <style>
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    margin: 0;
-                    padding: 20px;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                }}
-                .container {{
-                    max-width: 1200px;
-                    margin: 0 auto;
-                }}
-                .header {{
-                    text-align: center;
-                    margin-bottom: 40px;
-                }}
-                .stats-grid {{
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-                    gap: 20px;
-                    margin-bottom: 40px;
-                }}
-                .stat-card {{
-                    background: rgba(255, 255, 255, 0.1);
-                    padding: 30px;
-                    border-radius: 15px;
-                    text-align: center;
-                    backdrop-filter: blur(10px);
-                    border: 1px solid rgba(255, 255, 255, 0.2);
-                }}
-                .stat-number {{
-                    font-size: 3em;
-                    font-weight: bold;
-                    margin-bottom: 10px;
-                }}
-                .stat-label {{
-                    font-size: 1.2em;
-                    opacity: 0.9;
-                }}
-                .interest-chart {{
-                    background: rgba(255, 255, 255, 0.1);
-                    padding: 30px;
-                    border-radius: 15px;
-                    backdrop-filter: blur(10px);
-                    border: 1px solid rgba(255, 255, 255, 0.2);
-                }}
-                .bar {{
-                    display: flex;
-                    align-items: center;
-                    margin: 15px 0;
-                }}
-                .bar-label {{
-                    width: 80px;
-                    text-transform: capitalize;
-                }}
-                .bar-fill {{
-                    height: 25px;
-                    background: rgba(255, 255, 255, 0.3);
-                    border-radius: 12px;
-                    margin: 0 15px;
-                    flex: 1;
-                    position: relative;
-                }}
-                .bar-progress {{
-                    height: 100%;
-                    border-radius: 12px;
-                    transition: width 0.5s ease;
-                }}
-                .high {{ background: #4CAF50; }}
-                .medium {{ background: #FF9800; }}
-                .low {{ background: #F44336; }}
-                .timestamp {{
-                    text-align: center;
-                    margin-top: 40px;
-                    opacity: 0.7;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🚀 LunarTech Interview Dashboard</h1>
-                    <p>Real-time interview analytics and candidate insights</p>
-                </div>
-                
-                <div class="stats-grid">
-                    <div class="stat-card">
-                        <div class="stat-number">{stats['total_interviews']}</div>
-                        <div class="stat-label">Total Interviews</div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-number">{stats['today_interviews']}</div>
-                        <div class="stat-label">Today's Interviews</div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-number">{stats['avg_interest']}</div>
-                        <div class="stat-label">Average Interest</div>
-                    </div>
-                </div>
-                
-                <div class="interest-chart">
-                    <h2>Interest Level Distribution</h2>
-        """
-        
-        # Add interest level bars if we have data
-        if stats.get('interest_distribution'):
-            total = sum(stats['interest_distribution'].values())
-            if total > 0:
-                for level, count in stats['interest_distribution'].items():
-                    percentage = (count / total) * 100
-                    html_content += f"""
-                    <div class="bar">
-                        <div class="bar-label">{level.title()}</div>
-                        <div class="bar-fill">
-                            <div class="bar-progress {level}" style="width: {percentage}%"></div>
-                        </div>
-                        <div>{count} ({percentage:.1f}%)</div>
-                    </div>
-                    """
-            else:
-                html_content += "<p>No interview data available yet.</p>"
-        
-        html_content += f"""
-                </div>
-                
-                <div class="timestamp">
-                    Last updated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        dashboard_file = Path(DASHBOARD_FILE)
-        with open(dashboard_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        print(f"📊 Dashboard generated: {dashboard_file.absolute()}")
+        """Write the HTML dashboard if the interview data changed since it was last written."""
+        dashboard_file, written = dashboard.write_dashboard(DASHBOARD_FILE)
+        if written:
+            print(f"📊 Dashboard generated: {dashboard_file.absolute()}")
+        else:
+            print(f"📊 Dashboard up to date: {dashboard_file.absolute()}")
         return dashboard_file
 
 
+def run_daemon(agent: InterviewAgent, load_time: float, max_sessions: Optional[int] = None,
+               resume_session: Optional[str] = None):
+    """Run back-to-back interviews with one set of loaded models.
+
+    Only the first session pays for loading models, TTS and the FAQ; every
+    later one just resets per-session state. A session that fails is logged
+    and left for --resume, and the daemon moves on to the next candidate.
+    Returns the number of interviews completed.
+    """
+    count = completed = 0
+    while max_sessions is None or count < max_sessions:
+        if count:
+            try:
+                reply = input("\n👤 Press Enter when the next candidate is ready (q to stop): ")
+            except EOFError:
+                break
+            if reply.strip().lower() in ("q", "quit", "exit"):
+                break
+        setup_time = agent.new_session() + (load_time if count == 0 else 0.0)
+        print(f"⏱️  Session {count + 1} ready in {setup_time * 1000:.1f} ms")
+        logger.info(f"Session {count + 1} setup time: {setup_time:.4f}s")
+        try:
+            agent.conduct_interview(resume_session if count == 0 else None)
+            print(f"✅ Interview {count + 1} completed successfully!")
+            completed += 1
+        except Exception as e:
+            # Keep the loaded models for the next candidate; the journal keeps this session resumable
+            logger.exception(f"Interview {agent.session_id} failed: {e}")
+            print(f"❌ Interview {count + 1} failed ({e}); it can be continued later with --resume")
+            agent.new_session()
+        count += 1
+    return completed
+
+
 def main():
-    """Main function to run the interview agent."""
+    """Main function to run the interview agent.
+
+    --daemon keeps the models loaded and runs interviews back to back
+    (--sessions N stops after N candidates). --metrics-port N serves
+    per-stage latency histograms at /metrics in Prometheus text format.
+    """
     try:
+        args = sys.argv[1:]
         print("🚀 Starting LunarTech AI Interview Agent...")
+        metrics_port = int(args[args.index("--metrics-port") + 1]) if "--metrics-port" in args else METRICS_PORT
+        if metrics_port:
+            metrics_server = metrics.start_server(metrics_port)
+            if metrics_server:
+                print(f"📈 Latency metrics at {metrics_server.url}")
+        load_started = time.perf_counter()
         agent = InterviewAgent()
+        load_time = time.perf_counter() - load_started
+        print(f"⏱️  Models and resources loaded in {load_time:.2f}s")
         
         # Generate dashboard before starting interview
         agent.generate_dashboard()
         
-        # Conduct the interview
-        agent.conduct_interview()
-        
-        # Generate updated dashboard after interview
-        agent.generate_dashboard()
-        
-        print("✅ Interview completed successfully!")
-        print("📊 Dashboard updated with latest data")
+        # Pick up an interview that was interrupted by a crash, if asked to
+        resume_session = None
+        incomplete = find_incomplete_sessions()
+        if "--resume" in args:
+            if incomplete:
+                resume_session = incomplete[-1]
+                print(f"↩️  Resuming interrupted interview {resume_session}")
+            else:
+                print("ℹ️  No interrupted interview to resume")
+        elif incomplete:
+            print(f"ℹ️  {len(incomplete)} interrupted interview(s) found; run with --resume to continue the latest")
+        
+        if "--daemon" in args:
+            max_sessions = int(args[args.index("--sessions") + 1]) if "--sessions" in args else None
+            print("🔁 Daemon mode: models stay loaded between candidates")
+            completed = run_daemon(agent, load_time, max_sessions, resume_session)
+            print(f"✅ {completed} interview(s) completed")
+        else:
+            # Conduct the interview; its outputs are saved in the background
+            agent.conduct_interview(resume_session)
+            print("✅ Interview completed successfully!")
+        
+        # Wait for the background save; the dashboard is regenerated once it commits
+        print("💾 Saving interview...")
+        if persistence.shutdown() and not agent.persistence.status()["failed"]:
+            print("📊 Dashboard updated with latest data")
+        else:
+            print(f"⚠️  Some interview data could not be saved: {agent.persistence.status()}")
         
     except KeyboardInterrupt:
         print("\n❌ Interview interrupted by user")
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Per-stage latency metrics for LunarTech AI Interview Agent
+
+Each stage of an interview is timed with a span and recorded in
+fixed-bucket histograms, both for the whole process and for the session.
+Stages include speaking a prompt, opening the audio stream, the first
+partial result, end-pointing, the recognizer's final result, turn
+latency, LLM calls, FAQ lookups and every persistence step. The session's
+histograms are written to the session_metrics table along with the
+interview, so percentiles can be computed across any set of sessions.
+The process histograms can be served in Prometheus text format from an
+optional local /metrics endpoint.
+
+first_partial and endpoint_delay are measured on the audio clock, like
+the silence threshold and timeouts they are meant to tune. Every other
+stage is wall-clock time.
+"""
+
+import bisect
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from config import METRICS_BUCKETS, METRICS_HOST
+import log_setup
+
+logger = logging.getLogger(__name__)
+
+# Stages in report order
+STAGES = [
+    "tts",               # Speaking a prompt: synthesis and playback, or sending it to a remote client
+    "tts_synth",         # Synthesizing a prompt to WAV for a remote client (cache misses only)
+    "stream_open",       # From asking the audio source to stream until the first chunk arrives
+    "first_partial",     # Audio heard before the first recognized words
+    "endpoint_delay",    # Audio after the last recognized words until listening stopped
+    "recognizer_final",  # Computing the recognizer's final result
+    "turn",              # End of an answer to the start of the agent's next prompt
+    "llm",               # One LLM call
+    "faq",               # FAQ lookup, including any LLM disambiguation
+    "persist_markdown",
+    "persist_json",
+    "persist_database",
+    "persist_journal",
+    "persist_transcript",
+]
+
+METRIC_NAME = "lunartech_stage_seconds"
+
+
+class Histogram:
+    """Latency histogram with fixed upper bounds, the last bucket being +Inf."""
+
+    def __init__(self, buckets: Sequence[float] = METRICS_BUCKETS):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.add(seconds, 1, seconds, seconds)
+
+    def add(self, upper_bound: float, count: int, total: float, largest: float) -> None:
+        """Add count observations that fell at or below upper_bound."""
+        self.counts[bisect.bisect_left(self.buckets, upper_bound)] += count
+        self.count += count
+        self.sum += total
+        self.max = max(self.max, largest)
+
+    def merge(self, other: "Histogram") -> None:
+        for index, count in enumerate(other.counts):
+            if count:
+                bound = other.buckets[index] if index < len(other.buckets) else float("inf")
+                self.add(bound, count, 0.0, 0.0)
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """Estimated quantile, interpolating within the bucket like Prometheus' histogram_quantile."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / count)
+            seen += count
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Counts keyed by upper bound (non-empty buckets only), for storage and reports."""
+        bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "max": round(self.max, 6),
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "buckets": {bound: count for bound, count in zip(bounds, self.counts) if count},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], buckets: Sequence[float] = METRICS_BUCKETS) -> "Histogram":
+        """Rebuild a stored histogram; counts from other bucket layouts land in the nearest bucket above."""
+        histogram = cls(buckets)
+        for bound, count in data.get("buckets", {}).items():
+            histogram.add(float(bound), count, 0.0, 0.0)
+        histogram.sum = data.get("sum", 0.0)
+        histogram.max = data.get("max", 0.0)
+        return histogram
+
+
+class MetricsRegistry:
+    """One histogram per stage for the whole process; safe to use from any thread."""
+
+    def __init__(self, buckets: Sequence[float] = METRICS_BUCKETS):
+        self.buckets = list(buckets)
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            if stage not in self._histograms:
+                self._histograms[stage] = Histogram(self.buckets)
+            self._histograms[stage].observe(seconds)
+
+    def snapshot(self) -> Dict[str, Histogram]:
+        """A copy of every stage's histogram."""
+        with self._lock:
+            copies = {}
+            for stage, histogram in self._histograms.items():
+                copies[stage] = Histogram(self.buckets)
+                copies[stage].merge(histogram)
+            return copies
+
+    def render_prometheus(self) -> str:
+        """All histograms in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in each stage of an interview",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        for stage, histogram in ordered(self.snapshot()):
+            cumulative = 0
+            for index, count in enumerate(histogram.counts):
+                cumulative += count
+                bound = repr(histogram.buckets[index]) if index < len(histogram.buckets) else "+Inf"
+                lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{METRIC_NAME}_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+            lines.append(f'{METRIC_NAME}_count{{stage="{stage}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+
+# Every session also records into this process-wide registry
+registry = MetricsRegistry()
+
+
+class SessionMetrics:
+    """Histograms for one interview; each observation also goes to the process registry."""
+
+    def __init__(self, parent: Optional[MetricsRegistry] = None):
+        self.parent = registry if parent is None else parent
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            if stage not in self.histograms:
+                self.histograms[stage] = Histogram(self.parent.buckets)
+            self.histograms[stage].observe(seconds)
+        self.parent.observe(stage, seconds)
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Time the block as one observation of stage, whether or not it raises.
+
+        Records logged inside the block are tagged with the stage.
+        """
+        started = time.perf_counter()
+        token = log_setup.set_context(stage=stage)
+        try:
+            yield
+        finally:
+            log_setup.reset_context(token)
+            self.observe(stage, time.perf_counter() - started)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Each stage's histogram as a dict, in report order."""
+        with self._lock:
+            return {stage: histogram.to_dict() for stage, histogram in ordered(self.histograms)}
+
+
+def ordered(histograms: Dict[str, Histogram]) -> List[tuple]:
+    """(stage, histogram) pairs with the known stages first, in STAGES order."""
+    rank = {stage: index for index, stage in enumerate(STAGES)}
+    return sorted(histograms.items(), key=lambda item: (rank.get(item[0], len(STAGES)), item[0]))
+
+
+def aggregate(rows: Iterable[tuple]) -> Dict[str, Histogram]:
+    """Merge stored (stage, buckets JSON, total, max) rows into one histogram per stage."""
+    histograms: Dict[str, Histogram] = {}
+    for stage, buckets, total, largest in rows:
+        histogram = Histogram.from_dict({"buckets": json.loads(buckets), "sum": total, "max": largest})
+        if stage in histograms:
+            histograms[stage].merge(histogram)
+        else:
+            histograms[stage] = histogram
+    return histograms
+
+
+class MetricsServer:
+    """Serves the process registry at /metrics for Prometheus to scrape."""
+
+    def __init__(self, port: int, host: str = METRICS_HOST, source: MetricsRegistry = registry):
+        self.source = source
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = server.source.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"Metrics {self.address_string()} {format % args}")
+
+        return Handler
+
+    def start(self) -> None:
+        """Serve on a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="metrics", daemon=True)
+        self._thread.start()
+        logger.info(f"Metrics endpoint listening on {self.url}")
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def start_server(port: int, host: str = METRICS_HOST) -> Optional[MetricsServer]:
+    """Start the /metrics endpoint, or log and carry on without it if the port is unavailable."""
+    try:
+        server = MetricsServer(port, host)
+    except OSError as e:
+        logger.error(f"Could not start metrics endpoint on {host}:{port}: {e}")
+        return None
+    server.start()
+    return server
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Write-behind persistence for LunarTech AI Interview Agent
+
+A finished interview is handed to a background worker as one record; the
+worker writes the summary markdown, the JSON file, the database rows and
+the transcript rendered from the session journal off the interview
+thread, retrying each step with backoff. Once the database rows are
+committed, session_end is appended to the journal; until then a crash
+leaves the session resumable. Each step is timed into the
+session's latency metrics, which are stored last. The queue is bounded, so a
+stalled disk slows new submissions down instead of growing memory
+without limit. flush() and stop() wait until everything queued is
+persisted, and stop() runs at interpreter exit. Records that still fail
+after every retry are kept in data/failed_saves with the steps already
+done; `python utils.py replay-failed` runs the remaining steps.
+
+Callbacks registered with on_committed run right after an interview's
+database transaction commits, even if a later step fails. That is when
+the dashboard should be regenerated.
+"""
+
+import atexit
+import copy
+import datetime
+import json
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import log_setup
+import storage
+from metrics import Histogram, MetricsRegistry, SessionMetrics
+from config import (
+    DATA_DIR, SUMMARIES_DIR, TRANSCRIPTS_DIR, PERSIST_QUEUE_SIZE, PERSIST_MAX_RETRIES, PERSIST_RETRY_DELAY
+)
+from journal import mark_session_end, render_transcript_file
+
+logger = logging.getLogger(__name__)
+
+FAILED_SAVES_DIR = Path(DATA_DIR) / "failed_saves"
+
+
+@dataclass
+class InterviewRecord:
+    """Everything needed to persist one finished interview."""
+    interview_id: str
+    interview_data: Dict[str, Any]
+    questions: List[str]
+    journal_session: Optional[str] = None
+    finished_at: str = field(default_factory=lambda: datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    completed_steps: List[str] = field(default_factory=list)
+    metrics: SessionMetrics = field(default_factory=SessionMetrics)
+
+
+def write_summary_markdown(record: InterviewRecord, worker: "PersistenceWorker") -> None:
+    """Save the summary and extracted information as markdown."""
+    with open(worker.summaries_dir / f"summary_{record.interview_id}.md", 'w') as f:
+        f.write(f"# Interview Summary - {record.finished_at}\n\n")
+        f.write(record.interview_data.get("summary", ""))
+        f.write("\n\n## Extracted Information\n\n")
+        for key, value in record.interview_data.get("extracted_info", {}).items():
+            f.write(f"- **{key.replace('_', ' ').title()}**: {value}\n")
+
+
+def write_summary_json(record: InterviewRecord, worker: "PersistenceWorker") -> None:
+    """Save the structured interview data as JSON."""
+    with open(worker.summaries_dir / f"summary_{record.interview_id}.json", 'w') as f:
+        json.dump(record.interview_data, f, indent=2)
+
+
+def write_database(record: InterviewRecord, worker: "PersistenceWorker") -> None:
+    """Insert the interview into the database in one transaction."""
+    if not storage.save_interview(record.interview_id, record.interview_data, record.questions):
+        # An earlier attempt (or a replay) committed it already
+        logger.info(f"Interview {record.interview_id} was already in the database")
+
+
+def write_session_end(record: InterviewRecord, worker: "PersistenceWorker") -> None:
+    """Mark the journal complete now that the interview is in the database."""
+    if record.journal_session:
+        mark_session_end(record.journal_session)
+
+
+def write_transcript(record: InterviewRecord, worker: "PersistenceWorker") -> None:
+    """Render the readable transcript from the session journal."""
+    if record.journal_session:
+        render_transcript_file(record.journal_session, worker.transcripts_dir / f"transcript_{record.interview_id}.txt")
+
+
+def write_metrics(record: InterviewRecord, worker: "PersistenceWorker") -> None:
+    """Store the session's stage latency histograms, including the steps above."""
+    storage.save_session_metrics(record.interview_id, record.metrics.summary())
+
+
+PERSIST_STEPS = [
+    ("markdown", write_summary_markdown),
+    ("json", write_summary_json),
+    ("database", write_database),
+    ("journal", write_session_end),
+    ("transcript", write_transcript),
+    ("metrics", write_metrics),
+]
+
+
+class PersistenceWorker:
+    """Background writer for finished interviews."""
+
+    def __init__(self, summaries_dir: str = SUMMARIES_DIR, transcripts_dir: str = TRANSCRIPTS_DIR,
+                 max_queue: int = PERSIST_QUEUE_SIZE, max_retries: int = PERSIST_MAX_RETRIES, retry_delay: float = PERSIST_RETRY_DELAY,
+                 failed_dir: Path = FAILED_SAVES_DIR):
+        self.summaries_dir = Path(summaries_dir)
+        self.transcripts_dir = Path(transcripts_dir)
+        self.failed_dir = Path(failed_dir)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._queue: "queue.Queue[Optional[InterviewRecord]]" = queue.Queue(maxsize=max_queue)
+        self._callbacks: List[Callable[[str], None]] = []
+        self._status_lock = threading.Lock()
+        self._in_flight: Optional[str] = None
+        self._completed = 0
+        self._failed: List[str] = []
+        self._last_error: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+            self._thread.start()
+
+    def on_committed(self, callback: Callable[[str], None]) -> None:
+        """Call callback(interview_id) after each interview's database commit.
+
+        Registering the same callback again has no effect.
+        """
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+
+    def submit(self, interview_id: str, interview_data: Dict[str, Any], questions: Sequence[str],
+               journal_session: Optional[str] = None, metrics: Optional[SessionMetrics] = None) -> None:
+        """Queue a finished interview. Blocks only while the queue is full.
+
+        metrics is the session's latency collector; persistence steps are added to it.
+        """
+        if self._stopped:
+            raise RuntimeError("Persistence worker has been stopped")
+        self.start()
+        # Snapshot the data so the caller can reuse its dictionaries for the next session
+        record = InterviewRecord(interview_id, copy.deepcopy(interview_data), list(questions), journal_session)
+        if metrics is not None:
+            record.metrics = metrics
+        self._queue.put(record)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued interview is persisted (or has failed). Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """Flush outstanding work and stop the worker thread."""
+        if self._stopped:
+            return True
+        self._stopped = True
+        if self._thread is None:
+            return True
+        self._queue.put(None)
+        self._thread.join(timeout)
+        flushed = not self._thread.is_alive()
+        if not flushed:
+            logger.error(f"Persistence worker did not finish within {timeout}s; {self._queue.qsize()} interviews pending")
+        return flushed
+
+    def status(self) -> Dict[str, Any]:
+        """Queue depth, the interview being written, and completion/failure counts."""
+        with self._status_lock:
+            return {
+                "queued": self._queue.qsize(),
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "failed": list(self._failed),
+                "last_error": self._last_error,
+            }
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            try:
+                if record is None:
+                    return
+                with self._status_lock:
+                    self._in_flight = record.interview_id
+                with log_setup.log_context(session_id=record.interview_id):
+                    self._persist(record)
+            finally:
+                with self._status_lock:
+                    self._in_flight = None
+                self._queue.task_done()
+
+    def persist(self, record: InterviewRecord) -> bool:
+        """Run a record's outstanding steps on the calling thread. Returns False if it was dead-lettered."""
+        with log_setup.log_context(session_id=record.interview_id):
+            return self._persist(record)
+
+    def _persist(self, record: InterviewRecord) -> bool:
+        """Run each outstanding step, retrying with exponential backoff."""
+        self.summaries_dir.mkdir(parents=True, exist_ok=True)
+        self.transcripts_dir.mkdir(parents=True, exist_ok=True)
+        for name, step in PERSIST_STEPS:
+            if name in record.completed_steps:
+                continue
+            for attempt in range(self.max_retries + 1):
+                try:
+                    with record.metrics.span(f"persist_{name}"):
+                        step(record, self)
+                    record.completed_steps.append(name)
+                    if name == "database":
+                        self._notify_committed(record.interview_id)
+                    break
+                except Exception as e:
+                    with self._status_lock:
+                        self._last_error = f"{record.interview_id} {name}: {e}"
+                    if attempt == self.max_retries:
+                        logger.error(f"Giving up on {name} for interview {record.interview_id}: {e}")
+                        self._dead_letter(record)
+                        return False
+                    logger.warning(f"Retrying {name} for interview {record.interview_id} ({e})")
+                    time.sleep(self.retry_delay * 2 ** attempt)
+
+        with self._status_lock:
+            self._completed += 1
+        logger.info(f"Interview {record.interview_id} persisted")
+        return True
+
+    def _notify_committed(self, interview_id: str) -> None:
+        for callback in self._callbacks:
+            try:
+                callback(interview_id)
+            except Exception as e:
+                logger.error(f"Error in persistence callback: {e}")
+
+    def _dead_letter(self, record: InterviewRecord) -> None:
+        """Keep a record that could not be persisted so nothing is lost."""
+        with self._status_lock:
+            self._failed.append(record.interview_id)
+        try:
+            self.failed_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.failed_dir / f"{record.interview_id}.json", 'w') as f:
+                json.dump({
+                    "interview_id": record.interview_id,
+                    "finished_at": record.finished_at,
+                    "completed_steps": record.completed_steps,
+                    "journal_session": record.journal_session,
+                    "questions": record.questions,
+                    "interview_data": record.interview_data,
+                    "metrics": record.metrics.summary(),
+                }, f, indent=2)
+        except OSError as e:
+            logger.error(f"Could not keep failed interview {record.interview_id}: {e}")
+
+
+def load_failed_record(path: Path) -> InterviewRecord:
+    """Rebuild a dead-lettered record, keeping the steps it had already completed."""
+    with open(path, 'r') as f:
+        saved = json.load(f)
+    record = InterviewRecord(saved["interview_id"], saved["interview_data"], saved["questions"],
+                             saved.get("journal_session"), saved["finished_at"], saved.get("completed_steps", []))
+    # Keep the timings recorded before the failure without adding them to this process's totals
+    record.metrics = SessionMetrics(MetricsRegistry())
+    record.metrics.histograms = {stage: Histogram.from_dict(data) for stage, data in saved.get("metrics", {}).items()}
+    return record
+
+
+def replay_failed(paths: Optional[Sequence[Path]] = None, worker: Optional["PersistenceWorker"] = None) -> Dict[str, List[str]]:
+    """Run the outstanding steps of dead-lettered records (all of data/failed_saves by default).
+
+    A file is removed once its record is fully persisted; one that fails
+    again is rewritten with its progress.
+    """
+    if paths is None:
+        paths = sorted(FAILED_SAVES_DIR.glob("*.json")) if FAILED_SAVES_DIR.exists() else []
+    worker = worker or PersistenceWorker()
+    result: Dict[str, List[str]] = {"persisted": [], "failed": []}
+    for path in paths:
+        record = load_failed_record(Path(path))
+        if worker.persist(record):
+            Path(path).unlink()
+            result["persisted"].append(record.interview_id)
+        else:
+            result["failed"].append(record.interview_id)
+    return result
+
+
+_worker: Optional[PersistenceWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_worker() -> PersistenceWorker:
+    """This process's persistence worker, started on first use."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = PersistenceWorker()
+            _worker.start()
+        return _worker
+
+
+def shutdown(timeout: Optional[float] = None) -> bool:
+    """Persist everything still queued; registered to run at exit."""
+    with _worker_lock:
+        worker = _worker
+    return worker.stop(timeout) if worker is not None else True
+
+
+atexit.register(shutdown)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Retention and maintenance for the LunarTech AI Interview Agent database
+
+Interviews older than the retention window are moved, with their Q&A rows
+and extracted info, into an attached archive database. Rows move in small
+batches, one short write transaction each, with a pause in between, so an
+agent writing through WAL never waits on maintenance for more than a few
+milliseconds. Afterwards freed pages are released with incremental vacuum
+in small steps and planner statistics are refreshed with a bounded ANALYZE.
+The interview_changes log is trimmed to what its consumers have not read.
+"""
+
+import datetime
+import logging
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import storage
+from config import (
+    ARCHIVE_DATABASE_FILE, RETENTION_DAYS, RETENTION_BATCH_SIZE, RETENTION_BATCH_PAUSE, VACUUM_PAGES_PER_STEP
+)
+
+logger = logging.getLogger(__name__)
+
+# Parents first, so foreign keys in the archive resolve as rows arrive
+ARCHIVED_TABLES = [
+    ("interviews", "id"),
+    ("extracted_info", "interview_id"),
+    ("questions_answers", "interview_id"),
+    ("session_metrics", "session_id"),
+]
+
+
+def _columns(conn: sqlite3.Connection, schema: str, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+
+def _prepare_archive(conn: sqlite3.Connection) -> None:
+    """Create the archive tables from the live definitions and add any newer columns."""
+    for table, _ in ARCHIVED_TABLES:
+        archived = _columns(conn, "archive", table)
+        if not archived:
+            sql = conn.execute("SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?",
+                               (table,)).fetchone()[0]
+            conn.execute(re.sub(r"^CREATE TABLE\s+(IF NOT EXISTS\s+)?", "CREATE TABLE IF NOT EXISTS archive.", sql))
+            continue
+        for column in _columns(conn, "main", table):
+            if column not in archived:
+                conn.execute(f"ALTER TABLE archive.{table} ADD COLUMN {column}")
+
+
+def archive_old_interviews(older_than_days: int = RETENTION_DAYS, archive_path: str = ARCHIVE_DATABASE_FILE,
+                           batch_size: int = RETENTION_BATCH_SIZE, pause: float = RETENTION_BATCH_PAUSE) -> int:
+    """Move interviews dated before the retention window into the archive database."""
+    cutoff = (datetime.date.today() - datetime.timedelta(days=older_than_days)).isoformat()
+    Path(archive_path).parent.mkdir(parents=True, exist_ok=True)
+    moved = 0
+    with storage.writing() as conn:
+        conn.execute("ATTACH DATABASE ? AS archive", (str(archive_path),))
+    try:
+        with storage.transaction() as conn:
+            _prepare_archive(conn)
+
+        while True:
+            with storage.transaction() as conn:
+                ids = [row[0] for row in conn.execute(
+                    "SELECT id FROM interviews WHERE interview_date < ? ORDER BY interview_date, id LIMIT ?",
+                    (cutoff, batch_size)
+                )]
+                if not ids:
+                    break
+                placeholders = ", ".join("?" * len(ids))
+                for table, key in ARCHIVED_TABLES:
+                    columns = ", ".join(_columns(conn, "main", table))
+                    # OR REPLACE keeps a re-run idempotent if a batch was copied but not yet deleted
+                    conn.execute(f"""
+                        INSERT OR REPLACE INTO archive.{table} ({columns})
+                        SELECT {columns} FROM main.{table} WHERE {key} IN ({placeholders})
+                    """, ids)
+                for table, key in reversed(ARCHIVED_TABLES):
+                    conn.execute(f"DELETE FROM main.{table} WHERE {key} IN ({placeholders})", ids)
+            moved += len(ids)
+            # Give live writers a turn between batches
+            time.sleep(pause)
+
+        if moved:
+            # Triggers leave zeroed counters for the archived days behind
+            with storage.transaction() as conn:
+                conn.execute("DELETE FROM interview_stats WHERE value = 0 AND metric != 'total'")
+                conn.execute("DELETE FROM answer_length_histogram WHERE answers = 0")
+    finally:
+        with storage.writing() as conn:
+            conn.execute("DETACH DATABASE archive")
+    if moved:
+        logger.info(f"Archived {moved} interviews dated before {cutoff} to {archive_path}")
+    return moved
+
+
+def prune_change_log(batch_size: int = 1000) -> int:
+    """Delete change-log rows every consumer has already read. Returns rows deleted.
+
+    Export consumers have read up to their watermark. The dashboard's data
+    version only needs the newest row, which is always kept. A consumer
+    without a watermark starts with a full export, so it needs no history.
+    """
+    with storage.reading() as conn:
+        high_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM interview_changes").fetchone()[0]
+        lowest = conn.execute("SELECT MIN(last_seq) FROM export_watermarks").fetchone()[0]
+    keep_after = min(high_seq - 1, high_seq if lowest is None else lowest)
+    deleted = 0
+    while True:
+        with storage.transaction() as conn:
+            count = conn.execute("""
+                DELETE FROM interview_changes WHERE seq IN (
+                    SELECT seq FROM interview_changes WHERE seq <= ? ORDER BY seq LIMIT ?
+                )
+            """, (keep_after, batch_size)).rowcount
+        deleted += count
+        if count < batch_size:
+            break
+    if deleted:
+        logger.info(f"Pruned {deleted} change-log rows up to seq {keep_after}")
+    return deleted
+
+
+def incremental_vacuum(pages_per_step: int = VACUUM_PAGES_PER_STEP, pause: float = RETENTION_BATCH_PAUSE) -> int:
+    """Return free pages to the filesystem a few at a time. Returns pages freed."""
+    freed = 0
+    with storage.reading() as conn:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            logger.info("Incremental vacuum not enabled for this database; run maintenance with --full-vacuum once")
+            return 0
+    while True:
+        with storage.writing() as conn:
+            free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if not free_pages:
+                break
+            conn.execute(f"PRAGMA incremental_vacuum({pages_per_step})")
+        freed += min(free_pages, pages_per_step)
+        time.sleep(pause)
+    return freed
+
+
+def full_vacuum() -> None:
+    """Rebuild the database with incremental auto-vacuum enabled (blocks writers while it runs)."""
+    with storage.writing() as conn:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+
+
+def refresh_statistics(analysis_limit: int = 1000) -> None:
+    """Refresh query planner statistics, sampling at most analysis_limit rows per index."""
+    with storage.writing() as conn:
+        conn.execute(f"PRAGMA analysis_limit = {int(analysis_limit)}")
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+
+def run_maintenance(older_than_days: int = RETENTION_DAYS, archive_path: str = ARCHIVE_DATABASE_FILE,
+                    batch_size: int = RETENTION_BATCH_SIZE, full: bool = False) -> Dict[str, int]:
+    """Archive old interviews, prune the change log, release free pages and refresh planner statistics."""
+    started = time.time()
+    moved = archive_old_interviews(older_than_days, archive_path, batch_size)
+    pruned = prune_change_log()
+    if full:
+        full_vacuum()
+        freed = 0
+    else:
+        freed = incremental_vacuum()
+    refresh_statistics()
+    return {"archived": moved, "changes_pruned": pruned, "pages_freed": freed, "seconds": round(time.time() - started, 2)}
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Headless simulation harness for LunarTech AI Interview Agent
+
+Runs full interviews end to end without a microphone or speaker. Scripted
+candidate personas (JSON, or YAML when PyYAML is installed) are turned
+into audio with the text-to-speech engine, or taken from WAV files, and
+fed through the real recognizer, LLM, FAQ matching and persistence. Many
+interviews run in parallel, sharing one set of loaded models like the
+interview server does, and the run reports throughput, per-stage latency
+percentiles and CPU use. Everything the interviews write (database,
+summaries, transcripts, journals) goes to a scratch data directory, a
+temporary one unless --data-dir is given, never to the real data/.
+
+A persona is a list of turns, each answering the next time the agent
+listens; once the script runs out the candidate stays silent:
+
+    {"name": "hesitant", "turns": [
+        {"pause": 4.0, "say": "Um, my name is, uh, David Chen."},
+        {"audio": "yes.wav"},
+        {"silent": true}
+    ]}
+
+Usage:
+    python simulate.py [persona files or directories] [--sessions N] [--workers N] [--realtime]
+                       [--data-dir DIR] [--json report.json]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+from audio_io import NullSink, ScriptedSource, pcm_from_wav, silence
+from interview_server import SharedResources, SharedSession
+import journal
+import persistence
+import storage
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+DEFAULT_PERSONAS_DIR = "data/personas"
+
+# Stages reported, in order
+STAGES = ["recognition", "llm", "faq", "summary", "response", "session"]
+
+
+def load_persona(path: Path) -> Dict[str, Any]:
+    """Read one persona file; turns with audio paths are resolved relative to it."""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix in (".yaml", ".yml"):
+            if yaml is None:
+                raise ImportError("YAML personas need PyYAML (pip install pyyaml); use JSON instead")
+            persona = yaml.safe_load(f)
+        else:
+            persona = json.load(f)
+    persona.setdefault("name", path.stem)
+    for turn in persona.get("turns", []):
+        if "audio" in turn:
+            turn["audio"] = str(path.parent / turn["audio"])
+    return persona
+
+
+def load_personas(paths: List[str]) -> List[Dict[str, Any]]:
+    personas = []
+    for path in map(Path, paths):
+        files = sorted(p for p in path.glob("*") if p.suffix in (".json", ".yaml", ".yml")) if path.is_dir() else [path]
+        personas.extend(load_persona(p) for p in files)
+    if not personas:
+        raise ValueError(f"No personas found in {', '.join(paths)}")
+    return personas
+
+
+def persona_clips(persona: Dict[str, Any], resources: SharedResources) -> List[bytes]:
+    """The PCM answer for each turn: leading pause, then the recorded or synthesized speech."""
+    clips = []
+    for turn in persona.get("turns", []):
+        speech = b""
+        if turn.get("audio"):
+            speech = pcm_from_wav(Path(turn["audio"]).read_bytes())
+        elif turn.get("say") and not turn.get("silent"):
+            wav = resources.synthesize(turn["say"])
+            if wav is None:
+                raise RuntimeError(f"Could not synthesize the answer {turn['say']!r}")
+            speech = pcm_from_wav(wav)
+        clips.append(silence(turn.get("pause", 0.0)) + speech)
+    return clips
+
+
+class SimulatedSession(SharedSession):
+    """A scripted interview that times the stages of its own flow."""
+
+    def __init__(self, resources: SharedResources, clips: List[bytes], realtime: bool = False):
+        super().__init__(resources, ScriptedSource(clips, realtime), NullSink())
+        self.timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self._answered_at = None
+
+    def _timed(self, stage: str, method, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self.timings[stage].append(time.perf_counter() - started)
+
+    def speak(self, text: str, **event_fields):
+        # Time from the end of an answer to the agent's next prompt
+        if self._answered_at is not None:
+            self.timings["response"].append(time.perf_counter() - self._answered_at)
+            self._answered_at = None
+        super().speak(text, **event_fields)
+
+    def _listen_vosk_original(self, timeout: int = 30) -> str:
+        transcription = self._timed("recognition", super()._listen_vosk_original, timeout)
+        self._answered_at = time.perf_counter()
+        return transcription
+
+    def llm_query(self, prompt: str, grammar=None) -> str:
+        return self._timed("llm", super().llm_query, prompt, grammar)
+
+    def check_faq(self, query: str):
+        return self._timed("faq", super().check_faq, query)
+
+    def generate_summary(self, candidate_name: str):
+        return self._timed("summary", super().generate_summary, candidate_name)
+
+    def conduct_interview(self, resume_session=None):
+        return self._timed("session", super().conduct_interview, resume_session)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+@contextlib.contextmanager
+def scratch_data_dir(data_dir: str):
+    """Point the database and journals at data_dir for the block; yields a persistence worker writing there."""
+    data_dir = Path(data_dir)
+    original_database, original_journals = storage.get_database_path(), journal.get_journal_dir()
+    storage.set_database_path(str(data_dir / "interviews.db"))
+    journal.set_journal_dir(str(data_dir / "journals"))
+    worker = persistence.PersistenceWorker(summaries_dir=data_dir / "summaries", transcripts_dir=data_dir / "transcripts",
+                                           failed_dir=data_dir / "failed_saves")
+    try:
+        yield worker
+    finally:
+        worker.stop()
+        storage.set_database_path(str(original_database))
+        journal.set_journal_dir(str(original_journals))
+
+
+def run_simulation(personas: List[Dict[str, Any]], sessions: int, workers: int,
+                   realtime: bool = False, data_dir: str = None) -> Dict[str, Any]:
+    """Run sessions interviews, cycling through the personas, and return the report.
+
+    Interview output goes to data_dir, or to a temporary directory that is removed afterwards.
+    """
+    with contextlib.ExitStack() as stack:
+        if data_dir is None:
+            data_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="lunartech_sim_"))
+        worker = stack.enter_context(scratch_data_dir(data_dir))
+        return _run_sessions(personas, sessions, workers, realtime, worker)
+
+
+def _run_sessions(personas: List[Dict[str, Any]], sessions: int, workers: int, realtime: bool,
+                  worker: persistence.PersistenceWorker) -> Dict[str, Any]:
+    resources = SharedResources(tts_audio=True, worker=worker)
+    # Synthesize every persona's answers up front so TTS is not part of the measurement
+    clips = {persona["name"]: persona_clips(persona, resources) for persona in personas}
+
+    def run_one(number: int) -> Dict[str, List[float]]:
+        persona = personas[number % len(personas)]
+        session = SimulatedSession(resources, clips[persona["name"]], realtime)
+        session.conduct_interview()
+        return session.timings
+
+    results, errors = [], []
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    # Interview chatter from hundreds of sessions is not useful here; the journals keep it
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        with ThreadPoolExecutor(workers, thread_name_prefix="simulated") as pool:
+            for future in [pool.submit(run_one, number) for number in range(sessions)]:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    errors.append(str(e))
+    interviews_done = time.perf_counter()
+    resources.persistence.flush()
+    wall = time.perf_counter() - wall_started
+    cpu = time.process_time() - cpu_started
+
+    stages = {}
+    for stage in STAGES:
+        values = [value for timings in results for value in timings[stage]]
+        stages[stage] = {
+            "count": len(values),
+            "p50_ms": round(_percentile(values, 0.50) * 1000, 2),
+            "p95_ms": round(_percentile(values, 0.95) * 1000, 2),
+            "p99_ms": round(_percentile(values, 0.99) * 1000, 2),
+        }
+    return {
+        "sessions": sessions,
+        "completed": len(results),
+        "errors": errors,
+        "workers": workers,
+        "realtime": realtime,
+        "wall_seconds": round(wall, 3),
+        "persistence_drain_seconds": round(time.perf_counter() - interviews_done, 3),
+        "interviews_per_second": round(len(results) / wall, 3) if wall else 0.0,
+        "cpu_seconds": round(cpu, 3),
+        "cpu_cores_used": round(cpu / wall, 2) if wall else 0.0,
+        "cpu_count": os.cpu_count(),
+        "stages": stages,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"✅ {report['completed']}/{report['sessions']} interviews in {report['wall_seconds']:.1f}s "
+          f"({report['interviews_per_second']:.2f} interviews/s, {report['workers']} workers)")
+    print(f"🖥️  CPU {report['cpu_seconds']:.1f}s ({report['cpu_cores_used']:.2f} of {report['cpu_count']} cores); "
+          f"persistence drained in {report['persistence_drain_seconds']:.2f}s")
+    print(f"\n{'Stage':<14}{'count':>8}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}")
+    for stage, row in report["stages"].items():
+        print(f"{stage:<14}{row['count']:>8}{row['p50_ms']:>11.1f}{row['p95_ms']:>11.1f}{row['p99_ms']:>11.1f}")
+    for error in report["errors"][:5]:
+        print(f"❌ {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless interview simulation for LunarTech Interview Agent")
+    parser.add_argument("personas", nargs="*", default=[DEFAULT_PERSONAS_DIR],
+                        help="Persona files or directories (default: data/personas)")
+    parser.add_argument("--sessions", type=int, default=100, help="Interviews to run")
+    parser.add_argument("--workers", type=int, default=32, help="Interviews running at once")
+    parser.add_argument("--realtime", action="store_true", help="Deliver candidate audio at real-time speed")
+    parser.add_argument("--data-dir", metavar="DIR",
+                        help="Keep the interviews' database, summaries, transcripts and journals here "
+                             "(default: a temporary directory, removed afterwards)")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    personas = load_personas(args.personas)
+    print(f"🎭 Simulating {args.sessions} interviews with {len(personas)} personas...")
+    report = run_simulation(personas, args.sessions, args.workers, args.realtime, args.data_dir)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 Report written to {args.json}")
+    if args.data_dir:
+        print(f"📁 Interview output kept in {args.data_dir}")
+
+
+if __name__ == "__main__":
+    main()
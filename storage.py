@@ -0,0 +1,867 @@
+#!/usr/bin/env python3
+"""
+SQLite storage layer for LunarTech AI Interview Agent
+
+Every module goes through long-lived connections: one writer per process,
+serialized by a lock, and one read-only connection per thread. The writer
+is opened in WAL mode with tuned pragmas and pending schema migrations are
+applied once when it is first opened, so individual saves and reads no
+longer pay for connect/CREATE TABLE/close. WAL lets readers, in this
+process or others (dashboard, utils.py), run while an interview is written.
+"""
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set
+
+from config import DATABASE_FILE
+
+logger = logging.getLogger(__name__)
+
+PRAGMAS = {
+    "auto_vacuum": "INCREMENTAL",  # Takes effect on new databases or after one full VACUUM
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",     # Durable at checkpoints; safe with WAL
+    "busy_timeout": 5000,        # Milliseconds to wait for another writer
+    "cache_size": -16000,        # 16 MB page cache
+    "temp_store": "MEMORY",
+    "mmap_size": 64 * 1024 * 1024,
+    "foreign_keys": "ON",
+}
+
+# Database-level settings only the writer applies
+_WRITER_ONLY_PRAGMAS = ("auto_vacuum", "journal_mode")
+
+_BASE_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS interviews (
+        id TEXT PRIMARY KEY,
+        timestamp TEXT,
+        summary TEXT
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS questions_answers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        interview_id TEXT,
+        question_number INTEGER,
+        question TEXT,
+        answer TEXT,
+        FOREIGN KEY (interview_id) REFERENCES interviews (id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS extracted_info (
+        interview_id TEXT PRIMARY KEY,
+        name TEXT,
+        interest_level TEXT,
+        readiness TEXT,
+        background TEXT,
+        FOREIGN KEY (interview_id) REFERENCES interviews (id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS question_clusters (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        representative TEXT,
+        question_count INTEGER NOT NULL DEFAULT 0,
+        first_seen TEXT,
+        last_seen TEXT
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS unanswered_questions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        interview_id TEXT,
+        question TEXT,
+        cluster_id INTEGER,
+        asked_at TEXT,
+        FOREIGN KEY (cluster_id) REFERENCES question_clusters (id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS cluster_lsh_buckets (
+        band_key TEXT PRIMARY KEY,
+        cluster_id INTEGER NOT NULL
+    ) WITHOUT ROWID
+    ''',
+    "CREATE INDEX IF NOT EXISTS idx_unanswered_cluster ON unanswered_questions (cluster_id)",
+    "CREATE INDEX IF NOT EXISTS idx_unanswered_interview ON unanswered_questions (interview_id)",
+    "CREATE INDEX IF NOT EXISTS idx_clusters_count ON question_clusters (question_count DESC)",
+]
+
+def _change_trigger(table: str, event: str, key: str) -> str:
+    """Trigger that appends the affected interview to the change log."""
+    return f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.split()[0].lower()}_changes
+        AFTER {event} ON {table}
+        BEGIN
+            INSERT INTO interview_changes (interview_id) VALUES (NEW.{key});
+        END
+        '''
+
+
+def _search_triggers(conn: sqlite3.Connection, table: str, column: str, new_row: str, old_row: str,
+                     extra_insert: str = "", extra_delete: str = "") -> None:
+    """Triggers that keep the search_index rows of one source column in sync."""
+    insert = f"{extra_insert} INSERT INTO search_index (rowid, body, kind, interview_id, ref) VALUES ({new_row});"
+    delete = f"DELETE FROM search_index WHERE rowid = ({old_row});"
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_search_insert AFTER INSERT ON {table} BEGIN {insert} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_search_update AFTER UPDATE OF {column} ON {table} BEGIN {delete} {insert} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_search_delete AFTER DELETE ON {table} BEGIN {delete} {extra_delete} END")
+
+
+def _create_search_index(conn: sqlite3.Connection) -> None:
+    """FTS5 index over answers, kept in sync by triggers (summaries: see _index_summaries).
+
+    Answer rows use search rowid questions_answers.id * 2. SQLite builds
+    without FTS5 skip this step and search reports itself unavailable.
+    """
+    try:
+        conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+            body, kind UNINDEXED, interview_id UNINDEXED, ref UNINDEXED,
+            tokenize = 'porter unicode61'
+        )
+        ''')
+    except sqlite3.OperationalError as e:
+        logger.warning(f"Full-text search unavailable in this SQLite build: {e}")
+        return
+    _search_triggers(conn, "questions_answers", "answer",
+                     "NEW.id * 2, NEW.answer, 'answer', NEW.interview_id, NEW.question_number", "OLD.id * 2")
+
+
+_SUMMARY_ROWID = "(SELECT key * 2 + 1 FROM search_summary_keys WHERE interview_id = {}.id)"
+
+
+def _index_summaries(conn: sqlite3.Connection) -> None:
+    """Index summaries under search rowid key * 2 + 1, key being a stable integer per interview ID.
+
+    Summaries used to be keyed by interviews.rowid, which VACUUM may renumber
+    because interviews has a TEXT primary key. Rebuilds those rows.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS search_summary_keys (
+            key INTEGER PRIMARY KEY,
+            interview_id TEXT UNIQUE NOT NULL
+        )
+    ''')
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'").fetchone() is None:
+        return
+    for event in ("insert", "update", "delete"):
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_interviews_search_{event}")
+    conn.execute("DELETE FROM search_index WHERE kind = 'summary'")
+    conn.execute("INSERT OR IGNORE INTO search_summary_keys (interview_id) SELECT id FROM interviews ORDER BY rowid")
+    conn.execute('''
+        INSERT INTO search_index (rowid, body, kind, interview_id, ref)
+        SELECT k.key * 2 + 1, i.summary, 'summary', i.id, NULL
+        FROM search_summary_keys k JOIN interviews i ON i.id = k.interview_id
+        WHERE i.summary != ''
+    ''')
+    _search_triggers(
+        conn, "interviews", "summary",
+        f"{_SUMMARY_ROWID.format('NEW')}, NEW.summary, 'summary', NEW.id, NULL", _SUMMARY_ROWID.format("OLD"),
+        extra_insert="INSERT OR IGNORE INTO search_summary_keys (interview_id) VALUES (NEW.id);",
+        extra_delete="DELETE FROM search_summary_keys WHERE interview_id = OLD.id;",
+    )
+
+
+def _stats_bump(metric: str, key: str, delta: int) -> str:
+    """Statement that adds delta to one interview_stats counter (NULL keys are skipped)."""
+    return f'''
+            INSERT INTO interview_stats (metric, key, value) SELECT '{metric}', {key}, {delta} WHERE {key} IS NOT NULL
+            ON CONFLICT(metric, key) DO UPDATE SET value = value + excluded.value;'''
+
+
+# Counters behind get_statistics(); recomputed from the base tables by rebuild_statistics()
+_STATS_REBUILD = [
+    "DELETE FROM interview_stats",
+    "INSERT INTO interview_stats (metric, key, value) SELECT 'total', '', COUNT(*) FROM interviews",
+    '''INSERT INTO interview_stats (metric, key, value)
+       SELECT 'day', interview_date, COUNT(*) FROM interviews WHERE interview_date IS NOT NULL GROUP BY interview_date''',
+    '''INSERT INTO interview_stats (metric, key, value)
+       SELECT 'interest', interest_level, COUNT(*) FROM extracted_info WHERE interest_level IS NOT NULL GROUP BY interest_level''',
+    '''INSERT INTO interview_stats (metric, key, value)
+       SELECT 'readiness', readiness, COUNT(*) FROM extracted_info WHERE readiness IS NOT NULL GROUP BY readiness''',
+]
+
+_STATS_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS interview_stats (
+        metric TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (metric, key)
+    ) WITHOUT ROWID
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_interviews_stats_insert AFTER INSERT ON interviews
+    BEGIN {_stats_bump("total", "''", 1)} {_stats_bump("day", "NEW.interview_date", 1)}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_interviews_stats_update AFTER UPDATE OF interview_date ON interviews
+    BEGIN {_stats_bump("day", "OLD.interview_date", -1)} {_stats_bump("day", "NEW.interview_date", 1)}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_interviews_stats_delete AFTER DELETE ON interviews
+    BEGIN {_stats_bump("total", "''", -1)} {_stats_bump("day", "OLD.interview_date", -1)}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_extracted_stats_insert AFTER INSERT ON extracted_info
+    BEGIN {_stats_bump("interest", "NEW.interest_level", 1)} {_stats_bump("readiness", "NEW.readiness", 1)}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_extracted_stats_update AFTER UPDATE OF interest_level, readiness ON extracted_info
+    BEGIN {_stats_bump("interest", "OLD.interest_level", -1)} {_stats_bump("interest", "NEW.interest_level", 1)}
+          {_stats_bump("readiness", "OLD.readiness", -1)} {_stats_bump("readiness", "NEW.readiness", 1)}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_extracted_stats_delete AFTER DELETE ON extracted_info
+    BEGIN {_stats_bump("interest", "OLD.interest_level", -1)} {_stats_bump("readiness", "OLD.readiness", -1)}
+    END
+    ''',
+]
+
+
+
+MAX_HISTOGRAM_WORDS = 500
+
+
+def _word_count(column: str) -> str:
+    """SQL expression counting the words of a single-spaced transcript, capped for the histogram."""
+    text = f"TRIM(COALESCE({column}, ''))"
+    return (f"MIN(CASE WHEN {text} = '' THEN 0 "
+            f"ELSE LENGTH({text}) - LENGTH(REPLACE({text}, ' ', '')) + 1 END, {MAX_HISTOGRAM_WORDS})")
+
+
+def _readiness_key(date: str, readiness: str) -> str:
+    """interview_stats key of the per-day readiness counters ('YYYY-MM-DD|level')."""
+    return f"({date}) || '|' || ({readiness})"
+
+
+def _length_bump(question_number: str, answer: str, delta: int) -> str:
+    """Statement that moves one answer in or out of the answer-length histogram."""
+    return f'''
+            INSERT INTO answer_length_histogram (question_number, word_count, answers)
+            SELECT {question_number}, {_word_count(answer)}, {delta} WHERE {question_number} IS NOT NULL
+            ON CONFLICT(question_number, word_count) DO UPDATE SET answers = answers + excluded.answers;'''
+
+_INTERVIEW_DATE = "(SELECT interview_date FROM interviews WHERE id = {}.interview_id)"
+_READINESS = "(SELECT readiness FROM extracted_info WHERE interview_id = {}.id)"
+
+# Aggregates behind the dashboard trend panels: per-day readiness counters in
+# interview_stats and a per-question histogram of answer word counts
+_TRENDS_REBUILD = [
+    "DELETE FROM answer_length_histogram",
+    f'''INSERT INTO answer_length_histogram (question_number, word_count, answers)
+       SELECT question_number, {_word_count("answer")}, COUNT(*) FROM questions_answers
+       WHERE question_number IS NOT NULL GROUP BY 1, 2''',
+    '''INSERT INTO interview_stats (metric, key, value)
+       SELECT 'day_readiness', i.interview_date || '|' || e.readiness, COUNT(*)
+       FROM interviews i JOIN extracted_info e ON e.interview_id = i.id
+       WHERE i.interview_date IS NOT NULL AND e.readiness IS NOT NULL GROUP BY 2''',
+]
+
+_TRENDS_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS answer_length_histogram (
+        question_number INTEGER NOT NULL,
+        word_count INTEGER NOT NULL,
+        answers INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (question_number, word_count)
+    ) WITHOUT ROWID
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_qa_length_insert AFTER INSERT ON questions_answers
+    BEGIN {_length_bump("NEW.question_number", "NEW.answer", 1)}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_qa_length_update AFTER UPDATE OF question_number, answer ON questions_answers
+    BEGIN {_length_bump("OLD.question_number", "OLD.answer", -1)} {_length_bump("NEW.question_number", "NEW.answer", 1)}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_qa_length_delete AFTER DELETE ON questions_answers
+    BEGIN {_length_bump("OLD.question_number", "OLD.answer", -1)}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_extracted_trend_insert AFTER INSERT ON extracted_info
+    BEGIN {_stats_bump("day_readiness", _readiness_key(_INTERVIEW_DATE.format("NEW"), "NEW.readiness"), 1)}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_extracted_trend_update AFTER UPDATE OF readiness ON extracted_info
+    BEGIN {_stats_bump("day_readiness", _readiness_key(_INTERVIEW_DATE.format("OLD"), "OLD.readiness"), -1)}
+          {_stats_bump("day_readiness", _readiness_key(_INTERVIEW_DATE.format("NEW"), "NEW.readiness"), 1)}
+    END
+    ''',
+    # Whichever of an interview and its extracted info is deleted first
+    # removes the pair from the readiness counters; the other finds no match
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_extracted_trend_delete AFTER DELETE ON extracted_info
+    BEGIN {_stats_bump("day_readiness", _readiness_key(_INTERVIEW_DATE.format("OLD"), "OLD.readiness"), -1)}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_interviews_trend_update AFTER UPDATE OF interview_date ON interviews
+    BEGIN {_stats_bump("day_readiness", _readiness_key("OLD.interview_date", _READINESS.format("OLD")), -1)}
+          {_stats_bump("day_readiness", _readiness_key("NEW.interview_date", _READINESS.format("NEW")), 1)}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_interviews_trend_delete AFTER DELETE ON interviews
+    BEGIN {_stats_bump("day_readiness", _readiness_key("OLD.interview_date", _READINESS.format("OLD")), -1)}
+    END
+    ''',
+]
+
+
+# Ordered schema migrations; PRAGMA user_version records the last one applied.
+# Databases created before versioning report version 0 and already contain
+# the base tables, which migration 1 creates only if missing.
+MIGRATIONS = [
+    (1, "base schema", _BASE_SCHEMA),
+    (2, "indexes and stored interview date", [
+        "ALTER TABLE interviews ADD COLUMN interview_date TEXT",
+        "UPDATE interviews SET interview_date = DATE(timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_interviews_date ON interviews (interview_date)",
+        "CREATE INDEX IF NOT EXISTS idx_interviews_timestamp ON interviews (timestamp, id)",
+        "CREATE INDEX IF NOT EXISTS idx_qa_interview ON questions_answers (interview_id, question_number)",
+        "CREATE INDEX IF NOT EXISTS idx_extracted_interest ON extracted_info (interest_level)",
+        # Keep the stored date in step for writers that only set the timestamp
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_interviews_date_insert
+        AFTER INSERT ON interviews
+        WHEN NEW.interview_date IS NULL
+        BEGIN
+            UPDATE interviews SET interview_date = DATE(NEW.timestamp) WHERE id = NEW.id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_interviews_date_update
+        AFTER UPDATE OF timestamp ON interviews
+        BEGIN
+            UPDATE interviews SET interview_date = DATE(NEW.timestamp) WHERE id = NEW.id;
+        END
+        ''',
+    ]),
+    (3, "change log and export watermarks", [
+        '''
+        CREATE TABLE IF NOT EXISTS interview_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            interview_id TEXT NOT NULL,
+            changed_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS export_watermarks (
+            consumer TEXT PRIMARY KEY,
+            last_seq INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT
+        )
+        ''',
+        # Existing interviews count as changed so a consumer's first run exports them
+        "INSERT INTO interview_changes (interview_id) SELECT id FROM interviews ORDER BY timestamp, id",
+        _change_trigger("interviews", "INSERT", "id"),
+        _change_trigger("interviews", "UPDATE OF timestamp, summary", "id"),
+        _change_trigger("extracted_info", "INSERT", "interview_id"),
+        _change_trigger("extracted_info", "UPDATE", "interview_id"),
+        _change_trigger("questions_answers", "INSERT", "interview_id"),
+        _change_trigger("questions_answers", "UPDATE", "interview_id"),
+    ]),
+    (4, "per-answer turn duration", [
+        "ALTER TABLE questions_answers ADD COLUMN duration_seconds REAL",
+    ]),
+    # Rows that predate this migration are indexed by backfill_search_index()
+    (5, "full-text search index", [_create_search_index]),
+    (6, "indexes for filtered interview listing", [
+        "CREATE INDEX IF NOT EXISTS idx_extracted_readiness ON extracted_info (readiness)",
+        "CREATE INDEX IF NOT EXISTS idx_extracted_name ON extracted_info (name COLLATE NOCASE)",
+    ]),
+    (7, "statistics rollup", _STATS_SCHEMA + _STATS_REBUILD),
+    (8, "trend aggregates", _TRENDS_SCHEMA + _TRENDS_REBUILD),
+    (9, "session file archive index", [
+        '''
+        CREATE TABLE IF NOT EXISTS archive_index (
+            name TEXT PRIMARY KEY,
+            session_id TEXT,
+            segment TEXT NOT NULL,
+            offset INTEGER NOT NULL,
+            length INTEGER NOT NULL,
+            codec TEXT NOT NULL,
+            size INTEGER NOT NULL
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_archive_session ON archive_index (session_id)",
+    ]),
+    # One row per session and stage; buckets is the histogram as JSON {upper bound: count}
+    (10, "per-session stage latency metrics", [
+        '''
+        CREATE TABLE IF NOT EXISTS session_metrics (
+            session_id TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            total_seconds REAL NOT NULL,
+            max_seconds REAL NOT NULL,
+            p50_seconds REAL,
+            p95_seconds REAL,
+            buckets TEXT NOT NULL,
+            PRIMARY KEY (session_id, stage)
+        )
+        ''',
+    ]),
+    (11, "search summaries keyed by interview ID", [_index_summaries]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# Hot queries that must be served by an index; checked by `utils.py check-indexes`
+INDEXED_QUERIES = {
+    "dashboard: statistics rollup": (
+        "SELECT metric, key, value FROM interview_stats "
+        "WHERE metric IN ('total', 'interest', 'readiness') OR (metric = 'day' AND key = ?)",
+        ("2025-01-01",)),
+    "dashboard: trends": (
+        "SELECT metric, key, value FROM interview_stats "
+        "WHERE metric IN ('day', 'day_readiness') AND key >= ? AND value > 0 ORDER BY metric, key",
+        ("2025-01-01",)),
+    "view: interview details": (
+        """SELECT i.id, i.timestamp, i.summary, e.name, e.interest_level, e.readiness, e.background
+           FROM interviews i LEFT JOIN extracted_info e ON i.id = e.interview_id WHERE i.id = ?""", ("x",)),
+    "view: questions and answers": (
+        """SELECT question_number, question, answer FROM questions_answers
+           WHERE interview_id = ? ORDER BY question_number""", ("x",)),
+    "list: next page by time": (
+        """SELECT i.id, i.timestamp, e.name, e.interest_level, e.readiness
+           FROM interviews i LEFT JOIN extracted_info e ON i.id = e.interview_id
+           WHERE (i.timestamp, i.id) < (?, ?)
+           ORDER BY i.timestamp DESC, i.id DESC LIMIT 50""", ("2025-01-01", "x")),
+    "latency: stage metrics since": (
+        "SELECT stage, buckets, total_seconds, max_seconds FROM session_metrics WHERE session_id >= ?",
+        ("20250101",)),
+    "list: name prefix": (
+        """SELECT i.id, i.timestamp, e.name, e.interest_level, e.readiness
+           FROM interviews i CROSS JOIN extracted_info e ON i.id = e.interview_id
+           WHERE e.name >= ? COLLATE NOCASE AND e.name < ? COLLATE NOCASE
+           ORDER BY i.timestamp DESC, i.id DESC LIMIT 50""", ("jan", "jan\uffff")),
+}
+
+_database_path = DATABASE_FILE
+_connection: Optional[sqlite3.Connection] = None
+_connection_pid: Optional[int] = None
+_lock = threading.RLock()          # Held only around the writer connection
+_readers: Set[sqlite3.Connection] = set()   # Open read-only connections, closed with their threads
+_readers_pid: Optional[int] = None
+_readers_lock = threading.RLock()   # Reentrant: a reader's finalizer can run while it is held
+_reader_generation = 0             # Bumped by close() so threads reopen their readers
+_local = threading.local()
+
+
+class _ReaderHolder:
+    """Holds a thread's reader in _local; its finalizer closes the reader when the thread ends."""
+
+    def __init__(self, conn: sqlite3.Connection, key: tuple):
+        self.conn, self.key = conn, key
+
+
+def set_database_path(path: str) -> None:
+    """Point the storage layer at another database file (closes the current connection)."""
+    global _database_path
+    with _lock:
+        close()
+        _database_path = str(path)
+
+
+def get_database_path() -> Path:
+    return Path(_database_path)
+
+
+def database_exists() -> bool:
+    return get_database_path().exists()
+
+
+def get_connection() -> sqlite3.Connection:
+    """Return this process's writer connection, opening and initializing it on first use."""
+    global _connection, _connection_pid
+    with _lock:
+        # A forked child must not reuse the parent's connection
+        if _connection is not None and _connection_pid == os.getpid():
+            return _connection
+
+        get_database_path().parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(_database_path, check_same_thread=False, isolation_level=None)
+        for pragma, value in PRAGMAS.items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        _initialize_schema(conn)
+
+        _connection, _connection_pid = conn, os.getpid()
+        logger.info(f"Opened database {_database_path} (WAL)")
+        return conn
+
+
+def _initialize_schema(conn: sqlite3.Connection) -> None:
+    """Apply any pending migrations, each in its own transaction."""
+    current = conn.execute("PRAGMA user_version").fetchone()[0]
+    for version, description, statements in MIGRATIONS:
+        if version <= current:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-check under the write lock in case another process migrated first
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                conn.execute("ROLLBACK")
+                continue
+            for statement in statements:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.execute("COMMIT")
+            logger.info(f"Applied database migration {version}: {description}")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def schema_version() -> int:
+    """Schema version of the current database."""
+    with reading() as conn:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def explain_query_plans() -> Dict[str, List[str]]:
+    """EXPLAIN QUERY PLAN details for each query in INDEXED_QUERIES."""
+    plans = {}
+    with reading() as conn:
+        for name, (sql, params) in INDEXED_QUERIES.items():
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            plans[name] = [row[-1] for row in rows]
+    return plans
+
+
+def uses_full_scan(plan: List[str]) -> bool:
+    """True if a query plan scans a table without an index."""
+    return any(step.startswith("SCAN") and "INDEX" not in step for step in plan)
+
+
+def uses_temp_sort(plan: List[str]) -> bool:
+    """True if a query plan sorts its results instead of reading them in index order."""
+    return any(step.startswith("USE TEMP B-TREE FOR") and "ORDER BY" in step for step in plan)
+
+
+def _reader_connection() -> sqlite3.Connection:
+    """Return this thread's read-only connection, opening it on first use."""
+    global _readers_pid
+    key = (os.getpid(), _reader_generation)
+    holder = getattr(_local, "holder", None)
+    if holder is not None and holder.key == key:
+        return holder.conn
+
+    if _connection is None or _connection_pid != os.getpid():
+        # The writer applies migrations before any reader sees the schema
+        get_connection()
+    conn = sqlite3.connect(_database_path, check_same_thread=False, isolation_level=None)
+    for pragma, value in PRAGMAS.items():
+        if pragma not in _WRITER_ONLY_PRAGMAS:
+            conn.execute(f"PRAGMA {pragma} = {value}")
+    conn.execute("PRAGMA query_only = ON")
+    with _readers_lock:
+        if _readers_pid != os.getpid():
+            # A forked child must not reuse (or close) the parent's readers
+            _readers.clear()
+            _readers_pid = os.getpid()
+        _readers.add(conn)
+        # Tagged with the generation it was opened under, so a close() meanwhile forces a reopen
+        holder = _ReaderHolder(conn, key)
+        # Threading servers start a thread per request; close each reader when its thread's locals go
+        weakref.finalize(holder, _release_reader, conn, os.getpid())
+    _local.holder = holder
+    return conn
+
+
+def _release_reader(conn: sqlite3.Connection, pid: int) -> None:
+    """Close a reader whose thread has ended (or that close() replaced)."""
+    if pid != os.getpid():
+        return
+    with _readers_lock:
+        _readers.discard(conn)
+    try:
+        conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"Error closing database reader: {e}")
+
+
+def close() -> None:
+    """Close this process's writer and read-only connections, if open."""
+    global _connection, _connection_pid, _reader_generation
+    with _lock:
+        if _connection is not None and _connection_pid == os.getpid():
+            try:
+                _connection.execute("PRAGMA optimize")
+                _connection.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing database: {e}")
+        _connection, _connection_pid = None, None
+        with _readers_lock:
+            if _readers_pid == os.getpid():
+                for conn in list(_readers):
+                    try:
+                        conn.close()
+                    except sqlite3.Error as e:
+                        logger.warning(f"Error closing database reader: {e}")
+            _readers.clear()
+            _reader_generation += 1
+
+
+atexit.register(close)
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """Run the block as one write transaction (BEGIN IMMEDIATE ... COMMIT)."""
+    with _lock:
+        conn = get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+@contextmanager
+def writing() -> Iterator[sqlite3.Connection]:
+    """Use the writer connection outside a transaction (ATTACH, VACUUM, ANALYZE, checkpoints)."""
+    with _lock:
+        yield get_connection()
+
+
+@contextmanager
+def reading() -> Iterator[sqlite3.Connection]:
+    """Use this thread's read-only connection; WAL keeps reads off the writer's path and lock."""
+    yield _reader_connection()
+
+
+def search_available() -> bool:
+    """True if the FTS5 search index exists in this database."""
+    with reading() as conn:
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'"
+        ).fetchone() is not None
+
+
+def backfill_search_index(batch_size: int = 1000) -> int:
+    """Index rows missing from the search index, one short transaction per batch."""
+    sources = [
+        ("""SELECT id * 2, answer, 'answer', interview_id, question_number, id FROM questions_answers
+            WHERE id > ? AND NOT EXISTS (SELECT 1 FROM search_index WHERE rowid = questions_answers.id * 2)
+            ORDER BY id LIMIT ?"""),
+        ("""SELECT k.key * 2 + 1, i.summary, 'summary', i.id, NULL, k.key
+            FROM search_summary_keys k JOIN interviews i ON i.id = k.interview_id
+            WHERE k.key > ? AND NOT EXISTS (SELECT 1 FROM search_index WHERE rowid = k.key * 2 + 1)
+            ORDER BY k.key LIMIT ?"""),
+    ]
+    indexed = 0
+    for query in sources:
+        last_id = 0
+        while True:
+            with transaction() as conn:
+                rows = conn.execute(query, (last_id, batch_size)).fetchall()
+                conn.executemany(
+                    "INSERT INTO search_index (rowid, body, kind, interview_id, ref) VALUES (?, ?, ?, ?, ?)",
+                    [row[:5] for row in rows if row[1]]
+                )
+            if not rows:
+                break
+            indexed += sum(1 for row in rows if row[1])
+            last_id = rows[-1][5]
+    return indexed
+
+
+def search(query: str, limit: int = 10, offset: int = 0, highlight: tuple = ("[", "]")) -> List[Dict[str, Any]]:
+    """Ranked full-text search over answers and summaries."""
+    start, end = highlight
+    with reading() as conn:
+        rows = conn.execute("""
+            SELECT s.interview_id, s.kind, s.ref, snippet(search_index, 0, ?, ?, '…', 16),
+                   bm25(search_index) AS rank, i.timestamp, e.name
+            FROM search_index s
+            JOIN interviews i ON i.id = s.interview_id
+            LEFT JOIN extracted_info e ON e.interview_id = s.interview_id
+            WHERE search_index MATCH ?
+            ORDER BY rank
+            LIMIT ? OFFSET ?
+        """, (start, end, query, limit, offset)).fetchall()
+    return [
+        {"interview_id": interview_id, "kind": kind, "question_number": ref, "snippet": snippet,
+         "score": -rank, "timestamp": timestamp, "name": name}
+        for interview_id, kind, ref, snippet, rank, timestamp, name in rows
+    ]
+
+
+def get_statistics(day: str) -> Dict[str, Any]:
+    """Interview totals from the rollup table: overall, on one day and per level."""
+    stats: Dict[str, Any] = {"total": 0, "day": 0, "interest": {}, "readiness": {}}
+    with reading() as conn:
+        rows = conn.execute(
+            "SELECT metric, key, value FROM interview_stats "
+            "WHERE metric IN ('total', 'interest', 'readiness') OR (metric = 'day' AND key = ?)",
+            (day,)
+        ).fetchall()
+    for metric, key, value in rows:
+        if metric in ("total", "day"):
+            stats[metric] = value
+        elif value:
+            stats[metric][key] = value
+    return stats
+
+
+def data_version() -> str:
+    """Token that changes whenever interview data is written or deleted."""
+    with reading() as conn:
+        last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM interview_changes").fetchone()[0]
+        total = conn.execute("SELECT value FROM interview_stats WHERE metric = 'total' AND key = ''").fetchone()
+    # Deletes are not in the change log, but they move the total
+    return f"{last_seq}-{total[0] if total else 0}"
+
+
+def get_trends(since: str) -> Dict[str, Any]:
+    """
+    Trend aggregates from `since` (YYYY-MM-DD) on: interviews and readiness
+    counts per day, plus each question's answer-length histogram (all time).
+    """
+    trends: Dict[str, Any] = {"daily": {}, "readiness": {}, "answer_lengths": {}}
+    with reading() as conn:
+        rows = conn.execute(
+            "SELECT metric, key, value FROM interview_stats "
+            "WHERE metric IN ('day', 'day_readiness') AND key >= ? AND value > 0 ORDER BY metric, key",
+            (since,)
+        ).fetchall()
+        histogram = conn.execute(
+            "SELECT question_number, word_count, answers FROM answer_length_histogram "
+            "WHERE answers > 0 ORDER BY question_number, word_count"
+        ).fetchall()
+    for metric, key, value in rows:
+        if metric == "day":
+            trends["daily"][key] = value
+        else:
+            day, _, level = key.partition("|")
+            trends["readiness"].setdefault(day, {})[level] = value
+    for question_number, word_count, answers in histogram:
+        trends["answer_lengths"].setdefault(question_number, []).append((word_count, answers))
+    return trends
+
+
+def histogram_median(buckets: Sequence[tuple]) -> Optional[float]:
+    """Median of a sorted (value, count) histogram."""
+    total = sum(count for _, count in buckets)
+    if not total:
+        return None
+    lower = upper = None
+    seen = 0
+    for value, count in buckets:
+        seen += count
+        if lower is None and seen >= (total + 1) // 2:
+            lower = value
+        if seen >= total // 2 + 1:
+            upper = value
+            break
+    return (lower + upper) / 2
+
+
+def rebuild_statistics() -> None:
+    """Recompute the statistics rollup and trend aggregates from the base tables."""
+    with transaction() as conn:
+        for statement in _STATS_REBUILD + _TRENDS_REBUILD:
+            conn.execute(statement)
+
+
+def get_watermark(conn: sqlite3.Connection, consumer: str) -> int:
+    """Last change-log sequence number exported to a consumer (0 if never)."""
+    row = conn.execute("SELECT last_seq FROM export_watermarks WHERE consumer = ?", (consumer,)).fetchone()
+    return row[0] if row else 0
+
+
+def set_watermark(consumer: str, last_seq: int) -> None:
+    """Record that a consumer has received every change up to last_seq."""
+    with transaction() as conn:
+        conn.execute("""
+            INSERT INTO export_watermarks (consumer, last_seq, updated_at)
+            VALUES (?, ?, datetime('now'))
+            ON CONFLICT(consumer) DO UPDATE SET last_seq = excluded.last_seq, updated_at = excluded.updated_at
+        """, (consumer, last_seq))
+
+
+def save_interview(interview_id: str, interview_data: Dict[str, Any], questions: Sequence[str]) -> bool:
+    """Insert an interview, its Q&A pairs and extracted info in one transaction.
+
+    Returns False, writing nothing, if the interview is already saved; a retry
+    after a commit whose success went unnoticed is then harmless.
+    """
+    extracted = interview_data.get("extracted_info", {})
+    durations = interview_data.get("answer_durations", [])
+    qa_rows: List[tuple] = [
+        (interview_id, i + 1, question, answer, durations[i] if i < len(durations) else None)
+        for i, (question, answer) in enumerate(zip(questions, interview_data.get("answers", [])))
+    ]
+    with transaction() as conn:
+        timestamp = interview_data.get("timestamp")
+        inserted = conn.execute(
+            "INSERT INTO interviews (id, timestamp, summary, interview_date) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(id) DO NOTHING",
+            (interview_id, timestamp, interview_data.get("summary"), (timestamp or "")[:10] or None)
+        ).rowcount
+        if not inserted:
+            return False
+        conn.executemany(
+            "INSERT INTO questions_answers (interview_id, question_number, question, answer, duration_seconds) VALUES (?, ?, ?, ?, ?)",
+            qa_rows
+        )
+        conn.execute(
+            "INSERT INTO extracted_info (interview_id, name, interest_level, readiness, background) VALUES (?, ?, ?, ?, ?)",
+            (
+                interview_id,
+                extracted.get("name", "Unknown"),
+                extracted.get("interest_level", "unknown"),
+                extracted.get("readiness", "unknown"),
+                extracted.get("background", "")
+            )
+        )
+    return True
+
+
+def save_session_metrics(session_id: str, stages: Dict[str, Dict[str, Any]]) -> None:
+    """Replace a session's stage histograms (as produced by metrics.SessionMetrics.summary)."""
+    with transaction() as conn:
+        conn.execute("DELETE FROM session_metrics WHERE session_id = ?", (session_id,))
+        conn.executemany(
+            "INSERT INTO session_metrics (session_id, stage, count, total_seconds, max_seconds, "
+            "p50_seconds, p95_seconds, buckets) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(session_id, stage, row["count"], row["sum"], row["max"], row["p50"], row["p95"],
+              json.dumps(row["buckets"])) for stage, row in stages.items()]
+        )
+
+
+def get_session_metrics(since_session: str = "") -> List[tuple]:
+    """(stage, buckets JSON, total seconds, max seconds) for sessions whose ID sorts at or after since_session."""
+    with reading() as conn:
+        return conn.execute(
+            "SELECT stage, buckets, total_seconds, max_seconds FROM session_metrics WHERE session_id >= ?",
+            (since_session,)
+        ).fetchall()
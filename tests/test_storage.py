@@ -0,0 +1,200 @@
+"""Storage layer tests against a temporary database (python -m pytest tests)."""
+
+import json
+import threading
+
+import pytest
+
+import retention
+import storage
+import utils
+from config import QUESTIONS
+
+
+def make_interview(name="Jane Doe", timestamp="2025-03-01T10:00:00", interest="high", readiness="medium"):
+    return {
+        "timestamp": timestamp,
+        "summary": f"{name} wants to join the data science program.",
+        "answers": [f"My name is {name}", "I like machine learning", "Two years of Python", "Lead a team", "Yes"],
+        "answer_durations": [3.0, 4.5, 6.0, 2.0, 1.0],
+        "extracted_info": {"name": name, "interest_level": interest, "readiness": readiness, "background": "Analyst"},
+    }
+
+
+@pytest.fixture
+def db(tmp_path):
+    storage.set_database_path(tmp_path / "interviews.db")
+    yield tmp_path
+    storage.close()
+
+
+def test_migrations_reach_latest_version(db):
+    assert storage.schema_version() == storage.SCHEMA_VERSION
+    with storage.reading() as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {"interviews", "questions_answers", "extracted_info", "interview_stats", "interview_changes"} <= tables
+
+
+def test_readers_are_read_only(db):
+    with storage.reading() as conn:
+        with pytest.raises(Exception):
+            conn.execute("DELETE FROM interviews")
+
+
+def test_readers_close_with_their_threads(db):
+    storage.data_version()
+    for _ in range(20):
+        thread = threading.Thread(target=storage.data_version)
+        thread.start()
+        thread.join()
+    assert len(storage._readers) == 1
+
+
+def test_save_and_list(db, capsys):
+    storage.save_interview("20250301_100000", make_interview(), QUESTIONS)
+    storage.save_interview("20250302_100000", make_interview("John Smith", "2025-03-02T10:00:00"), QUESTIONS)
+    capsys.readouterr()
+
+    utils.list_interviews(output_format="json")
+    listed = json.loads(capsys.readouterr().out)
+    assert [row["id"] for row in listed["interviews"]] == ["20250302_100000", "20250301_100000"]
+
+    utils.list_interviews(name_prefix="ja", output_format="json")
+    listed = json.loads(capsys.readouterr().out)
+    assert [row["name"] for row in listed["interviews"]] == ["Jane Doe"]
+
+
+def test_saving_twice_keeps_the_first_copy(db):
+    assert storage.save_interview("20250301_100000", make_interview(), QUESTIONS)
+    assert not storage.save_interview("20250301_100000", make_interview("John Smith"), QUESTIONS)
+    assert storage.get_statistics("2025-03-01")["total"] == 1
+    with storage.reading() as conn:
+        assert conn.execute("SELECT name FROM extracted_info").fetchall() == [("Jane Doe",)]
+        assert conn.execute("SELECT COUNT(*) FROM questions_answers").fetchone()[0] == len(QUESTIONS)
+
+
+def test_list_pages_with_cursor(db, capsys):
+    for day in range(1, 6):
+        storage.save_interview(f"2025030{day}_100000", make_interview(timestamp=f"2025-03-0{day}T10:00:00"), QUESTIONS)
+    capsys.readouterr()
+
+    utils.list_interviews(limit=3, output_format="json")
+    first = json.loads(capsys.readouterr().out)
+    utils.list_interviews(limit=3, after=first["next_cursor"], output_format="json")
+    second = json.loads(capsys.readouterr().out)
+    ids = [row["id"] for row in first["interviews"] + second["interviews"]]
+    assert ids == [f"2025030{day}_100000" for day in range(5, 0, -1)]
+    assert second["next_cursor"] is None
+
+
+def test_list_rejects_empty_pages(db):
+    with pytest.raises(ValueError):
+        utils.list_interviews(limit=0)
+
+
+def test_export_all_and_since_last(db, capsys):
+    storage.save_interview("20250301_100000", make_interview(), QUESTIONS)
+    output = db / "export.ndjson"
+
+    utils.export_interviews_to_json(str(output))
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(records) == 1
+    assert len(records[0]["questions_answers"]) == len(QUESTIONS)
+    assert records[0]["extracted_info"]["name"] == "Jane Doe"
+
+    utils.export_changes_since_last(str(output), consumer="test")
+    assert len(output.read_text().splitlines()) == 1
+    utils.export_changes_since_last(str(output), consumer="test")
+    assert output.read_text() == ""
+
+    storage.save_interview("20250302_100000", make_interview("John Smith", "2025-03-02T10:00:00"), QUESTIONS)
+    utils.export_changes_since_last(str(output), consumer="test")
+    assert [json.loads(line)["id"] for line in output.read_text().splitlines()] == ["20250302_100000"]
+
+
+def test_prune_change_log_keeps_unread_changes(db, capsys):
+    storage.save_interview("20250301_100000", make_interview(), QUESTIONS)
+    storage.save_interview("20250302_100000", make_interview("John Smith", "2025-03-02T10:00:00"), QUESTIONS)
+    version = storage.data_version()
+    output = db / "export.ndjson"
+
+    # With no export consumers only the newest entry stays, for the dashboard's data version
+    assert retention.prune_change_log() > 0
+    assert storage.data_version() == version
+    utils.export_changes_since_last(str(output), consumer="late")
+    assert len(output.read_text().splitlines()) == 2
+
+    storage.save_interview("20250303_100000", make_interview("Ann Lee", "2025-03-03T10:00:00"), QUESTIONS)
+    retention.prune_change_log()
+    utils.export_changes_since_last(str(output), consumer="late")
+    assert [json.loads(line)["id"] for line in output.read_text().splitlines()] == ["20250303_100000"]
+
+
+def test_rollup_triggers_follow_inserts_and_deletes(db):
+    storage.save_interview("20250301_100000", make_interview(), QUESTIONS)
+    storage.save_interview("20250301_110000", make_interview("John Smith", "2025-03-01T11:00:00", "low"), QUESTIONS)
+
+    stats = storage.get_statistics("2025-03-01")
+    assert stats["total"] == 2
+    assert stats["day"] == 2
+    assert stats["interest"] == {"high": 1, "low": 1}
+    assert storage.get_trends("2025-01-01")["daily"] == {"2025-03-01": 2}
+
+    with storage.transaction() as conn:
+        for table, key in (("questions_answers", "interview_id"), ("extracted_info", "interview_id"),
+                           ("interviews", "id")):
+            conn.execute(f"DELETE FROM {table} WHERE {key} = ?", ("20250301_110000",))
+    stats = storage.get_statistics("2025-03-01")
+    assert stats["total"] == 1
+    assert stats["interest"] == {"high": 1}
+
+    # The triggers keep the same counters a full rebuild computes
+    storage.rebuild_statistics()
+    assert storage.get_statistics("2025-03-01") == stats
+
+
+def test_search_finds_answers(db):
+    if not storage.search_available():
+        pytest.skip("SQLite built without FTS5")
+    storage.save_interview("20250301_100000", make_interview(), QUESTIONS)
+    results = storage.search("machine learning")
+    assert [(result["interview_id"], result["kind"]) for result in results] == [("20250301_100000", "answer")]
+
+
+def test_summary_search_survives_rowid_changes(db):
+    if not storage.search_available():
+        pytest.skip("SQLite built without FTS5")
+    storage.save_interview("20250301_100000", make_interview("Ann Lee"), QUESTIONS)
+    storage.save_interview("20250302_100000", make_interview("Bob Ray", "2025-03-02T10:00:00"), QUESTIONS)
+    with storage.transaction() as conn:
+        for table, key in (("questions_answers", "interview_id"), ("extracted_info", "interview_id"),
+                           ("interviews", "id")):
+            conn.execute(f"DELETE FROM {table} WHERE {key} = ?", ("20250301_100000",))
+    retention.full_vacuum()
+    # VACUUM is allowed to renumber the implicit rowids of interviews; do so explicitly
+    with storage.transaction() as conn:
+        conn.execute("UPDATE interviews SET rowid = rowid + 100")
+
+    assert [result["interview_id"] for result in storage.search("Bob")] == ["20250302_100000"] * 2
+    with storage.transaction() as conn:
+        for table, key in (("questions_answers", "interview_id"), ("extracted_info", "interview_id"),
+                           ("interviews", "id")):
+            conn.execute(f"DELETE FROM {table} WHERE {key} = ?", ("20250302_100000",))
+    with storage.reading() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM search_index").fetchone()[0] == 0
+
+
+def test_indexed_query_plans(db):
+    for day in range(1, 10):
+        storage.save_interview(f"2025030{day}_100000", make_interview(timestamp=f"2025-03-0{day}T10:00:00"), QUESTIONS)
+    for name, plan in storage.explain_query_plans().items():
+        assert not storage.uses_full_scan(plan), (name, plan)
+        if name.startswith("list:"):
+            assert not storage.uses_temp_sort(plan), (name, plan)
+    assert utils.check_query_indexes()
+
+
+def test_temp_sort_detection():
+    assert storage.uses_temp_sort(["SEARCH e USING INDEX idx_extracted_name (name>? AND name<?)",
+                                   "USE TEMP B-TREE FOR ORDER BY"])
+    assert not storage.uses_temp_sort(["SCAN i USING COVERING INDEX idx_interviews_timestamp"])
@@ -3,154 +3,464 @@
 Utility functions for LunarTech AI Interview Agent
 """
 
-import sqlite3
+import sys
 import json
+import base64
 import datetime
+import itertools
+import textwrap
 from pathlib import Path
-from typing import List, Dict, Any
-from config import DATABASE_FILE, DATA_DIR
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+from config import (
+    DATABASE_FILE, DATA_DIR, TRANSCRIPTS_DIR, SUMMARIES_DIR, ARCHIVE_AFTER_DAYS, ARCHIVE_CODEC,
+    ARCHIVE_DATABASE_FILE, RETENTION_DAYS, RETENTION_BATCH_SIZE, METRICS_REPORT_DAYS
+)
+from faq_gaps import top_unanswered_clusters
+from journal import journal_path, parse_events, render_transcript
+import archive
+import dashboard
+import metrics
+import persistence
+import retention
+import storage
 
-def view_interview_data(interview_id: str = None) -> None:
+def view_interview_data(interview_id: str = None, show_transcript: bool = False) -> None:
     """View interview data from the database."""
     try:
-        db_path = Path(DATABASE_FILE)
-        if not db_path.exists():
+        if not storage.database_exists():
             print("❌ No database found. Run an interview first.")
             return
         
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
-        
-        if interview_id:
-            # View specific interview
-            cursor.execute("""
-                SELECT i.id, i.timestamp, i.summary, e.name, e.interest_level, e.readiness, e.background
-                FROM interviews i
-                LEFT JOIN extracted_info e ON i.id = e.interview_id
-                WHERE i.id = ?
-            """, (interview_id,))
+        with storage.reading() as conn:
+            cursor = conn.cursor()
             
-            result = cursor.fetchone()
-            if result:
-                print(f"\n📋 Interview Details for {interview_id}")
-                print(f"Timestamp: {result[1]}")
-                print(f"Candidate: {result[3] or 'Unknown'}")
-                print(f"Interest Level: {result[4] or 'Unknown'}")
-                print(f"Readiness: {result[5] or 'Unknown'}")
-                print(f"Background: {result[6] or 'Unknown'}")
-                print(f"\nSummary:\n{result[2] or 'No summary available'}")
-                
-                # Get Q&A pairs
+            if interview_id:
+                # View specific interview
                 cursor.execute("""
-                    SELECT question_number, question, answer
-                    FROM questions_answers
-                    WHERE interview_id = ?
-                    ORDER BY question_number
+                    SELECT i.id, i.timestamp, i.summary, e.name, e.interest_level, e.readiness, e.background
+                    FROM interviews i
+                    LEFT JOIN extracted_info e ON i.id = e.interview_id
+                    WHERE i.id = ?
                 """, (interview_id,))
+            
+                result = cursor.fetchone()
+                if result:
+                    print(f"\n📋 Interview Details for {interview_id}")
+                    print(f"Timestamp: {result[1]}")
+                    print(f"Candidate: {result[3] or 'Unknown'}")
+                    print(f"Interest Level: {result[4] or 'Unknown'}")
+                    print(f"Readiness: {result[5] or 'Unknown'}")
+                    print(f"Background: {result[6] or 'Unknown'}")
+                    print(f"\nSummary:\n{result[2] or 'No summary available'}")
                 
-                qa_pairs = cursor.fetchall()
-                if qa_pairs:
-                    print("\n📝 Questions & Answers:")
-                    for q_num, question, answer in qa_pairs:
-                        print(f"\nQ{q_num}: {question}")
-                        print(f"A{q_num}: {answer}")
+                    # Get Q&A pairs
+                    cursor.execute("""
+                        SELECT question_number, question, answer
+                        FROM questions_answers
+                        WHERE interview_id = ?
+                        ORDER BY question_number
+                    """, (interview_id,))
+                
+                    qa_pairs = cursor.fetchall()
+                    if qa_pairs:
+                        print("\n📝 Questions & Answers:")
+                        for q_num, question, answer in qa_pairs:
+                            print(f"\nQ{q_num}: {question}")
+                            print(f"A{q_num}: {answer}")
+                else:
+                    # Files of compacted sessions are read straight out of their archive segment
+                    summary = archive.read_session_file(Path(SUMMARIES_DIR) / f"summary_{interview_id}.md")
+                    if summary is None:
+                        print(f"❌ Interview {interview_id} not found.")
+                        return
+                    print(f"\n📦 Interview {interview_id} (from archive)\n")
+                    print(summary.decode("utf-8"))
+                
+                if show_transcript:
+                    transcript = _session_transcript(interview_id)
+                    print("\n📜 Transcript:\n")
+                    print(transcript if transcript is not None else "No transcript available")
             else:
-                print(f"❌ Interview {interview_id} not found.")
-        else:
-            # List all interviews
-            cursor.execute("""
-                SELECT i.id, i.timestamp, e.name, e.interest_level
+                list_interviews()        
+    except Exception as e:
+        print(f"❌ Error accessing database: {e}")
+
+def _encode_cursor(timestamp: str, interview_id: str) -> str:
+    """Opaque, shell-safe page cursor for the last row of a page."""
+    raw = json.dumps([timestamp, interview_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    timestamp, interview_id = json.loads(raw)
+    return timestamp, interview_id
+
+def _session_transcript(session_id: str) -> Optional[str]:
+    """A session's transcript: the text file if there is one, else rendered from its journal.
+    Either may be a live file or a record in an archive segment."""
+    text = archive.read_session_file(Path(TRANSCRIPTS_DIR) / f"transcript_{session_id}.txt")
+    if text is not None:
+        return text.decode("utf-8")
+    journal = archive.read_session_file(journal_path(session_id))
+    if journal is not None:
+        return render_transcript(list(parse_events(journal.decode("utf-8").splitlines(), session_id)))
+    return None
+
+def view_transcript(session_id: str) -> None:
+    """Print a session's transcript."""
+    try:
+        transcript = _session_transcript(session_id)
+        if transcript is None:
+            print(f"❌ No transcript or journal found for session {session_id}.")
+            return
+        print(transcript)
+    except Exception as e:
+        print(f"❌ Error reading transcript: {e}")
+
+def list_interviews(limit: int = 50, after: str = None, interest: str = None, readiness: str = None,
+                    date_from: str = None, date_to: str = None, name_prefix: str = None,
+                    output_format: str = "table") -> None:
+    """
+    List interviews newest first, one page at a time.
+    Keyset pagination on (timestamp, id) keeps every page as cheap as the first.
+    """
+    if limit < 1:
+        raise ValueError(f"limit must be at least 1, got {limit}")
+    try:
+        if not storage.database_exists():
+            print("❌ No database found. Run an interview first.")
+            return
+        
+        conditions, params = [], []
+        if after:
+            conditions.append("(i.timestamp, i.id) < (?, ?)")
+            params.extend(_decode_cursor(after))
+        if interest:
+            conditions.append("e.interest_level = ?")
+            params.append(interest.lower())
+        if readiness:
+            conditions.append("e.readiness = ?")
+            params.append(readiness.lower())
+        if date_from:
+            conditions.append("i.timestamp >= ?")
+            params.append(datetime.date.fromisoformat(date_from).isoformat())
+        if date_to:
+            conditions.append("i.timestamp < ?")
+            params.append((datetime.date.fromisoformat(date_to) + datetime.timedelta(days=1)).isoformat())
+        if name_prefix:
+            conditions.append("e.name >= ? COLLATE NOCASE AND e.name < ? COLLATE NOCASE")
+            params.extend([name_prefix, name_prefix + "\uffff"])
+        
+        # Filters on extracted info can only match interviews that have it. CROSS JOIN
+        # keeps interviews as the outer loop, so pages come off the timestamp index
+        # in order rather than being sorted after a name/level lookup.
+        join = "CROSS JOIN" if interest or readiness or name_prefix else "LEFT JOIN"
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with storage.reading() as conn:
+            rows = conn.execute(f"""
+                SELECT i.id, i.timestamp, e.name, e.interest_level, e.readiness
                 FROM interviews i
-                LEFT JOIN extracted_info e ON i.id = e.interview_id
-                ORDER BY i.timestamp DESC
-            """)
-            
-            results = cursor.fetchall()
-            if results:
-                print("\n📊 All Interviews:")
-                print("-" * 80)
-                print(f"{'ID':<15} {'Timestamp':<20} {'Name':<20} {'Interest':<10}")
-                print("-" * 80)
-                for interview_id, timestamp, name, interest in results:
-                    print(f"{interview_id:<15} {timestamp:<20} {name or 'Unknown':<20} {interest or 'Unknown':<10}")
-            else:
-                print("❌ No interviews found in database.")
+                {join} extracted_info e ON i.id = e.interview_id
+                {where}
+                ORDER BY i.timestamp DESC, i.id DESC
+                LIMIT ?
+            """, (*params, limit + 1)).fetchall()
         
-        conn.close()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1][1], rows[-1][0]) if has_more else None
+        
+        if output_format == "json":
+            print(json.dumps({
+                "interviews": [
+                    {"id": iid, "timestamp": ts, "name": name, "interest_level": interest_level, "readiness": ready}
+                    for iid, ts, name, interest_level, ready in rows
+                ],
+                "next_cursor": next_cursor
+            }, indent=2, ensure_ascii=False))
+            return
+        
+        if not rows:
+            print("❌ No interviews found in database.")
+            return
+        
+        print("\n📊 Interviews:")
+        print("-" * 90)
+        print(f"{'ID':<15} {'Timestamp':<27} {'Name':<20} {'Interest':<10} {'Readiness':<10}")
+        print("-" * 90)
+        for interview_id, timestamp, name, interest_level, ready in rows:
+            print(f"{interview_id:<15} {timestamp or '':<27} {name or 'Unknown':<20} "
+                  f"{interest_level or 'Unknown':<10} {ready or 'Unknown':<10}")
+        if next_cursor:
+            print(f"\n➡️  Next page: python utils.py list --limit {limit} --after {next_cursor}")
         
     except Exception as e:
-        print(f"❌ Error accessing database: {e}")
+        print(f"❌ Error listing interviews: {e}")
+
+EXPORT_QUERY = """
+    SELECT i.id, i.timestamp, i.summary, e.name, e.interest_level, e.readiness, e.background,
+           qa.question_number, qa.question, qa.answer
+    FROM {source}
+    LEFT JOIN extracted_info e ON i.id = e.interview_id
+    LEFT JOIN questions_answers qa ON i.id = qa.interview_id
+    ORDER BY i.timestamp, i.id, qa.question_number
+"""
 
-def export_interviews_to_json(output_file: str = "interviews_export.json") -> None:
-    """Export all interview data to JSON file."""
+# Drive the join from the changed interviews only (CROSS JOIN fixes the loop order)
+CHANGED_SOURCE = """
+    (SELECT DISTINCT interview_id FROM interview_changes WHERE seq > ? AND seq <= ?) AS c
+    CROSS JOIN interviews i ON i.id = c.interview_id
+"""
+
+def iter_interview_records(cursor, source: str = "interviews i", params: tuple = ()) -> Iterator[Dict[str, Any]]:
+    """Stream interview records from one ordered join, grouping rows on the fly."""
+    cursor.execute(EXPORT_QUERY.format(source=source), params)
+    for interview_id, rows in itertools.groupby(cursor, key=lambda row: row[0]):
+        record = None
+        for row in rows:
+            if record is None:
+                _, timestamp, summary, name, interest, readiness, background = row[:7]
+                record = {
+                    "id": interview_id,
+                    "timestamp": timestamp,
+                    "summary": summary,
+                    "extracted_info": {
+                        "name": name,
+                        "interest_level": interest,
+                        "readiness": readiness,
+                        "background": background
+                    },
+                    "questions_answers": []
+                }
+            q_num, question, answer = row[7:]
+            if q_num is not None:
+                record["questions_answers"].append({
+                    "question_number": q_num,
+                    "question": question,
+                    "answer": answer
+                })
+        yield record
+
+def write_records(records: Iterable[Dict[str, Any]], output_file: str, ndjson: bool = False) -> int:
+    """Write records incrementally as a JSON array or NDJSON. Returns the count."""
+    count = 0
+    with open(output_file, 'w', encoding='utf-8') as f:
+        if not ndjson:
+            f.write("[")
+        for record in records:
+            if ndjson:
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write("\n")
+            else:
+                f.write(",\n" if count else "\n")
+                f.write(textwrap.indent(json.dumps(record, indent=2, ensure_ascii=False), "  "))
+            count += 1
+        if not ndjson:
+            f.write("\n]\n" if count else "]\n")
+    return count
+
+def export_interviews_to_json(output_file: str = "interviews_export.json", ndjson: bool = None) -> None:
+    """Export all interview data to a JSON array or NDJSON file, streaming rows."""
     try:
-        db_path = Path(DATABASE_FILE)
-        if not db_path.exists():
+        if not storage.database_exists():
             print("❌ No database found.")
             return
         
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
+        if ndjson is None:
+            ndjson = output_file.endswith((".ndjson", ".jsonl"))
         
-        # Get all interviews with extracted info
-        cursor.execute("""
-            SELECT i.id, i.timestamp, i.summary, e.name, e.interest_level, e.readiness, e.background
-            FROM interviews i
-            LEFT JOIN extracted_info e ON i.id = e.interview_id
-            ORDER BY i.timestamp
-        """)
+        with storage.reading() as conn:
+            count = write_records(iter_interview_records(conn.cursor()), output_file, ndjson)
         
-        interviews = []
-        for row in cursor.fetchall():
-            interview_id, timestamp, summary, name, interest, readiness, background = row
-            
-            # Get Q&A pairs for this interview
-            cursor.execute("""
-                SELECT question_number, question, answer
-                FROM questions_answers
-                WHERE interview_id = ?
-                ORDER BY question_number
-            """, (interview_id,))
-            
-            qa_pairs = cursor.fetchall()
-            
-            interview_data = {
-                "id": interview_id,
-                "timestamp": timestamp,
-                "summary": summary,
-                "extracted_info": {
-                    "name": name,
-                    "interest_level": interest,
-                    "readiness": readiness,
-                    "background": background
-                },
-                "questions_answers": [
-                    {
-                        "question_number": q_num,
-                        "question": question,
-                        "answer": answer
-                    }
-                    for q_num, question, answer in qa_pairs
-                ]
-            }
-            interviews.append(interview_data)
-        
-        conn.close()
-        
-        # Export to JSON
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(interviews, f, indent=2, ensure_ascii=False)
-        
-        print(f"✅ Exported {len(interviews)} interviews to {output_file}")
+        print(f"✅ Exported {count} interviews to {output_file}")
         
     except Exception as e:
         print(f"❌ Error exporting data: {e}")
 
+def export_changes_since_last(output_file: str, consumer: str = "default", ndjson: bool = None) -> None:
+    """Export only interviews added or changed since this consumer's last export."""
+    try:
+        if not storage.database_exists():
+            print("❌ No database found.")
+            return
+        
+        if ndjson is None:
+            ndjson = output_file.endswith((".ndjson", ".jsonl"))
+        
+        with storage.reading() as conn:
+            last_seq = storage.get_watermark(conn, consumer)
+            high_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM interview_changes").fetchone()[0]
+            if last_seq:
+                records = iter_interview_records(conn.cursor(), CHANGED_SOURCE, (last_seq, high_seq))
+            else:
+                # A first export gets everything; maintenance may have pruned the older log
+                records = iter_interview_records(conn.cursor())
+            count = write_records(records, output_file, ndjson)
+        
+        # Advance the watermark only once the file has been written
+        storage.set_watermark(consumer, high_seq)
+        if high_seq > last_seq:
+            print(f"✅ Exported {count} new or changed interviews for '{consumer}' to {output_file} "
+                  f"(changes {last_seq + 1}-{high_seq})")
+        else:
+            print(f"✅ No changes since the last export for '{consumer}'")
+        
+    except Exception as e:
+        print(f"❌ Error exporting changes: {e}")
+
+def export_analytics_tables(output_dir: str = "analytics_export", fmt: str = None, chunk_size: int = None) -> None:
+    """Export typed columnar tables (Parquet or CSV) for analysis in pandas."""
+    try:
+        if not storage.database_exists():
+            print("❌ No database found.")
+            return
+        
+        from analytics import DEFAULT_CHUNK_SIZE, export_analytics
+        
+        counts = export_analytics(output_dir, fmt, chunk_size or DEFAULT_CHUNK_SIZE)
+        for table, rows in counts.items():
+            print(f"✅ {table}: {rows} rows")
+        print(f"📦 Analytics tables written to {output_dir}/")
+        
+    except Exception as e:
+        print(f"❌ Error exporting analytics tables: {e}")
+
+def _fts_query(text: str) -> str:
+    """Quote each word so punctuation in user input is not parsed as FTS syntax."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+def search_interviews(query: str, page: int = 1, per_page: int = 10, raw: bool = False) -> None:
+    """Full-text search over answers and summaries with ranked, highlighted hits."""
+    try:
+        if not storage.database_exists() or not storage.search_available():
+            print("❌ Full-text search is not available for this database.")
+            return
+        
+        highlight = ("\033[1;33m", "\033[0m") if sys.stdout.isatty() else ("[", "]")
+        hits = storage.search(query if raw else _fts_query(query), per_page, (page - 1) * per_page, highlight)
+        if not hits:
+            print(f"❌ No matches for '{query}'" + (f" on page {page}." if page > 1 else "."))
+            return
+        
+        print(f"\n🔎 Results for '{query}' (page {page}):")
+        print("-" * 80)
+        for hit in hits:
+            where = f"A{hit['question_number']}" if hit['kind'] == "answer" else "Summary"
+            print(f"{hit['interview_id']}  {hit['name'] or 'Unknown':<20} {where:<8} score {hit['score']:.2f}")
+            print(f"    {hit['snippet']}")
+        if len(hits) == per_page:
+            print(f"\n➡️  More results: python utils.py search \"{query}\" --page {page + 1}")
+        
+    except Exception as e:
+        print(f"❌ Error searching interviews: {e}")
+
+def reindex_search(batch_size: int = 1000) -> None:
+    """Backfill the full-text index for rows written before it existed."""
+    try:
+        if not storage.database_exists() or not storage.search_available():
+            print("❌ Full-text search is not available for this database.")
+            return
+        
+        indexed = storage.backfill_search_index(batch_size)
+        print(f"✅ Indexed {indexed} answers and summaries for search")
+        
+    except Exception as e:
+        print(f"❌ Error building search index: {e}")
+
+def rebuild_statistics() -> None:
+    """Recompute the dashboard statistics rollup from the interview tables."""
+    try:
+        if not storage.database_exists():
+            print("❌ No database found.")
+            return
+        
+        storage.rebuild_statistics()
+        stats = storage.get_statistics(datetime.date.today().isoformat())
+        print(f"✅ Statistics rebuilt: {stats['total']} interviews, interest levels {stats['interest']}")
+        
+    except Exception as e:
+        print(f"❌ Error rebuilding statistics: {e}")
+
+def compact_session_files(days: float = ARCHIVE_AFTER_DAYS, codec: str = ARCHIVE_CODEC) -> None:
+    """Pack transcripts, summaries and journals of old sessions into archive segments."""
+    try:
+        stats = archive.compact(days, codec)
+        if not stats["files"]:
+            print(f"✅ No session files older than {days:g} days to compact.")
+            return
+        ratio = stats["bytes_out"] / stats["bytes_in"] if stats["bytes_in"] else 0
+        print(f"✅ Compacted {stats['files']} files ({stats['bytes_in']:,} → {stats['bytes_out']:,} bytes, "
+              f"{ratio:.0%}) into {archive.ARCHIVE_DIR}")
+        
+    except Exception as e:
+        print(f"❌ Error compacting session files: {e}")
+
+def maintain_database(days: int = RETENTION_DAYS, batch_size: int = RETENTION_BATCH_SIZE, full_vacuum: bool = False) -> None:
+    """Move old interviews to the archive database, then vacuum and analyze."""
+    try:
+        result = retention.run_maintenance(days, ARCHIVE_DATABASE_FILE, batch_size, full_vacuum)
+        print(f"✅ Archived {result['archived']} interviews older than {days} days to {ARCHIVE_DATABASE_FILE}")
+        print(f"✅ Pruned {result['changes_pruned']} change-log entries already exported")
+        if full_vacuum:
+            print("✅ Database rebuilt with incremental vacuum enabled")
+        else:
+            print(f"✅ Released {result['pages_freed']} free pages")
+        print(f"✅ Planner statistics refreshed ({result['seconds']}s total)")
+        
+    except Exception as e:
+        print(f"❌ Error maintaining database: {e}")
+
+def replay_failed_saves(files: List[str] = None) -> None:
+    """Run the remaining persistence steps of interviews kept in data/failed_saves."""
+    try:
+        paths = [Path(name) for name in files] if files else None
+        worker = persistence.PersistenceWorker()
+        worker.on_committed(dashboard.on_interview_committed)
+        result = persistence.replay_failed(paths, worker)
+        if not result["persisted"] and not result["failed"]:
+            print("✅ No failed saves to replay.")
+            return
+        for interview_id in result["persisted"]:
+            print(f"✅ Persisted {interview_id}")
+        for interview_id in result["failed"]:
+            print(f"❌ Still failing: {interview_id} (kept in {persistence.FAILED_SAVES_DIR})")
+        
+    except Exception as e:
+        print(f"❌ Error replaying failed saves: {e}")
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    return f"{seconds * 1000:.0f} ms" if seconds < 1 else f"{seconds:.2f} s"
+
+def report_latency(days: int = METRICS_REPORT_DAYS) -> None:
+    """Per-stage p50/p95 latency across the sessions of the last N days."""
+    try:
+        if not storage.database_exists():
+            print("❌ No database found.")
+            return
+        
+        since = (datetime.date.today() - datetime.timedelta(days=days)).strftime("%Y%m%d")
+        histograms = metrics.aggregate(storage.get_session_metrics(since))
+        if not histograms:
+            print(f"✅ No latency metrics recorded in the last {days} days.")
+            return
+        
+        print(f"\n⏱️  Stage latency over the last {days} days")
+        print("-" * 64)
+        print(f"{'Stage':<20}{'count':>8}{'p50':>12}{'p95':>12}{'max':>12}")
+        for stage, histogram in metrics.ordered(histograms):
+            print(f"{stage:<20}{histogram.count:>8}{_format_seconds(histogram.quantile(0.50)):>12}"
+                  f"{_format_seconds(histogram.quantile(0.95)):>12}{_format_seconds(histogram.max):>12}")
+        print("\nfirst_partial and endpoint_delay are seconds of audio; the rest are wall-clock time.")
+        
+    except Exception as e:
+        print(f"❌ Error reading latency metrics: {e}")
+
 def clear_database() -> None:
     """Clear all interview data from database (use with caution!)."""
     try:
-        db_path = Path(DATABASE_FILE)
-        if not db_path.exists():
+        if not storage.database_exists():
             print("❌ No database found.")
             return
         
@@ -159,21 +469,59 @@ def clear_database() -> None:
             print("❌ Operation cancelled.")
             return
         
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM questions_answers")
-        cursor.execute("DELETE FROM extracted_info")
-        cursor.execute("DELETE FROM interviews")
-        
-        conn.commit()
-        conn.close()
+        with storage.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM questions_answers")
+            cursor.execute("DELETE FROM extracted_info")
+            cursor.execute("DELETE FROM interviews")
+            cursor.execute("DELETE FROM session_metrics")
         
         print("✅ Database cleared successfully.")
         
     except Exception as e:
         print(f"❌ Error clearing database: {e}")
 
+def view_unanswered_questions(limit: int = 10) -> None:
+    """List the most frequently asked questions the FAQ could not answer."""
+    try:
+        clusters = top_unanswered_clusters(limit)
+        if not clusters:
+            print("✅ No unanswered questions logged yet.")
+            return
+        
+        print("\n❓ Top Unanswered Question Clusters (candidates for new FAQ entries):")
+        print("-" * 80)
+        for rank, cluster in enumerate(clusters, 1):
+            print(f"{rank}. [{cluster['count']}x] {cluster['representative']}")
+            for example in cluster['examples']:
+                if example != cluster['representative']:
+                    print(f"     - {example}")
+            print(f"     Last asked: {cluster['last_seen']}")
+        
+    except Exception as e:
+        print(f"❌ Error reading unanswered questions: {e}")
+
+def check_query_indexes() -> bool:
+    """Verify that dashboard and view queries are served by indexes.
+
+    Paginated listing queries must also read rows in index order: a temp
+    B-tree for ORDER BY means every page sorts all matching rows.
+    """
+    try:
+        print(f"🗄️  Database schema version: {storage.schema_version()} (latest: {storage.SCHEMA_VERSION})")
+        all_indexed = True
+        for name, plan in storage.explain_query_plans().items():
+            failed = storage.uses_full_scan(plan) or (name.startswith("list:") and storage.uses_temp_sort(plan))
+            all_indexed = all_indexed and not failed
+            print(f"{'❌' if failed else '✅'} {name}")
+            for step in plan:
+                print(f"     {step}")
+        return all_indexed
+        
+    except Exception as e:
+        print(f"❌ Error checking query plans: {e}")
+        return False
+
 def test_audio_devices() -> None:
     """Test available audio devices."""
     try:
@@ -197,6 +545,27 @@ def test_audio_devices() -> None:
     except Exception as e:
         print(f"❌ Error testing audio devices: {e}")
 
+def _parse_args(args: List[str], flags: Tuple[str, ...] = ()) -> Tuple[List[str], Dict[str, Any]]:
+    """Split arguments into positionals and --options (flags take no value)."""
+    positional, options = [], {}
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if not arg.startswith("--"):
+            positional.append(arg)
+            continue
+        key, _, value = arg[2:].partition("=")
+        key = key.replace("-", "_")
+        if key in flags:
+            options[key] = True
+        elif value:
+            options[key] = value
+        elif args:
+            options[key] = args.pop(0)
+        else:
+            raise ValueError(f"Option --{key} needs a value")
+    return positional, options
+
 def main():
     """Main utility function with command-line interface."""
     import sys
@@ -204,9 +573,31 @@ def main():
     if len(sys.argv) < 2:
         print("🛠️  LunarTech Interview Agent Utilities")
         print("\nUsage:")
-        print("  python utils.py list                    - List all interviews")
-        print("  python utils.py view <interview_id>     - View specific interview")
-        print("  python utils.py export [filename]       - Export interviews to JSON")
+        print("  python utils.py list [--limit N] [--after CURSOR] [--interest LEVEL] [--readiness LEVEL]")
+        print("                  [--from YYYY-MM-DD] [--to YYYY-MM-DD] [--name PREFIX] [--format json]")
+        print("                                          - List interviews, newest first, one page at a time")
+        print("  python utils.py view <interview_id> [--transcript]")
+        print("                                          - View specific interview (and its transcript)")
+        print("  python utils.py transcript <session_id> - Show a session transcript")
+        print("  python utils.py export [filename] [--ndjson] [--since-last [--consumer NAME]]")
+        print("                                          - Export interviews to JSON (or NDJSON);")
+        print("                                            --since-last exports only new/changed ones")
+        print("  python utils.py analytics [dir] [--format parquet|csv] [--chunk-size N]")
+        print("                                          - Columnar export with per-answer features")
+        print("  python utils.py search <query> [--page N] [--per-page N] [--raw]")
+        print("                                          - Full-text search over answers and summaries")
+        print("  python utils.py reindex [--batch-size N] - Index existing rows for search")
+        print("  python utils.py gaps [n]                - Top unanswered FAQ question clusters")
+        print("  python utils.py compact [--days N] [--codec lzma|gzip]")
+        print(f"                                          - Pack session files older than N days (default {ARCHIVE_AFTER_DAYS})")
+        print("                                            into indexed archive segments")
+        print("  python utils.py maintain [--days N] [--batch-size N] [--full-vacuum]")
+        print(f"                                          - Move interviews older than N days (default {RETENTION_DAYS}) to")
+        print("                                            the archive database, then vacuum and analyze")
+        print(f"  python utils.py latency [--days N]      - Per-stage p50/p95 latency (default last {METRICS_REPORT_DAYS} days)")
+        print("  python utils.py replay-failed [file...] - Finish saving interviews kept in data/failed_saves")
+        print("  python utils.py rebuild-stats           - Recompute dashboard statistics from scratch")
+        print("  python utils.py check-indexes           - Verify hot queries use indexes")
         print("  python utils.py clear                   - Clear all interview data")
         print("  python utils.py audio                   - Test audio devices")
         return
@@ -214,15 +605,77 @@ def main():
     command = sys.argv[1].lower()
     
     if command == "list":
-        view_interview_data()
+        _, options = _parse_args(sys.argv[2:])
+        limit = int(options.get("limit", 50))
+        if limit < 1:
+            print("❌ --limit must be a positive number")
+            return
+        list_interviews(
+            limit=limit,
+            after=options.get("after"),
+            interest=options.get("interest"),
+            readiness=options.get("readiness"),
+            date_from=options.get("from"),
+            date_to=options.get("to"),
+            name_prefix=options.get("name"),
+            output_format=options.get("format", "table")
+        )
     elif command == "view":
-        if len(sys.argv) < 3:
+        positional, options = _parse_args(sys.argv[2:], flags=("transcript",))
+        if not positional:
             print("❌ Please provide an interview ID")
             return
-        view_interview_data(sys.argv[2])
+        view_interview_data(positional[0], show_transcript=options.get("transcript", False))
+    elif command == "transcript":
+        if len(sys.argv) < 3:
+            print("❌ Please provide a session ID")
+            return
+        view_transcript(sys.argv[2])
     elif command == "export":
-        filename = sys.argv[2] if len(sys.argv) > 2 else "interviews_export.json"
-        export_interviews_to_json(filename)
+        positional, options = _parse_args(sys.argv[2:], flags=("ndjson", "since_last"))
+        filename = positional[0] if positional else "interviews_export.json"
+        if options.get("since_last"):
+            export_changes_since_last(filename, options.get("consumer", "default"), ndjson=options.get("ndjson"))
+        else:
+            export_interviews_to_json(filename, ndjson=options.get("ndjson"))
+    elif command == "analytics":
+        positional, options = _parse_args(sys.argv[2:])
+        output_dir = positional[0] if positional else "analytics_export"
+        chunk_size = int(options["chunk_size"]) if "chunk_size" in options else None
+        export_analytics_tables(output_dir, options.get("format"), chunk_size)
+    elif command == "search":
+        positional, options = _parse_args(sys.argv[2:], flags=("raw",))
+        if not positional:
+            print("❌ Please provide a search query")
+            return
+        search_interviews(" ".join(positional), int(options.get("page", 1)),
+                          int(options.get("per_page", 10)), options.get("raw", False))
+    elif command == "reindex":
+        _, options = _parse_args(sys.argv[2:])
+        reindex_search(int(options.get("batch_size", 1000)))
+    elif command == "gaps":
+        limit = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+        view_unanswered_questions(limit)
+    elif command == "compact":
+        _, options = _parse_args(sys.argv[2:])
+        compact_session_files(float(options.get("days", ARCHIVE_AFTER_DAYS)), options.get("codec", ARCHIVE_CODEC))
+    elif command == "maintain":
+        _, options = _parse_args(sys.argv[2:], flags=("full_vacuum",))
+        maintain_database(
+            int(options.get("days", RETENTION_DAYS)),
+            int(options.get("batch_size", RETENTION_BATCH_SIZE)),
+            bool(options.get("full_vacuum"))
+        )
+    elif command == "latency":
+        _, options = _parse_args(sys.argv[2:])
+        report_latency(int(options.get("days", METRICS_REPORT_DAYS)))
+    elif command == "replay-failed":
+        replay_failed_saves(sys.argv[2:])
+    elif command == "rebuild-stats":
+        rebuild_statistics()
+    elif command == "check-indexes":
+        if not check_query_indexes():
+            sys.exit(1)
     elif command == "clear":
         clear_database()
     elif command == "audio":